@@ -1 +1,3 @@
 """A Django app for cricket statistics."""
+
+default_app_config = "django_cricket_statistics.apps.DjangoCricketStatisticsConfig"
@@ -1,23 +1,39 @@
 """Admin for statistics."""
 
 import re
-from typing import Dict, Optional, Tuple
+from collections import defaultdict
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 from django.forms import (
     BaseInlineFormSet,
+    BaseModelFormSet,
     CharField,
     Form,
+    ModelChoiceField,
     NumberInput,
     ModelForm,
     TextInput,
+    modelformset_factory,
 )
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import PermissionDenied
 from django.forms.fields import validators
-from django.db import models
-from django.urls import reverse
+from django.db import models, transaction
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
 from django.http import HttpResponse, HttpResponseRedirect, HttpRequest
 
+from django_cricket_statistics.changes import record_changes
+from django_cricket_statistics.first_eleven import (
+    assign_first_eleven_numbers,
+    propose_first_eleven_numbers,
+)
+
 from django_cricket_statistics.models import (
+    Change,
     Player,
     Grade,
     Season,
@@ -27,30 +43,61 @@ from django_cricket_statistics.models import (
     FiveWicketInning,
     BALLS_PER_OVER,
 )
+from django_cricket_statistics.signals import (
+    KEY_FIELDS,
+    batch_statistics_changes,
+    statistic_key,
+)
 
 
 BOWLING_OVERS_RE = re.compile(r"^(?P<overs>\d+)(?:\.(?P<balls>\d?))?$")
 BOWLING_BEST_BOWLING_RE = re.compile(r"^(?P<wickets>10|[0-9])\/(?P<runs>\d+)$")
 BATTING_HIGH_SCORE_RE = re.compile(r"^(?P<runs>\d+)(?P<notout>\*?)$")
 
+# statistic fields set from each compound input
+COMPOUND_FIELDS = {
+    "batting_high_score_input": (
+        "batting_high_score_runs",
+        "batting_high_score_is_not_out",
+    ),
+    "bowling_overs_input": ("bowling_balls",),
+    "best_bowling_input": ("best_bowling_wickets", "best_bowling_runs"),
+}
+
+
+# statistic fields entered for each player, season and grade
+STATISTIC_ENTRY_FIELDS = (
+    "matches",
+    "batting_innings",
+    "batting_not_outs",
+    "batting_high_score_input",
+    "batting_runs",
+    "number_of_ducks",
+    "fielding_catches_non_wk",
+    "fielding_catches_wk",
+    "fielding_run_outs",
+    "fielding_throw_outs",
+    "fielding_stumpings",
+    "bowling_overs_input",
+    "best_bowling_input",
+    "bowling_maidens",
+    "bowling_runs",
+    "bowling_wickets",
+)
 
-class StatisticInlineFormSet(BaseInlineFormSet):
-    """Inline form set for statistics."""
 
-    class Meta:  # noqa: D106 # pylint: disable=missing-class-docstring
-        model = Statistic
-        fields = "__all__"
+class BulkStatisticFormSetMixin:
+    """Enter statistics with compound inputs and save them in bulk."""
 
-    def __init__(self, *args: Tuple, **kwargs: Dict) -> None:
-        """Select additional linked models."""
-        super().__init__(*args, **kwargs)
-        self.queryset: models.QuerySet = self.queryset.select_related(
-            "player", "season", "grade"
-        )
+    # provided by the model form set this is mixed into
+    changed_objects: List[Tuple[models.Model, List[str]]]
+    deleted_objects: List[models.Model]
+    saved_forms: List[ModelForm]
+    delete_existing: Callable[[models.Model], None]
 
     def add_fields(self, form: Form, index: int) -> None:
         """Add custom fields for fields with compound input."""
-        super().add_fields(form, index)
+        super().add_fields(form, index)  # type: ignore
 
         # bowling overs are used instead of bowling balls input
         form.fields["bowling_overs_input"] = CharField(
@@ -83,6 +130,149 @@ class StatisticInlineFormSet(BaseInlineFormSet):
             size="4ch", title="Use * for not out, e.g. 143*"
         )
 
+    def save(self, commit: bool = True) -> List[models.Model]:
+        """Save the statistics in bulk, announcing the changes once.
+
+        Changed statistics are updated with one query for each set of changed
+        fields and new statistics are created together.
+        """
+        if not commit:
+            return super().save(commit=False)  # type: ignore
+
+        self.saved_forms = []
+        with batch_statistics_changes() as keys, transaction.atomic():
+            changed = self.save_existing_objects(commit=False)  # type: ignore
+            new = self.save_new_objects(commit=False)  # type: ignore
+
+            # statistics may move to another season or grade
+            keys |= set(
+                Statistic.objects.filter(
+                    pk__in=[obj.pk for obj in changed]
+                ).values_list(*KEY_FIELDS)
+            )
+
+            for obj in self.deleted_objects:
+                keys.add(statistic_key(obj))
+                self.delete_existing(obj)
+
+            # bulk updates do not set the modification time themselves
+            now = timezone.now()
+            groups: Dict[FrozenSet[str], List[models.Model]] = defaultdict(list)
+            for obj, changed_data in self.changed_objects:
+                obj.modified_at = now
+                groups[self._changed_fields(changed_data)].append(obj)
+
+            for fields, objs in groups.items():
+                Statistic.objects.bulk_update(objs, sorted(fields))
+
+            Statistic.objects.bulk_create(new)
+
+            # only some databases return the primary keys of bulk inserts
+            if any(obj.pk is None for obj in new):
+                pks = {
+                    tuple(key): pk
+                    for pk, *key in Statistic.objects.filter(
+                        player__in={obj.player_id for obj in new},
+                        season__in={obj.season_id for obj in new},
+                        grade__in={obj.grade_id for obj in new},
+                    ).values_list("pk", *KEY_FIELDS)
+                }
+                for obj in new:
+                    obj.pk = pks[statistic_key(obj)]
+
+            # bulk operations send no signals to record their changes
+            record_changes(Statistic, Change.Action.UPDATE, [obj.pk for obj in changed])
+            record_changes(Statistic, Change.Action.INSERT, [obj.pk for obj in new])
+
+            keys |= {statistic_key(obj) for obj in (*changed, *new)}
+
+            for form in self.saved_forms:
+                form.save_m2m()
+
+        return [*changed, *new]
+
+    @staticmethod
+    def _changed_fields(changed_data: List[str]) -> FrozenSet[str]:
+        """Return the statistic fields changed by the changed form fields."""
+        names = {field.name for field in Statistic._meta.concrete_fields}
+        fields = {"modified_at"}
+        for name in changed_data:
+            fields.update(COMPOUND_FIELDS.get(name, (name,) if name in names else ()))
+        return frozenset(fields)
+
+
+class StatisticInlineFormSet(BulkStatisticFormSetMixin, BaseInlineFormSet):
+    """Inline form set for statistics."""
+
+    class Meta:  # noqa: D106 # pylint: disable=missing-class-docstring
+        model = Statistic
+        fields = "__all__"
+
+    # the page of the player's seasons shown, most recent first
+    seasons_per_page = 5
+    page = 1
+
+    def __init__(self, *args: Tuple, **kwargs: Dict) -> None:
+        """Select additional linked models and the seasons on the page."""
+        super().__init__(*args, **kwargs)
+        self.queryset: models.QuerySet = self.queryset.select_related(
+            "player", "season", "grade"
+        )
+
+        years = list(
+            self.queryset.order_by("-season__year")
+            .values_list("season__year", flat=True)
+            .distinct()
+        )
+        start = (self.page - 1) * self.seasons_per_page
+        end = start + self.seasons_per_page
+
+        self.has_newer_seasons = start > 0
+        self.has_older_seasons = len(years) > end
+        if start or self.has_older_seasons:
+            self.queryset = self.queryset.filter(season__year__in=years[start:end])
+
+
+class SeasonStatisticFormSet(BulkStatisticFormSetMixin, BaseModelFormSet):
+    """Form set for the statistics of every player in a season and grade."""
+
+    def __init__(self, *args: Any, season: Season, grade: Grade, **kwargs: Any) -> None:
+        """Show the statistics of the season and grade."""
+        self.season = season
+        self.grade = grade
+        kwargs["queryset"] = (
+            Statistic.objects.filter(season=season, grade=grade)
+            .select_related("player")
+            .order_by("player__sort_key")
+        )
+        super().__init__(*args, **kwargs)
+
+    def add_fields(self, form: Form, index: int) -> None:
+        """Only choose the player of new statistics."""
+        super().add_fields(form, index)
+        form.order_fields(("player", *STATISTIC_ENTRY_FIELDS))
+        if form.instance.pk is not None:
+            del form.fields["player"]
+
+    def clean(self) -> None:
+        """Check each player has only one statistic in the season and grade."""
+        super().clean()
+
+        players = {form.instance.player_id for form in self.initial_forms}
+        for form in self.extra_forms:
+            player = form.cleaned_data.get("player")
+            if player is None or self._should_delete_form(form):
+                continue
+            if player.pk in players:
+                form.add_error("player", "This player already has a statistic.")
+            players.add(player.pk)
+
+    def save_new(self, form: Form, commit: bool = True) -> models.Model:
+        """Add new statistics to the season and grade."""
+        form.instance.season = self.season
+        form.instance.grade = self.grade
+        return super().save_new(form, commit=commit)
+
 
 class StatisticForm(ModelForm):
     """Form for statistics."""
@@ -98,7 +288,8 @@ class StatisticForm(ModelForm):
         instance = kwargs.get("instance", None)
 
         if instance is not None:
-            self.initial["bowling_overs_input"] = instance.bowling_overs
+            # compared as a string so unchanged overs are not saved again
+            self.initial["bowling_overs_input"] = str(instance.bowling_overs)
             self.initial["best_bowling_input"] = instance.bowling_best_bowling
             self.initial["batting_high_score_input"] = instance.batting_high_score
         else:
@@ -132,7 +323,7 @@ class StatisticForm(ModelForm):
             return data
 
         overs = int(match.group("overs"))
-        balls = int(match.group("balls"))
+        balls = int(match.group("balls") or 0)
         self.cleaned_data["bowling_balls_input"] = overs * BALLS_PER_OVER + balls
 
         return data
@@ -155,20 +346,17 @@ class StatisticForm(ModelForm):
 
     def save(self, commit: bool = True) -> models.Model:
         """Save the compound fields onto the instance."""
-        instance = super().save(commit=commit)
-
-        for attr in (
-            "bowling_balls",
-            "best_bowling_wickets",
-            "best_bowling_runs",
-            "batting_high_score_runs",
-            "batting_high_score_is_not_out",
-        ):
-            input_name = attr + "__input"
-            setattr(instance, input_name, self.cleaned_data.get(input_name))
+        instance = super().save(commit=False)
+
+        for fields in COMPOUND_FIELDS.values():
+            for attr in fields:
+                input_name = attr + "_input"
+                if input_name in self.cleaned_data:
+                    setattr(instance, attr, self.cleaned_data[input_name])
 
         if commit:
             instance.save()
+            self._save_m2m()
 
         return instance
 
@@ -177,6 +365,13 @@ class StatisticForm(ModelForm):
         fields = "__all__"
 
 
+class SeasonEntryForm(Form):
+    """Form choosing the season and grade to enter."""
+
+    season = ModelChoiceField(Season.objects.all())
+    grade = ModelChoiceField(Grade.objects.all())
+
+
 class StatisticInline(admin.TabularInline):
     """Inline for statistics."""
 
@@ -184,26 +379,7 @@ class StatisticInline(admin.TabularInline):
     verbose_name = None
     extra = 0
     show_change_link = True
-    fields = (
-        "season",
-        "grade",
-        "matches",
-        "batting_innings",
-        "batting_not_outs",
-        "batting_high_score_input",
-        "batting_runs",
-        "number_of_ducks",
-        "fielding_catches_non_wk",
-        "fielding_catches_wk",
-        "fielding_run_outs",
-        "fielding_throw_outs",
-        "fielding_stumpings",
-        "bowling_overs_input",
-        "best_bowling_input",
-        "bowling_maidens",
-        "bowling_runs",
-        "bowling_wickets",
-    )
+    fields = ("season", "grade", *STATISTIC_ENTRY_FIELDS)
     formset = StatisticInlineFormSet
     form = StatisticForm
     formfield_overrides = {
@@ -212,6 +388,40 @@ class StatisticInline(admin.TabularInline):
         }
     }
 
+    # only a page of seasons is shown so the submitted fields stay bounded
+    page_parameter = "statistic_page"
+
+    def get_formset(
+        self, request: HttpRequest, obj: Optional[models.Model] = None, **kwargs: Any
+    ) -> Any:
+        """Return the formset showing the requested page of seasons."""
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.page = self.get_page(request)
+        return formset
+
+    def get_page(self, request: HttpRequest) -> int:
+        """Return the requested page of seasons."""
+        page = request.GET.get(self.page_parameter, "")
+        return max(int(page), 1) if page.isdigit() else 1
+
+    def formfield_for_foreignkey(
+        self, db_field: models.ForeignKey, request: HttpRequest, **kwargs: Any
+    ) -> Any:
+        """Share the season and grade choices between every form of a request."""
+        formfield = super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+        if db_field.name in ("season", "grade"):
+            choices = request.__dict__.setdefault("_statistic_choices", {})
+            if db_field.name not in choices:
+                # plain values are copied cheaply by each form
+                choices[db_field.name] = [
+                    (getattr(value, "value", value), label)
+                    for value, label in formfield.choices
+                ]
+            formfield.choices = choices[db_field.name]
+
+        return formfield
+
 
 class HundredInline(admin.TabularInline):
     """Inline for hundreds."""
@@ -231,6 +441,22 @@ class FiveWicketInningInline(admin.TabularInline):
     fields = ("wickets", "runs", "is_in_final")
 
 
+class StatisticChildMixin:
+    """Select the models shown with the statistic of a hundred or 5WI."""
+
+    def formfield_for_foreignkey(
+        self, db_field: models.ForeignKey, request: HttpRequest, **kwargs: Any
+    ) -> Any:
+        """Select the player, season and grade of the chosen statistic."""
+        if db_field.name == "statistic":
+            kwargs["queryset"] = Statistic.objects.select_related(
+                "player", "season", "grade"
+            )
+        return super().formfield_for_foreignkey(  # type: ignore
+            db_field, request, **kwargs
+        )
+
+
 class GlobalModelPermsModelAdmin(admin.ModelAdmin):
     """Class setting model permissions."""
 
@@ -267,7 +493,7 @@ class SuperuserModelPermsModelAdmin(GlobalModelPermsModelAdmin):
 class PlayerAdmin(admin.ModelAdmin):
     """Admin settings for players."""
 
-    actions = None
+    actions = ("number_first_eleven_players",)
     list_display = (
         "__str__",
         "first_name",
@@ -276,6 +502,7 @@ class PlayerAdmin(admin.ModelAdmin):
         "nickname",
         "first_eleven_number",
     )
+    list_select_related = ("first_eleven_number",)
     search_fields = list_display[1:-1]
     fieldsets = (
         ("Edit Details", {"classes": ("collapse",), "fields": list_display[1:]}),
@@ -291,6 +518,74 @@ class PlayerAdmin(admin.ModelAdmin):
         """Only permit superusers to delete."""
         return request.user.is_superuser
 
+    def render_change_form(
+        self, request: HttpRequest, context: Dict, *args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        """Add links to the other pages of the player's seasons."""
+        for inline_formset in context.get("inline_admin_formsets", ()):
+            formset = inline_formset.formset
+            if not isinstance(formset, StatisticInlineFormSet):
+                continue
+
+            parameter = inline_formset.opts.page_parameter
+            links = {}
+            for name, page, shown in (
+                ("newer", formset.page - 1, formset.has_newer_seasons),
+                ("older", formset.page + 1, formset.has_older_seasons),
+            ):
+                if shown:
+                    query = request.GET.copy()
+                    query[parameter] = str(page)
+                    links[name] = f"?{query.urlencode()}"
+            if links:
+                context["statistic_seasons"] = {
+                    "per_page": formset.seasons_per_page,
+                    **links,
+                }
+
+        return super().render_change_form(request, context, *args, **kwargs)
+
+    def get_actions(self, request: HttpRequest) -> Dict:
+        """Remove the bulk deletion of players."""
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def number_first_eleven_players(
+        self, request: HttpRequest, queryset: models.QuerySet
+    ) -> Optional[HttpResponse]:
+        """Number the selected players in the order of their debuts.
+
+        The proposed numbers are shown for confirmation before being assigned.
+        """
+        if request.POST.get("apply"):
+            proposals = assign_first_eleven_numbers(queryset)
+            self.message_user(
+                request,
+                f"Assigned {len(proposals)} first eleven numbers.",
+                messages.SUCCESS,
+            )
+            return None
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Assign first eleven numbers",
+            "opts": self.model._meta,
+            "proposals": propose_first_eleven_numbers(queryset),
+            "queryset": queryset,
+            "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(
+            request,
+            "admin/django_cricket_statistics/player/number_first_eleven_players.html",
+            context,
+        )
+
+    number_first_eleven_players.short_description = (  # type: ignore
+        "Assign first eleven numbers by debut"
+    )
+    number_first_eleven_players.allowed_permissions = ("change",)  # type: ignore
+
 
 @admin.register(Statistic)
 class StatisticAdmin(GlobalModelPermsModelAdmin):
@@ -298,10 +593,89 @@ class StatisticAdmin(GlobalModelPermsModelAdmin):
 
     actions = None
     list_display = ("player", "season", "grade", "matches")
+    list_select_related = ("player", "season", "grade")
+    search_fields = ("player__long_name", "player__short_name", "grade__grade")
     fields = (("statistic_display",),)
     readonly_fields = tuple(f for fg in fields for f in fg)
     inlines = (HundredInline, FiveWicketInningInline)
 
+    # new rows offered on the season entry page
+    season_entry_extra = 5
+
+    def get_urls(self) -> List:
+        """Add the season entry page."""
+        opts = self.model._meta
+        return [
+            path(
+                "season-entry/",
+                self.admin_site.admin_view(self.season_entry_view),
+                name=f"{opts.app_label}_{opts.model_name}_season_entry",
+            ),
+            *super().get_urls(),
+        ]
+
+    def season_entry_view(self, request: HttpRequest) -> HttpResponse:
+        """Enter the statistics of every player in a season and grade at once."""
+        if not (
+            self.has_add_permission(request) and self.has_change_permission(request)
+        ):
+            raise PermissionDenied
+
+        choice = SeasonEntryForm(request.GET or None)
+        formset = None
+        media = self.media
+
+        if choice.is_valid():
+            numbers = NumberInput(attrs={"style": "width:5ch"})
+            formset_class = modelformset_factory(
+                Statistic,
+                form=StatisticForm,
+                formset=SeasonStatisticFormSet,
+                fields=("player", *STATISTIC_ENTRY_FIELDS),
+                extra=self.season_entry_extra,
+                can_delete=True,
+                widgets={
+                    "player": AutocompleteSelect(
+                        Statistic._meta.get_field("player").remote_field,
+                        self.admin_site,
+                    ),
+                    **{
+                        name: numbers
+                        for name in STATISTIC_ENTRY_FIELDS
+                        if not name.endswith("_input")
+                    },
+                },
+            )
+            formset = formset_class(
+                request.POST if request.method == "POST" else None,
+                **choice.cleaned_data,
+            )
+            media += formset.media
+
+            if formset.is_bound and formset.is_valid():
+                saved = formset.save()
+                self.message_user(
+                    request,
+                    f"Saved {len(saved)} and deleted "
+                    f"{len(formset.deleted_objects)} statistics.",
+                    messages.SUCCESS,
+                )
+                return HttpResponseRedirect(request.get_full_path())
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Enter a season",
+            "opts": self.model._meta,
+            "choice": choice,
+            "formset": formset,
+            "media": media,
+        }
+        return TemplateResponse(
+            request,
+            "admin/django_cricket_statistics/statistic/season_entry.html",
+            context,
+        )
+
     # pylint: disable=no-self-use
     def statistic_display(self, instance: Statistic) -> str:
         """Show player, season, and grade for statistic display."""
@@ -345,24 +719,29 @@ class FirstElevenNumberAdmin(GlobalModelPermsModelAdmin):
     """Admin settings for first eleven numbers."""
 
     list_display = ("pk", "player")
+    list_select_related = ("player",)
     actions = None
 
 
 @admin.register(Hundred)
-class HundredAdmin(GlobalModelPermsModelAdmin):
+class HundredAdmin(StatisticChildMixin, GlobalModelPermsModelAdmin):
     """Admin settings for hundreds."""
 
     list_display = ("statistic", "runs", "is_not_out", "is_in_final")
+    list_select_related = ("statistic__player", "statistic__season", "statistic__grade")
     actions = None
     fields = (("statistic", "runs", "is_not_out", "is_in_final"),)
+    autocomplete_fields = ("statistic",)
     ordering = ("-statistic__season__year", "statistic__grade")
 
 
 @admin.register(FiveWicketInning)
-class FiveWicketInningAdmin(GlobalModelPermsModelAdmin):
+class FiveWicketInningAdmin(StatisticChildMixin, GlobalModelPermsModelAdmin):
     """Admin settings for five wicket innings."""
 
     list_display = ("statistic", "wickets", "runs", "is_in_final")
+    list_select_related = ("statistic__player", "statistic__season", "statistic__grade")
     actions = None
     fields = (("statistic", "wickets", "runs", "is_in_final"),)
+    autocomplete_fields = ("statistic",)
     ordering = ("-statistic__season__year", "statistic__grade")
@@ -7,3 +7,8 @@ class DjangoCricketStatisticsConfig(AppConfig):
     """App config for statistics."""
 
     name = "django_cricket_statistics"
+
+    def ready(self) -> None:
+        """Connect the signal receivers."""
+        # pylint: disable=import-outside-toplevel,unused-import
+        from django_cricket_statistics import signals  # noqa: F401
@@ -0,0 +1,158 @@
+"""Audit the statistics for rows which are inconsistent with each other."""
+
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, models
+from django.utils.module_loading import import_string
+
+from django_cricket_statistics.models import Statistic
+
+# a rule returns a message for each problem with a statistic
+Rule = Callable[[Statistic], Iterable[str]]
+
+# statistics read at a time, each with their hundreds and five wicket innings
+AUDIT_CHUNK_SIZE = 1000
+
+RULES: Dict[str, Rule] = {}
+
+
+class Issue(NamedTuple):
+    """A problem found with a statistic."""
+
+    rule: str
+    statistic: int
+    player: int
+    season: int
+    grade: int
+    message: str
+
+
+def audit_rule(rule: Rule) -> Rule:
+    """Register a rule checked by every audit."""
+    RULES[rule.__name__] = rule
+    return rule
+
+
+def audit_rules() -> Dict[str, Rule]:
+    """Return the registered rules and those added by the settings."""
+    extra = getattr(settings, "CRICKET_STATISTICS_AUDIT_RULES", ())
+    rules = (import_string(path) for path in extra)
+    return {**RULES, **{rule.__name__: rule for rule in rules}}
+
+
+@audit_rule
+def not_outs_exceed_innings(statistic: Statistic) -> Iterable[str]:
+    """Check there are no more not outs than innings."""
+    if statistic.batting_not_outs > statistic.batting_innings:
+        yield (
+            f"{statistic.batting_not_outs} not outs in "
+            f"{statistic.batting_innings} innings"
+        )
+
+
+@audit_rule
+def ducks_exceed_innings(statistic: Statistic) -> Iterable[str]:
+    """Check there are no more ducks than innings."""
+    if statistic.number_of_ducks > statistic.batting_innings:
+        yield (
+            f"{statistic.number_of_ducks} ducks in "
+            f"{statistic.batting_innings} innings"
+        )
+
+
+@audit_rule
+def high_score_exceeds_runs(statistic: Statistic) -> Iterable[str]:
+    """Check the high score is within the runs of the season."""
+    if statistic.batting_high_score_runs > statistic.batting_runs:
+        yield (
+            f"high score of {statistic.batting_high_score_runs} exceeds "
+            f"{statistic.batting_runs} runs"
+        )
+
+
+@audit_rule
+def hundreds_exceed_runs(statistic: Statistic) -> Iterable[str]:
+    """Check the hundreds are within the runs and innings of the season."""
+    hundreds = statistic.hundred_set.all()
+    runs = sum(hundred.runs for hundred in hundreds)
+
+    if runs > statistic.batting_runs:
+        yield f"hundreds totalling {runs} exceed {statistic.batting_runs} runs"
+    if len(hundreds) > statistic.batting_innings:
+        yield f"{len(hundreds)} hundreds in {statistic.batting_innings} innings"
+
+
+@audit_rule
+def best_bowling_exceeds_wickets(statistic: Statistic) -> Iterable[str]:
+    """Check the best bowling figures are within those of the season."""
+    if statistic.best_bowling_wickets > statistic.bowling_wickets:
+        yield (
+            f"best bowling of {statistic.best_bowling_wickets} wickets exceeds "
+            f"{statistic.bowling_wickets} wickets"
+        )
+    if statistic.best_bowling_runs > statistic.bowling_runs:
+        yield (
+            f"best bowling of {statistic.best_bowling_runs} runs exceeds "
+            f"{statistic.bowling_runs} runs"
+        )
+
+
+@audit_rule
+def five_wicket_innings_invalid(statistic: Statistic) -> Iterable[str]:
+    """Check five wicket innings have five wickets and fit in the season."""
+    innings = statistic.fivewicketinning_set.all()
+
+    for inning in innings:
+        if inning.wickets < 5:
+            yield f"five wicket inning of {inning.figures}"
+
+    wickets = sum(inning.wickets for inning in innings)
+    if wickets > statistic.bowling_wickets:
+        yield (
+            f"five wicket innings totalling {wickets} wickets exceed "
+            f"{statistic.bowling_wickets} wickets"
+        )
+
+
+def _chunks(statistics: models.QuerySet, chunk_size: int) -> Iterator[List[Statistic]]:
+    """Yield the statistics in chunks of primary keys with their children.
+
+    The iterator of a queryset does not prefetch, so each chunk is a separate
+    query seeking past the last primary key of the previous chunk.
+    """
+    statistics = statistics.order_by("pk").prefetch_related(
+        "hundred_set", "fivewicketinning_set"
+    )
+
+    last = None
+    while True:
+        chunk = statistics if last is None else statistics.filter(pk__gt=last)
+        rows = list(chunk[:chunk_size])
+        if not rows:
+            return
+
+        yield rows
+        last = rows[-1].pk
+
+
+def audit_statistics(
+    rules: Optional[Dict[str, Rule]] = None,
+    chunk_size: int = AUDIT_CHUNK_SIZE,
+    using: str = DEFAULT_DB_ALIAS,
+) -> Iterator[Issue]:
+    """Yield the issues found by the rules, holding one chunk in memory."""
+    rules = audit_rules() if rules is None else rules
+
+    for chunk in _chunks(Statistic.objects.using(using), chunk_size):
+        for statistic in chunk:
+            for name, rule in rules.items():
+                for message in rule(statistic):
+                    yield Issue(
+                        name,
+                        statistic.pk,
+                        statistic.player_id,
+                        statistic.season_id,
+                        statistic.grade_id,
+                        message,
+                    )
@@ -0,0 +1,339 @@
+"""Caching of computed statistics."""
+
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import models
+from django.db.models.expressions import Col
+from django.db.models.lookups import Lookup
+from django.db.models.sql import Query
+from django.utils.tree import Node
+
+CACHE_PREFIX = "django_cricket_statistics"
+
+# the data version changes with any write to the statistics
+DATA_VERSION_KEY = f"{CACHE_PREFIX}:data_version"
+QUERY_CACHE_TIMEOUT = 60 * 60 * 24
+
+# rendered fragments are keyed by a stamp of their data so are kept for long
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# entries depending on every statistic, or on a change to any player's name
+ALL_TAG = "all"
+PLAYERS_TAG = "players"
+
+# values kept in memory by each process in front of the shared cache
+LOCAL_CACHE_SIZE = 256
+LOCAL_CACHE_TIMEOUT = 60
+
+# seconds a value may take to evaluate and to wait for another to evaluate it
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 5
+LOCK_POLL = 0.05
+
+# scope changes beyond this are not checked individually
+MAX_CHANGES = 50
+
+# hits and misses of the query result cache in this process
+query_cache_stats: Counter = Counter()
+
+
+def career_chart_key(player_pk: int) -> str:
+    """Return the cache key of the career chart data for a player."""
+    return f"{CACHE_PREFIX}:career_chart:{player_pk}"
+
+
+def data_version() -> int:
+    """Return the current version of the statistics data."""
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, 1, timeout=None)
+        version = cache.get(DATA_VERSION_KEY, 1)
+    return version
+
+
+def bump_data_version() -> None:
+    """Move to a new data version after a write to the statistics."""
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        cache.set(DATA_VERSION_KEY, 2, timeout=None)
+
+
+def canonical(value: Any) -> Any:
+    """Return a stable, hashable representation of a query argument.
+
+    Expressions are represented by their identity, subqueries by their
+    conditions, model instances by their primary key and mappings and sets
+    are sorted.
+    """
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, models.Model):
+        return (value._meta.label, value.pk)
+    if isinstance(value, models.QuerySet):
+        return canonical(value.query)
+    if isinstance(value, Query):
+        # subqueries may refer to an outer query so cannot be compiled alone
+        return (
+            value.model._meta.label,
+            canonical(value.where),
+            value.values_select,
+            canonical(value.annotations),
+            canonical(value.group_by),
+            value.order_by,
+        )
+    if isinstance(value, Node):
+        return (value.connector, value.negated, canonical(value.children))
+    if isinstance(value, Lookup):
+        return (type(value).__name__, canonical(value.lhs), canonical(value.rhs))
+    if isinstance(value, Col):
+        return (value.target.model._meta.label, value.target.column)
+    if hasattr(value, "identity"):
+        return canonical(value.identity)
+    if isinstance(value, dict):
+        return tuple(sorted((key, canonical(v)) for key, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((canonical(v) for v in value), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(canonical(v) for v in value)
+    return value
+
+
+def query_cache_key(*parts: Any) -> str:
+    """Return the cache key of a query from its canonical parts."""
+    digest = hashlib.sha1(repr(canonical(parts)).encode()).hexdigest()
+    return f"{CACHE_PREFIX}:query:{digest}"
+
+
+def tag_versions(tags: Iterable[str]) -> Dict[str, int]:
+    """Return the current version of each tag."""
+    keys = {f"{CACHE_PREFIX}:tag:{tag}": tag for tag in tags}
+    found = cache.get_many(keys)
+
+    for key in keys.keys() - found.keys():
+        # start from the clock so a lost version can never match an old one
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        found[key] = cache.get(key)
+
+    return {tag: found[key] for key, tag in keys.items()}
+
+
+def invalidate_tags(changes: Dict[str, Set[int]]) -> None:
+    """Invalidate the tags, recording the players changed under each."""
+    for tag, players in changes.items():
+        tag_versions((tag,))
+        version = cache.incr(f"{CACHE_PREFIX}:tag:{tag}")
+        cache.set(change_key(tag, version), players, timeout=QUERY_CACHE_TIMEOUT)
+
+    bump_data_version()
+
+
+def change_key(tag: str, version: int) -> str:
+    """Return the cache key of the players changed in a version of a tag."""
+    return f"{CACHE_PREFIX}:change:{tag}:{version}"
+
+
+def changed_players(
+    cached: Dict[str, int], current: Dict[str, int]
+) -> Optional[Set[int]]:
+    """Return the players changed between two versions of the tags.
+
+    None is returned if the changes are too many or no longer recorded.
+    """
+    # a tag seeded again from the clock after eviction may be far ahead
+    changes = 0
+    for tag, start in cached.items():
+        if current[tag] < start:
+            return None
+        changes += current[tag] - start
+        if changes > MAX_CHANGES:
+            return None
+
+    keys = [
+        change_key(tag, version)
+        for tag, start in cached.items()
+        for version in range(start + 1, current[tag] + 1)
+    ]
+
+    found = cache.get_many(keys)
+    if len(found) < len(keys):
+        return None
+
+    return set().union(*found.values())
+
+
+class LocalCache:
+    """Bounded least recently used cache of values within this process.
+
+    Values are stored with the data version they were read at and are stale
+    once the data version moves on.
+    """
+
+    def __init__(self, max_size: int, timeout: float) -> None:
+        """Set the maximum number of values and the seconds they are kept."""
+        self.max_size = max_size
+        self.timeout = timeout
+        self.stats: Counter = Counter()
+        self._values: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: int) -> Any:
+        """Return a value stored at the version, or None."""
+        with self._lock:
+            stored = self._values.get(key)
+            if stored is None:
+                self.stats["misses"] += 1
+                return None
+
+            expires, stored_version, value = stored
+            if expires < time.monotonic() or stored_version != version:
+                del self._values[key]
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            self._values.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def set(self, key: str, version: int, value: Any) -> None:
+        """Store a value read at the version, evicting the least recently used."""
+        with self._lock:
+            self._values[key] = (time.monotonic() + self.timeout, version, value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Remove all values."""
+        with self._lock:
+            self._values.clear()
+
+
+local_cache = LocalCache(max_size=LOCAL_CACHE_SIZE, timeout=LOCAL_CACHE_TIMEOUT)
+
+# evaluation of the values is serialised within this process by key
+_LOCKS = tuple(threading.RLock() for _ in range(64))
+
+
+def _shared_entry(
+    key: str, still_valid: Optional[Callable[[Any, Set[int]], bool]]
+) -> Tuple[Optional[Dict], bool]:
+    """Return the entry of the shared cache and whether it is still valid."""
+    entry = cache.get(key)
+    if entry is None:
+        return None, False
+
+    current = tag_versions([*entry["tags"], *entry["scopes"]])
+    changed = (
+        changed_players(entry["scopes"], current)
+        if all(current[tag] == v for tag, v in entry["tags"].items())
+        else None
+    )
+
+    if changed is None or (
+        changed and not (still_valid and still_valid(entry["value"], changed))
+    ):
+        return entry, False
+
+    if changed:
+        entry["scopes"] = {tag: current[tag] for tag in entry["scopes"]}
+        cache.set(key, entry, timeout=QUERY_CACHE_TIMEOUT)
+
+    return entry, True
+
+
+def _hit(key: str, version: int, value: Any) -> Any:
+    """Count a hit of the shared cache and keep the value locally."""
+    query_cache_stats["hits"] += 1
+    local_cache.set(key, version, value)
+    return value
+
+
+def cached_value(
+    parts: Any,
+    evaluate: Callable[[], Any],
+    tags: Iterable[str] = (ALL_TAG,),
+    scopes: Iterable[str] = (),
+    still_valid: Optional[Callable[[Any, Set[int]], bool]] = None,
+) -> Any:
+    """Return the value of a query from the cache, evaluating it on a miss.
+
+    Values are read from the local cache while the data version is unchanged
+    and otherwise from the shared cache. A shared value is invalid once any
+    of its tags change. Changes to its scopes only invalidate it if
+    still_valid returns false for the changed players.
+
+    Only one caller evaluates a value at a time, across threads and processes.
+    Other callers are given the stale value if there is one, and otherwise
+    wait briefly for the value to be evaluated before evaluating it themselves.
+
+    The value is shared between callers so must not be modified.
+    """
+    key = query_cache_key(*parts)
+
+    # read first so a value is never stored locally at a newer version
+    version = data_version()
+    value = local_cache.get(key, version)
+    if value is not None:
+        query_cache_stats["hits"] += 1
+        return value
+
+    entry, valid = _shared_entry(key, still_valid)
+    if valid:
+        return _hit(key, version, entry["value"])  # type: ignore
+
+    stale = entry["value"] if entry else None
+    lock = _LOCKS[hash(key) % len(_LOCKS)]
+
+    if stale is not None:
+        if not lock.acquire(blocking=False):
+            query_cache_stats["stale"] += 1
+            return stale
+    elif not lock.acquire(timeout=LOCK_WAIT):
+        # the evaluation holding the lock is taking too long to wait for
+        query_cache_stats["misses"] += 1
+        return evaluate()
+
+    try:
+        # the value may have been evaluated while waiting for the lock
+        entry, valid = _shared_entry(key, still_valid)
+        if valid:
+            return _hit(key, version, entry["value"])  # type: ignore
+
+        lock_key = f"{key}:lock"
+        deadline = time.monotonic() + LOCK_WAIT
+        locked = cache.add(lock_key, True, timeout=LOCK_TIMEOUT)
+
+        while not locked and time.monotonic() < deadline:
+            if stale is not None:
+                query_cache_stats["stale"] += 1
+                return stale
+
+            time.sleep(LOCK_POLL)
+            entry, valid = _shared_entry(key, still_valid)
+            if valid:
+                return _hit(key, version, entry["value"])  # type: ignore
+            locked = cache.add(lock_key, True, timeout=LOCK_TIMEOUT)
+
+        try:
+            query_cache_stats["misses"] += 1
+
+            # versions are read first so changes made while evaluating are kept
+            entry = {"tags": tag_versions(tags), "scopes": tag_versions(scopes)}
+            entry["value"] = evaluate()
+            cache.set(key, entry, timeout=QUERY_CACHE_TIMEOUT)
+            local_cache.set(key, version, entry["value"])
+        finally:
+            if locked:
+                cache.delete(lock_key)
+
+        return entry["value"]
+    finally:
+        lock.release()
@@ -0,0 +1,109 @@
+"""Record the changes to the statistics for incremental downloads."""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Type
+
+from django.core import serializers
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.utils import timezone
+
+from django_cricket_statistics.models import (
+    Change,
+    ChangeLock,
+    FiveWicketInning,
+    Grade,
+    Hundred,
+    Player,
+    Season,
+    Statistic,
+)
+
+# models whose inserts, updates and deletes are recorded
+TRACKED_MODELS = (Player, Season, Grade, Statistic, Hundred, FiveWicketInning)
+
+# changes read from the feed at a time
+CHANGE_FEED_LIMIT = 500
+
+
+def record_changes(
+    model: Type[models.Model],
+    action: str,
+    pks: Iterable[int],
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Record the same action for each of the rows of a model.
+
+    The changes are appended holding the change lock until the transaction
+    commits, so they commit in the order of their keys and a cursor handed to
+    a reader is never passed by a change yet to commit. The lock is a single
+    row, so every transaction writing tracked rows, including each save in
+    the admin, waits for any other to commit first. Holding the cursor back
+    behind the latest changes instead would only make skipping one unlikely.
+    """
+    pks = list(pks)
+    if not pks:
+        return
+
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        ChangeLock.objects.using(using).select_for_update().get_or_create(pk=1)
+        Change.objects.using(using).bulk_create(
+            [
+                Change(
+                    model=model._meta.model_name,
+                    object_id=pk,
+                    action=action,
+                    changed_at=now,
+                )
+                for pk in pks
+            ],
+            batch_size=500,
+        )
+
+
+def _current_rows(changes: List[Change]) -> Dict[str, Dict[int, Dict]]:
+    """Return the current fields of the rows changed, by model and key."""
+    tracked = {model._meta.model_name: model for model in TRACKED_MODELS}
+    pks = defaultdict(set)
+    for change in changes:
+        if change.model in tracked and change.action != Change.Action.DELETE:
+            pks[change.model].add(change.object_id)
+
+    rows: Dict[str, Dict[int, Dict]] = {}
+    for name, keys in pks.items():
+        objects = tracked[name].objects.filter(pk__in=keys)
+        rows[name] = {
+            row["pk"]: row["fields"] for row in serializers.serialize("python", objects)
+        }
+
+    return rows
+
+
+def change_feed(cursor: int = 0, limit: int = CHANGE_FEED_LIMIT) -> Dict:
+    """Return the changes after the cursor with the current rows they changed.
+
+    The fields are those of the row as it is now, not as it was when the
+    change was made, so a consumer reading behind sees later values early.
+    Rows which have since been deleted have no fields, and are followed by
+    their deletion later in the feed.
+    """
+    changes = list(Change.objects.filter(pk__gt=cursor)[: limit + 1])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    rows = _current_rows(changes)
+    return {
+        "changes": [
+            {
+                "cursor": change.pk,
+                "model": change.model,
+                "id": change.object_id,
+                "action": change.action,
+                "changed_at": change.changed_at,
+                "fields": rows.get(change.model, {}).get(change.object_id),
+            }
+            for change in changes
+        ],
+        "cursor": changes[-1].pk if changes else cursor,
+        "has_more": has_more,
+    }
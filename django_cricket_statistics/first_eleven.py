@@ -0,0 +1,133 @@
+"""Assign first eleven numbers to players in the order of their debuts."""
+
+from functools import partial
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from django_cricket_statistics.cache import PLAYERS_TAG, invalidate_tags
+from django_cricket_statistics.changes import record_changes
+from django_cricket_statistics.models import Change, FirstElevenNumber, Player, Season
+
+# orderings of players who debuted in the same season
+TIEBREAKS: Dict[str, Tuple[str, ...]] = {
+    "name": ("sort_key",),
+    "created": ("created_at", "pk"),
+}
+
+
+class ProposedNumber(NamedTuple):
+    """A first eleven number proposed for a player."""
+
+    number: int
+    player: Player
+    debut: Season
+
+
+def first_eleven_tiebreak() -> str:
+    """Return the default ordering of players debuting in the same season."""
+    return getattr(settings, "CRICKET_STATISTICS_FIRST_ELEVEN_TIEBREAK", "name")
+
+
+def propose_first_eleven_numbers(
+    players: Optional[models.QuerySet] = None,
+    tiebreak: Optional[str] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> List[ProposedNumber]:
+    """Return the numbers of the players who have debuted without a number.
+
+    Numbers follow the highest existing number and are ordered by the season
+    of the first eleven debut, then by the tiebreak.
+    """
+    tiebreak = tiebreak or first_eleven_tiebreak()
+    if tiebreak not in TIEBREAKS:
+        raise ValueError(f"Unknown tiebreak {tiebreak!r}")
+
+    if players is None:
+        players = Player.objects.all()
+
+    players = (
+        players.using(using)
+        .filter(first_eleven_number__isnull=True)
+        .annotate(
+            debut=Min(
+                "statistic__season__year",
+                filter=Q(statistic__grade__is_first_eleven=True),
+            )
+        )
+        .filter(debut__isnull=False)
+        .order_by("debut", *TIEBREAKS[tiebreak])
+    )
+
+    last = FirstElevenNumber.objects.using(using).aggregate(Max("pk"))["pk__max"]
+    return [
+        ProposedNumber(number, player, Season(year=player.debut))
+        for number, player in enumerate(players, start=(last or 0) + 1)
+    ]
+
+
+def assign_first_eleven_numbers(
+    players: Optional[models.QuerySet] = None,
+    tiebreak: Optional[str] = None,
+    dry_run: bool = False,
+    using: str = DEFAULT_DB_ALIAS,
+) -> List[ProposedNumber]:
+    """Assign the proposed first eleven numbers, returning them.
+
+    The numbers are created and assigned together in one transaction, and
+    nothing is written in a dry run.
+    """
+    with transaction.atomic(using=using):
+        proposals = propose_first_eleven_numbers(players, tiebreak, using=using)
+        if dry_run or not proposals:
+            return proposals
+
+        FirstElevenNumber.objects.using(using).bulk_create(
+            [FirstElevenNumber(pk=proposal.number) for proposal in proposals],
+            batch_size=500,
+        )
+
+        # bulk updates do not set the modification time themselves
+        now = timezone.now()
+        for proposal in proposals:
+            proposal.player.first_eleven_number_id = proposal.number
+            proposal.player.modified_at = now
+
+        Player.objects.using(using).bulk_update(
+            [proposal.player for proposal in proposals],
+            ("first_eleven_number", "modified_at"),
+            batch_size=500,
+        )
+        record_changes(
+            Player,
+            Change.Action.UPDATE,
+            [proposal.player.pk for proposal in proposals],
+            using=using,
+        )
+
+        # numbers given explicitly do not advance the primary key sequence
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [FirstElevenNumber]
+            ):
+                cursor.execute(sql)
+
+    # bulk updates do not send the signals which invalidate cached players
+    changed = {proposal.player.pk for proposal in proposals}
+    transaction.on_commit(
+        partial(
+            invalidate_tags,
+            {
+                PLAYERS_TAG: changed,
+                **{f"player:{player}": {player} for player in changed},
+            },
+        ),
+        using=using,
+    )
+
+    return proposals
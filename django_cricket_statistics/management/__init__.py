@@ -0,0 +1 @@
+"""Management for cricket statistics."""
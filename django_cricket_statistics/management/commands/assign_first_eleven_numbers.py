@@ -0,0 +1,63 @@
+"""Assign first eleven numbers to players in the order of their debuts."""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from django_cricket_statistics.first_eleven import (
+    TIEBREAKS,
+    assign_first_eleven_numbers,
+)
+from django_cricket_statistics.models import Grade
+
+
+class Command(BaseCommand):
+    """Assign first eleven numbers to players in the order of their debuts."""
+
+    help = (
+        "Number every player with a first eleven appearance and no number, "
+        "in order of their debut season. Only appearances in grades marked as "
+        "first eleven grades count, and no grade is marked when upgrading, so "
+        "mark them in the admin first."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the tiebreak, dry run and database options."""
+        parser.add_argument(
+            "--tiebreak",
+            choices=sorted(TIEBREAKS),
+            help="Order of players debuting in the same season.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the proposed numbers without assigning them.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Assign the numbers and report them."""
+        grades = Grade.objects.using(options["database"])
+        if not grades.filter(is_first_eleven=True).exists():
+            self.stderr.write(
+                self.style.WARNING(
+                    "No grade is marked as a first eleven grade, "
+                    "so no players can be numbered."
+                )
+            )
+
+        proposals = assign_first_eleven_numbers(
+            tiebreak=options["tiebreak"],
+            dry_run=options["dry_run"],
+            using=options["database"],
+        )
+
+        for proposal in proposals:
+            self.stdout.write(
+                f"{proposal.number:>5}  {proposal.player.long_name} "
+                f"(debut {proposal.debut})"
+            )
+
+        verb = "Would assign" if options["dry_run"] else "Assigned"
+        self.stdout.write(f"{verb} {len(proposals)} first eleven numbers.")
@@ -0,0 +1,62 @@
+"""Audit the statistics for inconsistent rows."""
+
+import json
+from collections import Counter
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from django_cricket_statistics.audit import (
+    AUDIT_CHUNK_SIZE,
+    audit_rules,
+    audit_statistics,
+)
+
+
+class Command(BaseCommand):
+    """Audit the statistics for inconsistent rows."""
+
+    help = (
+        "Check every statistic against the audit rules, writing each issue "
+        "as a line of JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the rule, chunk size, check and database options."""
+        parser.add_argument(
+            "--rule",
+            action="append",
+            dest="rules",
+            help="Check only this rule, which may be given more than once.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=AUDIT_CHUNK_SIZE)
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Exit with an error if any issue is found.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Write the issues to stdout and a summary to stderr."""
+        rules = audit_rules()
+        if options["rules"]:
+            unknown = set(options["rules"]) - rules.keys()
+            if unknown:
+                raise CommandError(f"Unknown rules: {', '.join(sorted(unknown))}")
+            rules = {name: rules[name] for name in options["rules"]}
+
+        counts: Counter = Counter()
+        for issue in audit_statistics(
+            rules, chunk_size=options["chunk_size"], using=options["database"]
+        ):
+            counts[issue.rule] += 1
+            self.stdout.write(json.dumps(issue._asdict()))
+
+        for rule, count in sorted(counts.items()):
+            self.stderr.write(f"{rule}: {count}")
+        self.stderr.write(f"Found {sum(counts.values())} issues.")
+
+        if options["check"] and counts:
+            raise CommandError("The statistics have issues.")
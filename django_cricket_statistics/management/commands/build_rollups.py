@@ -0,0 +1,46 @@
+"""Rebuild the pre-aggregated statistics."""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from django_cricket_statistics.rollups import (
+    build_high_scores,
+    build_player_letters,
+    build_player_summaries,
+    build_season_summaries,
+    build_statistic_cube,
+)
+
+
+class Command(BaseCommand):
+    """Rebuild the pre-aggregated statistics."""
+
+    help = (
+        "Rebuild the statistic cube, season summaries, high scores, "
+        "player summaries and player letters."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the database option."""
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Rebuild the rollups in dependency order."""
+        using = options["database"]
+
+        cells = build_statistic_cube(using=using)
+        self.stdout.write(f"Built {cells} statistic cube cells.")
+
+        seasons = build_season_summaries(using=using)
+        self.stdout.write(f"Built {seasons} season summaries.")
+
+        scores = build_high_scores(using=using)
+        self.stdout.write(f"Built {scores} high scores.")
+
+        players = build_player_summaries(using=using)
+        self.stdout.write(f"Built {players} player summaries.")
+
+        letters = build_player_letters(using=using)
+        self.stdout.write(f"Built {letters} player letters.")
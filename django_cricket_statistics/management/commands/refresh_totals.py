@@ -0,0 +1,23 @@
+"""Refresh the career and season totals kept by the database."""
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from django_cricket_statistics.totals import refresh_totals
+
+
+class Command(BaseCommand):
+    """Refresh the career and season totals kept by the database."""
+
+    help = "Refresh the career and season totals, concurrently on PostgreSQL."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the database option."""
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Refresh the totals."""
+        refresh_totals(using=options["database"])
+        self.stdout.write("Refreshed the career and season totals.")
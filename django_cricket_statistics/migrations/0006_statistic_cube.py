@@ -0,0 +1,126 @@
+# Generated by Django 3.1.14 on 2026-10-19 07:11
+
+from collections import defaultdict
+from typing import Any, Dict, Tuple
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# frozen copy of the cube aggregation, so later changes cannot alter this step
+CUBE_SUMS = {
+    "matches_total": ("matches",),
+    "batting_innings_total": ("batting_innings",),
+    "batting_runs_total": ("batting_runs",),
+    "batting_not_outs_total": ("batting_not_outs",),
+    "hundreds_total": ("hundreds",),
+    "bowling_balls_total": ("bowling_balls",),
+    "bowling_runs_total": ("bowling_runs",),
+    "bowling_wickets_total": ("bowling_wickets",),
+    "five_wicket_innings_total": ("five_wicket_innings",),
+    "fielding_catches_wk_total": ("fielding_catches_wk",),
+    "fielding_stumpings_total": ("fielding_stumpings",),
+    "fielding_catches_non_wk_total": ("fielding_catches_non_wk",),
+    "fielding_run_outs_total": ("fielding_run_outs", "fielding_throw_outs"),
+}
+CUBE_STATISTIC_FIELDS = (
+    "player",
+    "season",
+    "grade",
+    "season__year",
+    "matches",
+    "batting_innings",
+    "batting_runs",
+    "batting_not_outs",
+    "bowling_balls",
+    "bowling_runs",
+    "bowling_wickets",
+    "fielding_catches_wk",
+    "fielding_stumpings",
+    "fielding_catches_non_wk",
+    "fielding_run_outs",
+    "fielding_throw_outs",
+)
+
+
+def forward_build_statistic_cube(apps: Any, schema_editor: Any) -> None:
+    """Aggregate the existing statistics into the cube."""
+    alias = schema_editor.connection.alias
+    Statistic = apps.get_model("django_cricket_statistics", "Statistic")
+    StatisticCube = apps.get_model("django_cricket_statistics", "StatisticCube")
+
+    statistics = (
+        Statistic.objects.using(alias)
+        .filter(grade__is_senior=True)
+        .order_by()
+        .values(*CUBE_STATISTIC_FIELDS)
+        .annotate(
+            hundreds=models.Count("hundred", distinct=True),
+            five_wicket_innings=models.Count("fivewicketinning", distinct=True),
+        )
+    )
+
+    cells: Dict[Tuple, Dict] = defaultdict(lambda: defaultdict(int))
+    for stat in statistics:
+        player, season, grade = stat["player"], stat["season"], stat["grade"]
+        for key in (
+            (player, season, grade),
+            (player, season, None),
+            (player, None, grade),
+            (player, None, None),
+        ):
+            cell = cells[key]
+            for field, names in CUBE_SUMS.items():
+                cell[field] += sum(stat[name] for name in names)
+
+            year = stat["season__year"]
+            cell["first_year"] = min(cell.get("first_year", year), year)
+            cell["last_year"] = max(cell.get("last_year", year), year)
+
+    StatisticCube.objects.using(alias).bulk_create(
+        [
+            StatisticCube(
+                player_id=player, season_id=season, grade_id=grade, **cell
+            )
+            for (player, season, grade), cell in cells.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0005_assign_first_eleven_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticCube',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_year', models.PositiveSmallIntegerField()),
+                ('last_year', models.PositiveSmallIntegerField()),
+                ('matches_total', models.PositiveIntegerField(default=0)),
+                ('batting_innings_total', models.PositiveIntegerField(default=0)),
+                ('batting_runs_total', models.PositiveIntegerField(default=0)),
+                ('batting_not_outs_total', models.PositiveIntegerField(default=0)),
+                ('hundreds_total', models.PositiveIntegerField(default=0)),
+                ('bowling_balls_total', models.PositiveIntegerField(default=0)),
+                ('bowling_runs_total', models.PositiveIntegerField(default=0)),
+                ('bowling_wickets_total', models.PositiveIntegerField(default=0)),
+                ('five_wicket_innings_total', models.PositiveIntegerField(default=0)),
+                ('fielding_catches_wk_total', models.PositiveIntegerField(default=0)),
+                ('fielding_stumpings_total', models.PositiveIntegerField(default=0)),
+                ('fielding_catches_non_wk_total', models.PositiveIntegerField(default=0)),
+                ('fielding_run_outs_total', models.PositiveIntegerField(default=0)),
+                ('grade', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='django_cricket_statistics.grade')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='django_cricket_statistics.player')),
+                ('season', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='django_cricket_statistics.season')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='statisticcube',
+            index=models.Index(fields=['season', 'grade', 'player'], name='django_cric_season__829f30_idx'),
+        ),
+        migrations.RunPython(forward_build_statistic_cube, migrations.RunPython.noop),
+    ]
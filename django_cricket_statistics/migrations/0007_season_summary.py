@@ -0,0 +1,79 @@
+# Generated by Django 3.1.14 on 2026-10-19 07:15
+
+from typing import Any, Dict
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# frozen copy of the summary aggregation, so later changes cannot alter this step
+SUMMARY_TOTALS = (
+    "batting_runs_total",
+    "bowling_wickets_total",
+    "hundreds_total",
+    "five_wicket_innings_total",
+)
+
+
+def forward_build_season_summaries(apps: Any, schema_editor: Any) -> None:
+    """Summarise the existing seasons from the statistic cube."""
+    alias = schema_editor.connection.alias
+    StatisticCube = apps.get_model("django_cricket_statistics", "StatisticCube")
+    SeasonSummary = apps.get_model("django_cricket_statistics", "SeasonSummary")
+
+    cells = (
+        StatisticCube.objects.using(alias)
+        .filter(season__isnull=False, grade__isnull=True)
+        .order_by("player__last_name", "player__first_name", "player__middle_names")
+        .values("season", "player", *SUMMARY_TOTALS)
+    )
+
+    summaries: Dict[int, Any] = {}
+    for cell in cells:
+        summary = summaries.get(cell["season"])
+        if summary is None:
+            summary = summaries[cell["season"]] = SeasonSummary(
+                season_id=cell["season"]
+            )
+
+        summary.players_total += 1
+        for field in SUMMARY_TOTALS:
+            setattr(summary, field, getattr(summary, field) + cell[field])
+
+        # ties are resolved by name order
+        if cell["batting_runs_total"] > summary.leading_run_scorer_runs:
+            summary.leading_run_scorer_id = cell["player"]
+            summary.leading_run_scorer_runs = cell["batting_runs_total"]
+        if cell["bowling_wickets_total"] > summary.leading_wicket_taker_wickets:
+            summary.leading_wicket_taker_id = cell["player"]
+            summary.leading_wicket_taker_wickets = cell["bowling_wickets_total"]
+
+    SeasonSummary.objects.using(alias).bulk_create(summaries.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0006_statistic_cube'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonSummary',
+            fields=[
+                ('season', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='django_cricket_statistics.season')),
+                ('players_total', models.PositiveIntegerField(default=0, verbose_name='players')),
+                ('batting_runs_total', models.PositiveIntegerField(default=0, verbose_name='runs')),
+                ('bowling_wickets_total', models.PositiveIntegerField(default=0, verbose_name='wkts')),
+                ('hundreds_total', models.PositiveIntegerField(default=0, verbose_name='100')),
+                ('five_wicket_innings_total', models.PositiveIntegerField(default=0, verbose_name='5WI')),
+                ('leading_run_scorer_runs', models.PositiveIntegerField(default=0)),
+                ('leading_wicket_taker_wickets', models.PositiveIntegerField(default=0)),
+                ('leading_run_scorer', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='django_cricket_statistics.player')),
+                ('leading_wicket_taker', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='django_cricket_statistics.player')),
+            ],
+            options={
+                'ordering': ('-season__year',),
+            },
+        ),
+        migrations.RunPython(forward_build_season_summaries, migrations.RunPython.noop),
+    ]
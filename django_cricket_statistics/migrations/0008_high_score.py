@@ -0,0 +1,82 @@
+# Generated by Django 3.1.14 on 2026-10-19 07:17
+
+from typing import Any, List
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# frozen copy of the high score collection, so later changes cannot alter this step
+def forward_build_high_scores(apps: Any, schema_editor: Any) -> None:
+    """Collect the existing hundreds and high scores."""
+    alias = schema_editor.connection.alias
+    Statistic = apps.get_model("django_cricket_statistics", "Statistic")
+    HighScore = apps.get_model("django_cricket_statistics", "HighScore")
+
+    statistics = (
+        Statistic.objects.using(alias)
+        .filter(grade__is_senior=True)
+        .order_by()
+        .prefetch_related("hundred_set")
+    )
+
+    scores: List[Any] = []
+    for stat in statistics:
+        key = {
+            "statistic_id": stat.pk,
+            "player_id": stat.player_id,
+            "season_id": stat.season_id,
+            "grade_id": stat.grade_id,
+        }
+        hundreds = stat.hundred_set.all()
+
+        scores.extend(
+            HighScore(
+                hundred_id=hundred.pk,
+                runs=hundred.runs,
+                is_not_out=hundred.is_not_out,
+                is_in_final=hundred.is_in_final,
+                **key,
+            )
+            for hundred in hundreds
+        )
+
+        # the high score is only missing if it has not been entered as a hundred
+        high_score = (stat.batting_high_score_runs, stat.batting_high_score_is_not_out)
+        if high_score[0] and high_score not in {
+            (hundred.runs, hundred.is_not_out) for hundred in hundreds
+        }:
+            scores.append(HighScore(runs=high_score[0], is_not_out=high_score[1], **key))
+
+    HighScore.objects.using(alias).bulk_create(scores, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0007_season_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HighScore',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('runs', models.PositiveSmallIntegerField()),
+                ('is_not_out', models.BooleanField(default=False)),
+                ('is_in_final', models.BooleanField(default=False)),
+                ('grade', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='django_cricket_statistics.grade')),
+                ('hundred', models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, to='django_cricket_statistics.hundred')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='django_cricket_statistics.player')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='django_cricket_statistics.season')),
+                ('statistic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='django_cricket_statistics.statistic')),
+            ],
+            options={
+                'ordering': ('-runs', '-is_not_out'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='highscore',
+            index=models.Index(fields=['-runs', '-is_not_out'], name='django_cric_runs_139fe3_idx'),
+        ),
+        migrations.RunPython(forward_build_high_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 3.1.14 on 2026-10-19 07:18
+
+from typing import Any
+
+from django.db import migrations, models
+
+# frozen copy of the best bowling aggregation, so later changes cannot alter this step
+def _update_best_bowling(cell: Any, wickets: int, runs: int) -> None:
+    """Keep the best bowling figures of a cube cell, most wickets then fewest runs."""
+    best = (cell.best_bowling_wickets, -cell.best_bowling_runs)
+    if wickets and (wickets, -runs) > best:
+        cell.best_bowling_wickets = wickets
+        cell.best_bowling_runs = runs
+
+
+def forward_build_statistic_cube(apps: Any, schema_editor: Any) -> None:
+    """Fill in the best bowling figures of the existing cube cells."""
+    alias = schema_editor.connection.alias
+    Statistic = apps.get_model("django_cricket_statistics", "Statistic")
+    StatisticCube = apps.get_model("django_cricket_statistics", "StatisticCube")
+
+    senior = Statistic.objects.using(alias).filter(grade__is_senior=True).order_by()
+    figures = [
+        *senior.values_list(
+            "player", "season", "grade", "best_bowling_wickets", "best_bowling_runs"
+        ),
+        # five wicket innings are also best figures if the statistic is incomplete
+        *senior.filter(fivewicketinning__isnull=False).values_list(
+            "player",
+            "season",
+            "grade",
+            "fivewicketinning__wickets",
+            "fivewicketinning__runs",
+        ),
+    ]
+
+    cells = {
+        (cell.player_id, cell.season_id, cell.grade_id): cell
+        for cell in StatisticCube.objects.using(alias)
+    }
+    for player, season, grade, wickets, runs in figures:
+        for key in (
+            (player, season, grade),
+            (player, season, None),
+            (player, None, grade),
+            (player, None, None),
+        ):
+            _update_best_bowling(cells[key], wickets, runs)
+
+    StatisticCube.objects.using(alias).bulk_update(
+        cells.values(), ("best_bowling_wickets", "best_bowling_runs"), batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0008_high_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statisticcube',
+            name='best_bowling_runs',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='statisticcube',
+            name='best_bowling_wickets',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='statistic',
+            index=models.Index(fields=['-best_bowling_wickets', 'best_bowling_runs'], name='django_cric_best_bo_b3eb16_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statisticcube',
+            index=models.Index(fields=['season', 'grade', '-best_bowling_wickets', 'best_bowling_runs'], name='django_cric_season__d5b7f3_idx'),
+        ),
+        migrations.RunPython(forward_build_statistic_cube, migrations.RunPython.noop),
+    ]
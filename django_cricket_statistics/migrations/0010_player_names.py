@@ -0,0 +1,81 @@
+# Generated by Django 3.1.14 on 2026-10-19 08:02
+
+from typing import Any, Tuple
+
+from django.db import migrations, models
+
+
+# frozen copy of models.player_names, so later changes cannot alter this step
+def player_names(
+    first_name: str, nickname: str, middle_names: str, last_name: str
+) -> Tuple[str, str, str]:
+    """Return the short name, long name and sort key of a player."""
+    initials = "".join(
+        name[0].upper() for name in f"{first_name} {middle_names}".split()
+    )
+    short_name = " ".join((initials or "Mr.", last_name))
+
+    names = (
+        first_name or "Mr.",
+        middle_names if middle_names else None,
+        "(" + nickname + ")" if nickname else None,
+        last_name,
+    )
+    long_name = " ".join(n for n in names if n is not None)
+
+    # the separator sorts before any letter so surnames are compared first
+    sort_key = f"{last_name}, {first_name} {middle_names}".strip().casefold()
+
+    return short_name, long_name, sort_key
+
+
+def forward_player_names(apps: Any, schema_editor: Any) -> None:
+    """Store the display names of the existing players."""
+    Player = apps.get_model("django_cricket_statistics", "Player")
+    players = Player.objects.using(schema_editor.connection.alias).all()
+
+    for player in players:
+        player.short_name, player.long_name, player.sort_key = player_names(
+            player.first_name, player.nickname, player.middle_names, player.last_name
+        )
+
+    Player.objects.using(schema_editor.connection.alias).bulk_update(
+        players, ("short_name", "long_name", "sort_key"), batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0009_best_bowling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='long_name',
+            field=models.CharField(default='', editable=False, max_length=850),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='short_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=250),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='player',
+            name='sort_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=850),
+            preserve_default=False,
+        ),
+        migrations.AlterModelOptions(
+            name='player',
+            options={'ordering': ('sort_key',)},
+        ),
+        migrations.AlterModelOptions(
+            name='statistic',
+            options={'ordering': ('player__sort_key', 'season', 'grade')},
+        ),
+        migrations.RunPython(forward_player_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,145 @@
+# Generated by Django 3.1.14 on 2026-10-19 07:34
+
+from typing import Any
+
+from django.db import migrations, models
+
+# frozen copy of the totals, so later changes cannot alter this step
+TOTALS_SELECT = """
+SELECT
+    MIN(statistic.id) AS id,
+    statistic.player_id AS player_id,
+    {season_column}
+    MIN(season.year) AS first_year,
+    MAX(season.year) AS last_year,
+    SUM(statistic.matches) AS matches_total,
+    SUM(statistic.batting_innings) AS batting_innings_total,
+    SUM(statistic.batting_runs) AS batting_runs_total,
+    SUM(statistic.batting_not_outs) AS batting_not_outs_total,
+    SUM(COALESCE(hundred.total, 0)) AS hundreds_total,
+    SUM(statistic.bowling_balls) AS bowling_balls_total,
+    SUM(statistic.bowling_runs) AS bowling_runs_total,
+    SUM(statistic.bowling_wickets) AS bowling_wickets_total,
+    SUM(COALESCE(five_wicket_inning.total, 0)) AS five_wicket_innings_total,
+    SUM(statistic.fielding_catches_wk) AS fielding_catches_wk_total,
+    SUM(statistic.fielding_stumpings) AS fielding_stumpings_total,
+    SUM(statistic.fielding_catches_non_wk) AS fielding_catches_non_wk_total,
+    SUM(statistic.fielding_run_outs + statistic.fielding_throw_outs)
+        AS fielding_run_outs_total
+FROM django_cricket_statistics_statistic statistic
+INNER JOIN django_cricket_statistics_grade grade ON grade.id = statistic.grade_id
+INNER JOIN django_cricket_statistics_season season
+    ON season.id = statistic.season_id
+LEFT OUTER JOIN (
+    SELECT statistic_id, COUNT(*) AS total
+    FROM django_cricket_statistics_hundred
+    GROUP BY statistic_id
+) hundred ON hundred.statistic_id = statistic.id
+LEFT OUTER JOIN (
+    SELECT statistic_id, COUNT(*) AS total
+    FROM django_cricket_statistics_fivewicketinning
+    GROUP BY statistic_id
+) five_wicket_inning ON five_wicket_inning.statistic_id = statistic.id
+WHERE grade.is_senior
+GROUP BY statistic.player_id{season_group}
+"""
+
+# the select and unique columns of each totals table
+TOTALS = {
+    "django_cricket_statistics_careertotal": (
+        TOTALS_SELECT.format(season_column="", season_group=""),
+        ("player_id",),
+    ),
+    "django_cricket_statistics_seasontotal": (
+        TOTALS_SELECT.format(
+            season_column="statistic.season_id AS season_id,",
+            season_group=", statistic.season_id",
+        ),
+        ("player_id", "season_id"),
+    ),
+}
+
+
+def forward_create_totals(apps: Any, schema_editor: Any) -> None:
+    """Create the materialized views, or summary tables, of the totals."""
+    connection = schema_editor.connection
+    materialized = connection.vendor == "postgresql"
+    kind = "MATERIALIZED VIEW" if materialized else "TABLE"
+
+    with connection.cursor() as cursor:
+        for table, (select, unique) in TOTALS.items():
+            cursor.execute(f"CREATE {kind} {table} AS {select}")
+
+            # a unique index is required to refresh concurrently
+            columns = ", ".join(unique)
+            cursor.execute(f"CREATE UNIQUE INDEX {table}_unique ON {table} ({columns})")
+
+
+def reverse_create_totals(apps: Any, schema_editor: Any) -> None:
+    """Drop the materialized views, or summary tables, of the totals."""
+    connection = schema_editor.connection
+    materialized = connection.vendor == "postgresql"
+    kind = "MATERIALIZED VIEW" if materialized else "TABLE"
+
+    with connection.cursor() as cursor:
+        for table in TOTALS:
+            cursor.execute(f"DROP {kind} IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0010_player_names'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CareerTotal',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_year', models.PositiveSmallIntegerField()),
+                ('last_year', models.PositiveSmallIntegerField()),
+                ('matches_total', models.PositiveIntegerField()),
+                ('batting_innings_total', models.PositiveIntegerField()),
+                ('batting_runs_total', models.PositiveIntegerField()),
+                ('batting_not_outs_total', models.PositiveIntegerField()),
+                ('hundreds_total', models.PositiveIntegerField()),
+                ('bowling_balls_total', models.PositiveIntegerField()),
+                ('bowling_runs_total', models.PositiveIntegerField()),
+                ('bowling_wickets_total', models.PositiveIntegerField()),
+                ('five_wicket_innings_total', models.PositiveIntegerField()),
+                ('fielding_catches_wk_total', models.PositiveIntegerField()),
+                ('fielding_stumpings_total', models.PositiveIntegerField()),
+                ('fielding_catches_non_wk_total', models.PositiveIntegerField()),
+                ('fielding_run_outs_total', models.PositiveIntegerField()),
+            ],
+            options={
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SeasonTotal',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_year', models.PositiveSmallIntegerField()),
+                ('last_year', models.PositiveSmallIntegerField()),
+                ('matches_total', models.PositiveIntegerField()),
+                ('batting_innings_total', models.PositiveIntegerField()),
+                ('batting_runs_total', models.PositiveIntegerField()),
+                ('batting_not_outs_total', models.PositiveIntegerField()),
+                ('hundreds_total', models.PositiveIntegerField()),
+                ('bowling_balls_total', models.PositiveIntegerField()),
+                ('bowling_runs_total', models.PositiveIntegerField()),
+                ('bowling_wickets_total', models.PositiveIntegerField()),
+                ('five_wicket_innings_total', models.PositiveIntegerField()),
+                ('fielding_catches_wk_total', models.PositiveIntegerField()),
+                ('fielding_stumpings_total', models.PositiveIntegerField()),
+                ('fielding_catches_non_wk_total', models.PositiveIntegerField()),
+                ('fielding_run_outs_total', models.PositiveIntegerField()),
+            ],
+            options={
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(forward_create_totals, reverse_create_totals),
+    ]
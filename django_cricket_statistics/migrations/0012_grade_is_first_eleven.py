@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0011_totals'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grade',
+            name='is_first_eleven',
+            field=models.BooleanField(default=False, help_text='Appearances in this grade earn a first XI number.'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 3.1.14 on 2026-10-19 11:40
+
+from typing import Any
+
+from django.db import migrations, models
+from django.db.models import Max, Min, Q, Sum
+import django.db.models.deletion
+
+
+# frozen copy of rollups.build_player_summaries, so later changes cannot alter this step
+def forward_build_player_summaries(apps: Any, schema_editor: Any) -> None:
+    """Summarise the existing players from their statistics."""
+    using = schema_editor.connection.alias
+    Statistic = apps.get_model("django_cricket_statistics", "Statistic")
+    PlayerSummary = apps.get_model("django_cricket_statistics", "PlayerSummary")
+
+    senior = Q(grade__is_senior=True)
+    players = (
+        Statistic.objects.using(using)
+        .order_by()
+        .values("player")
+        .annotate(
+            first_year=Min("season__year"),
+            last_year=Max("season__year"),
+            matches_total=Sum("matches", filter=senior),
+            batting_runs_total=Sum("batting_runs", filter=senior),
+            bowling_wickets_total=Sum("bowling_wickets", filter=senior),
+        )
+    )
+    PlayerSummary.objects.using(using).bulk_create(
+        (
+            PlayerSummary(
+                player_id=player["player"],
+                first_year=player["first_year"],
+                last_year=player["last_year"],
+                matches_total=player["matches_total"] or 0,
+                batting_runs_total=player["batting_runs_total"] or 0,
+                bowling_wickets_total=player["bowling_wickets_total"] or 0,
+            )
+            for player in players
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0012_grade_is_first_eleven'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerSummary',
+            fields=[
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='django_cricket_statistics.player')),
+                ('first_year', models.PositiveSmallIntegerField()),
+                ('last_year', models.PositiveSmallIntegerField()),
+                ('matches_total', models.PositiveIntegerField(default=0, verbose_name='mat')),
+                ('batting_runs_total', models.PositiveIntegerField(default=0, verbose_name='runs')),
+                ('bowling_wickets_total', models.PositiveIntegerField(default=0, verbose_name='wkts')),
+            ],
+        ),
+        migrations.RunPython(forward_build_player_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 3.1.14 on 2026-10-19 12:25
+
+import string
+from typing import Any
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Substr
+
+
+# frozen copy of rollups.build_player_letters, so later changes cannot alter this step
+def forward_build_player_letters(apps: Any, schema_editor: Any) -> None:
+    """Count the existing players under each letter."""
+    using = schema_editor.connection.alias
+    Player = apps.get_model("django_cricket_statistics", "Player")
+    PlayerLetter = apps.get_model("django_cricket_statistics", "PlayerLetter")
+
+    counts = (
+        Player.objects.using(using)
+        .order_by()
+        .values(letter=Substr("sort_key", 1, 1))
+        .annotate(players_total=Count("pk"))
+    )
+    PlayerLetter.objects.using(using).bulk_create(
+        PlayerLetter(**count)
+        for count in counts
+        if count["letter"] in string.ascii_lowercase
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0013_player_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerLetter',
+            fields=[
+                ('letter', models.CharField(max_length=1, primary_key=True, serialize=False)),
+                ('players_total', models.PositiveIntegerField(default=0, verbose_name='players')),
+            ],
+            options={
+                'ordering': ('letter',),
+            },
+        ),
+        migrations.RunPython(forward_build_player_letters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.1.14 on 2026-10-19 07:58
+
+from typing import Any
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# frozen copy of changes.TRACKED_MODELS, so later changes cannot alter this step
+TRACKED_MODELS = ("Player", "Season", "Grade", "Statistic", "Hundred", "FiveWicketInning")
+
+
+def forward_record_existing_rows(apps: Any, schema_editor: Any) -> None:
+    """Record the existing rows as inserts, so the feed starts from them all."""
+    alias = schema_editor.connection.alias
+    Change = apps.get_model("django_cricket_statistics", "Change")
+    now = django.utils.timezone.now()
+    for name in TRACKED_MODELS:
+        model = apps.get_model("django_cricket_statistics", name)
+        Change.objects.using(alias).bulk_create(
+            (
+                Change(
+                    model=model._meta.model_name,
+                    object_id=pk,
+                    action="insert",
+                    changed_at=now,
+                )
+                for pk in model.objects.using(alias)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            ),
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0014_player_letter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=50)),
+                ('object_id', models.PositiveIntegerField()),
+                ('action', models.CharField(choices=[('insert', 'Insert'), ('update', 'Update'), ('delete', 'Delete')], max_length=6)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ('pk',),
+            },
+        ),
+        migrations.RunPython(forward_record_existing_rows, migrations.RunPython.noop),
+    ]
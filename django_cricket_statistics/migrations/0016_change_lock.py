@@ -0,0 +1,19 @@
+# Generated by Django 3.1.14 on 2026-10-19 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0015_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+    ]
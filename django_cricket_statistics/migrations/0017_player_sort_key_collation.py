@@ -0,0 +1,33 @@
+# Generated by Django 3.1.14 on 2026-10-19 14:05
+
+from typing import Any
+
+from django.db import migrations
+
+SORT_KEY_COLLATION = (
+    "ALTER TABLE django_cricket_statistics_player "
+    'ALTER COLUMN sort_key TYPE varchar(850) COLLATE "{collation}"'
+)
+
+
+def forward_sort_key_collation(apps: Any, schema_editor: Any) -> None:
+    """Compare the sort keys bytewise, as the locale collations ignore punctuation."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(SORT_KEY_COLLATION.format(collation="C"))
+
+
+def reverse_sort_key_collation(apps: Any, schema_editor: Any) -> None:
+    """Compare the sort keys with the default collation of the database."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(SORT_KEY_COLLATION.format(collation="default"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_cricket_statistics', '0016_change_lock'),
+    ]
+
+    operations = [
+        migrations.RunPython(forward_sort_key_collation, reverse_sort_key_collation),
+    ]
@@ -1,11 +1,12 @@
 """Models for statistics."""
 
 from decimal import Decimal
-from typing import Tuple
+from typing import Any, Optional, Tuple
 
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.urls import reverse
+from django.utils import timezone
 
 BALLS_PER_OVER = 6
 
@@ -28,6 +29,30 @@ class FirstElevenNumber(CricketModelBase):
         return str(self.pk)
 
 
+def player_names(
+    first_name: str, nickname: str, middle_names: str, last_name: str
+) -> Tuple[str, str, str]:
+    """Return the short name, long name and sort key of a player."""
+    initials = "".join(
+        name[0].upper() for name in f"{first_name} {middle_names}".split()
+    )
+    short_name = " ".join((initials or "Mr.", last_name))
+
+    names = (
+        first_name or "Mr.",
+        middle_names if middle_names else None,
+        "(" + nickname + ")" if nickname else None,
+        last_name,
+    )
+    long_name = " ".join(n for n in names if n is not None)
+
+    # the separator sorts before any letter so surnames are compared first, which
+    # holds as the column is compared bytewise rather than by a locale collation
+    sort_key = f"{last_name}, {first_name} {middle_names}".strip().casefold()
+
+    return short_name, long_name, sort_key
+
+
 class Player(CricketModelBase):
     """Class representing a single player."""
 
@@ -36,47 +61,43 @@ class Player(CricketModelBase):
     middle_names = models.CharField(max_length=200, blank=True)
     last_name = models.CharField(max_length=200)
 
+    # display names are stored so they can be sorted and read without a model
+    short_name = models.CharField(max_length=250, editable=False, db_index=True)
+    long_name = models.CharField(max_length=850, editable=False)
+    sort_key = models.CharField(max_length=850, editable=False, db_index=True)
+
     first_eleven_number = models.OneToOneField(
         FirstElevenNumber, on_delete=models.SET_NULL, blank=True, null=True
     )
 
     class Meta:  # noqa: D106
         unique_together = ("first_name", "nickname", "middle_names", "last_name")
-        ordering = ("last_name", "first_name", "middle_names")
+        ordering = ("sort_key",)
 
     def get_absolute_url(self) -> str:
         """Get url to a given model."""
         return reverse("player_career", args=(str(self.id),))
 
-    def __str__(self) -> str:
-        """Return the name of the player as initials and surname."""
-
-        def initials(names: Tuple[str, ...]) -> str:
-            """Return initials of first and middles names."""
-            name_split = str(names).split()
-            return "".join(s[0].upper() for s in name_split)
-
-        inits = "".join((initials(n) for n in (self.first_name, self.middle_names)))
-        inits = inits if inits else "Mr."
-        short_name = " ".join((inits, self.last_name))
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Update the stored display names before saving."""
+        self.short_name, self.long_name, self.sort_key = player_names(
+            self.first_name, self.nickname, self.middle_names, self.last_name
+        )
 
-        return short_name
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                "short_name",
+                "long_name",
+                "sort_key",
+            }
 
-    @property
-    def long_name(self) -> str:
-        """Return the full name (including nickname)."""
-        names = (
-            self.first_name or "Mr.",
-            self.middle_names if self.middle_names else None,
-            "(" + self.nickname + ")" if self.nickname else None,
-            self.last_name,
-        )
-        return " ".join(n for n in names if n is not None)
+        super().save(*args, **kwargs)
 
-    @property
-    def short_name(self) -> str:
+    def __str__(self) -> str:
         """Return the name of the player as initials and surname."""
-        return str(self)
+        return self.short_name
 
 
 class Season(CricketModelBase):
@@ -104,12 +125,19 @@ class Season(CricketModelBase):
         """Which year follows this one."""
         return int(self.year) + 1
 
+    def get_absolute_url(self) -> str:
+        """Get url to a given model."""
+        return reverse("season", args=(str(self.year),))
+
 
 class Grade(CricketModelBase):
     """Class representing a single grade."""
 
     grade = models.CharField(max_length=50)
     is_senior = models.BooleanField(default=True)
+    is_first_eleven = models.BooleanField(
+        default=False, help_text="Appearances in this grade earn a first XI number."
+    )
 
     class Meta:  # noqa: D106
         ordering = ("-is_senior", "grade")
@@ -192,12 +220,11 @@ class Statistic(CricketModelBase):
     class Meta:  # noqa: D106
         unique_together = ("player", "season", "grade")
         ordering = (
-            "player__last_name",
-            "player__first_name",
-            "player__middle_names",
+            "player__sort_key",
             "season",
             "grade",
         )
+        indexes = (models.Index(fields=("-best_bowling_wickets", "best_bowling_runs")),)
 
     def __str__(self) -> str:
         """Return a string for the statistic."""
@@ -251,3 +278,274 @@ class FiveWicketInning(CricketModelBase):
         return f"{self.wickets}/{self.runs}{finals_string}"
 
     figures.fget.short_description = "figures"  # type: ignore
+
+
+class StatisticCube(models.Model):
+    """Class representing aggregated statistics for a player/season/grade.
+
+    A null season or grade holds the rollup over all seasons or grades.
+    Only senior grades are included.
+    """
+
+    player = models.ForeignKey(Player, on_delete=models.CASCADE)
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, null=True)
+    grade = models.ForeignKey(Grade, on_delete=models.CASCADE, null=True)
+
+    first_year = models.PositiveSmallIntegerField()
+    last_year = models.PositiveSmallIntegerField()
+
+    matches_total = models.PositiveIntegerField(default=0)
+    batting_innings_total = models.PositiveIntegerField(default=0)
+    batting_runs_total = models.PositiveIntegerField(default=0)
+    batting_not_outs_total = models.PositiveIntegerField(default=0)
+    hundreds_total = models.PositiveIntegerField(default=0)
+    bowling_balls_total = models.PositiveIntegerField(default=0)
+    bowling_runs_total = models.PositiveIntegerField(default=0)
+    bowling_wickets_total = models.PositiveIntegerField(default=0)
+    five_wicket_innings_total = models.PositiveIntegerField(default=0)
+    fielding_catches_wk_total = models.PositiveIntegerField(default=0)
+    fielding_stumpings_total = models.PositiveIntegerField(default=0)
+    fielding_catches_non_wk_total = models.PositiveIntegerField(default=0)
+    fielding_run_outs_total = models.PositiveIntegerField(default=0)
+
+    best_bowling_wickets = models.PositiveSmallIntegerField(default=0)
+    best_bowling_runs = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:  # noqa: D106
+        indexes = (
+            models.Index(fields=("season", "grade", "player")),
+            models.Index(
+                fields=("season", "grade", "-best_bowling_wickets", "best_bowling_runs")
+            ),
+        )
+
+    @property
+    def season_range(self) -> str:
+        """Return the span of seasons of the cube cell."""
+        return f"{self.first_year}-{self.last_year + 1}"
+
+    @property
+    def bowling_best_bowling(self) -> Optional[str]:
+        """Return a string of the best bowling."""
+        if not self.best_bowling_wickets:
+            return None
+        return f"{self.best_bowling_wickets}/{self.best_bowling_runs}"
+
+    bowling_best_bowling.fget.short_description = "BBI"  # type: ignore
+
+    def __str__(self) -> str:
+        """Return a string for the cube cell."""
+        season = self.season or "All seasons"
+        grade = self.grade or "All grades"
+        return f"{self.player} - {season} - {grade}"
+
+
+class TotalBase(models.Model):
+    """Base class for totals kept by the database over senior statistics."""
+
+    player = models.ForeignKey(Player, on_delete=models.DO_NOTHING, related_name="+")
+
+    first_year = models.PositiveSmallIntegerField()
+    last_year = models.PositiveSmallIntegerField()
+
+    matches_total = models.PositiveIntegerField()
+    batting_innings_total = models.PositiveIntegerField()
+    batting_runs_total = models.PositiveIntegerField()
+    batting_not_outs_total = models.PositiveIntegerField()
+    hundreds_total = models.PositiveIntegerField()
+    bowling_balls_total = models.PositiveIntegerField()
+    bowling_runs_total = models.PositiveIntegerField()
+    bowling_wickets_total = models.PositiveIntegerField()
+    five_wicket_innings_total = models.PositiveIntegerField()
+    fielding_catches_wk_total = models.PositiveIntegerField()
+    fielding_stumpings_total = models.PositiveIntegerField()
+    fielding_catches_non_wk_total = models.PositiveIntegerField()
+    fielding_run_outs_total = models.PositiveIntegerField()
+
+    class Meta:  # noqa: D106
+        abstract = True
+
+    @property
+    def season_range(self) -> str:
+        """Return the span of seasons of the totals."""
+        return f"{self.first_year}-{self.last_year + 1}"
+
+
+class CareerTotal(TotalBase):
+    """Career totals of a player, kept by the database."""
+
+    class Meta:  # noqa: D106
+        managed = False
+
+
+class SeasonTotal(TotalBase):
+    """Season totals of a player, kept by the database."""
+
+    season = models.ForeignKey(Season, on_delete=models.DO_NOTHING, related_name="+")
+
+    class Meta:  # noqa: D106
+        managed = False
+
+
+class SeasonSummary(models.Model):
+    """Class representing the senior totals and leaders of a single season."""
+
+    season = models.OneToOneField(
+        Season, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+
+    players_total = models.PositiveIntegerField("players", default=0)
+    batting_runs_total = models.PositiveIntegerField("runs", default=0)
+    bowling_wickets_total = models.PositiveIntegerField("wkts", default=0)
+    hundreds_total = models.PositiveIntegerField("100", default=0)
+    five_wicket_innings_total = models.PositiveIntegerField("5WI", default=0)
+
+    leading_run_scorer = models.ForeignKey(
+        Player, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    leading_run_scorer_runs = models.PositiveIntegerField(default=0)
+    leading_wicket_taker = models.ForeignKey(
+        Player, on_delete=models.SET_NULL, null=True, related_name="+"
+    )
+    leading_wicket_taker_wickets = models.PositiveIntegerField(default=0)
+
+    class Meta:  # noqa: D106
+        ordering = ("-season__year",)
+
+    def __str__(self) -> str:
+        """Return the string representation of the summary."""
+        return str(self.season)
+
+    @property
+    def leading_run_scorer_display(self) -> Optional[str]:
+        """Return the leading run scorer with their runs."""
+        if self.leading_run_scorer is None:
+            return None
+        return f"{self.leading_run_scorer} ({self.leading_run_scorer_runs})"
+
+    @property
+    def leading_wicket_taker_display(self) -> Optional[str]:
+        """Return the leading wicket taker with their wickets."""
+        if self.leading_wicket_taker is None:
+            return None
+        return f"{self.leading_wicket_taker} ({self.leading_wicket_taker_wickets})"
+
+
+class PlayerSummary(models.Model):
+    """Class representing the career span and headline totals of a player.
+
+    The span covers every statistic of the player, and the totals their
+    senior statistics.
+    """
+
+    player = models.OneToOneField(
+        Player, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+
+    first_year = models.PositiveSmallIntegerField()
+    last_year = models.PositiveSmallIntegerField()
+    matches_total = models.PositiveIntegerField("mat", default=0)
+    batting_runs_total = models.PositiveIntegerField("runs", default=0)
+    bowling_wickets_total = models.PositiveIntegerField("wkts", default=0)
+
+    def __str__(self) -> str:
+        """Return the string representation of the summary."""
+        return str(self.player)
+
+    @property
+    def season_range(self) -> str:
+        """Return the span of seasons of the player."""
+        return f"{self.first_year}-{self.last_year + 1}"
+
+
+class PlayerLetter(models.Model):
+    """Class representing the number of players sorted under a letter."""
+
+    letter = models.CharField(max_length=1, primary_key=True)
+
+    players_total = models.PositiveIntegerField("players", default=0)
+
+    class Meta:  # noqa: D106
+        ordering = ("letter",)
+
+    def __str__(self) -> str:
+        """Return the letter in upper case."""
+        return self.letter.upper()
+
+
+class HighScore(models.Model):
+    """Class representing an individual senior innings score for the records.
+
+    Every senior hundred is included, along with the high score of each
+    senior statistic which is not already a hundred.
+    """
+
+    statistic = models.ForeignKey(Statistic, on_delete=models.CASCADE)
+    hundred = models.OneToOneField(Hundred, on_delete=models.CASCADE, null=True)
+
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="+")
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="+")
+    grade = models.ForeignKey(Grade, on_delete=models.CASCADE, related_name="+")
+
+    runs = models.PositiveSmallIntegerField()
+    is_not_out = models.BooleanField(default=False)
+    is_in_final = models.BooleanField(default=False)
+
+    class Meta:  # noqa: D106
+        ordering = ("-runs", "-is_not_out")
+        indexes = (models.Index(fields=("-runs", "-is_not_out")),)
+
+    @property
+    def score(self) -> str:
+        """Return a string of score."""
+        not_out_string = "*" if self.is_not_out else ""
+        finals_string = "#" if self.is_in_final else ""
+        return f"{self.runs}{not_out_string}{finals_string}"
+
+    score.fget.short_description = "score"  # type: ignore
+
+    def __str__(self) -> str:
+        """String representation of the high score."""
+        return self.score
+
+
+class Change(models.Model):
+    """Class representing an insert, update or delete of a statistics row.
+
+    Changes are only appended, one transaction at a time, so their primary
+    keys are cursors from which to read later changes.
+    """
+
+    class Action(models.TextChoices):  # noqa: D106
+        INSERT = "insert"
+        UPDATE = "update"
+        DELETE = "delete"
+
+    id = models.BigAutoField(primary_key=True)
+
+    model = models.CharField(max_length=50)
+    object_id = models.PositiveIntegerField()
+    action = models.CharField(max_length=6, choices=Action.choices)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:  # noqa: D106
+        ordering = ("pk",)
+
+    def __str__(self) -> str:
+        """Return the action and the changed row."""
+        return f"{self.action} {self.model} {self.object_id}"
+
+
+class ChangeLock(models.Model):
+    """Class representing the row locked while appending changes.
+
+    Primary keys are taken from a sequence as changes are inserted rather than
+    as they are committed, so a change could commit after a later one and be
+    passed over by a reader whose cursor is already beyond it. Appending
+    changes only while holding this row until commit keeps the changes
+    committing in the order of their keys.
+    """
+
+    def __str__(self) -> str:
+        """Return the name of the lock."""
+        return "change lock"
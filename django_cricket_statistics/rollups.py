@@ -0,0 +1,443 @@
+"""Maintain pre-aggregated statistics derived from the statistic tables."""
+
+import string
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import Substr
+
+from django_cricket_statistics.models import (
+    HighScore,
+    Player,
+    PlayerLetter,
+    PlayerSummary,
+    SeasonSummary,
+    Statistic,
+    StatisticCube,
+)
+
+# a statistic is identified by its player, season and grade primary keys
+StatisticKey = Tuple[int, int, int]
+CubeKey = Tuple[int, Optional[int], Optional[int]]
+
+# cube fields summed directly from the statistic fields
+CUBE_SUMS = {
+    "matches_total": ("matches",),
+    "batting_innings_total": ("batting_innings",),
+    "batting_runs_total": ("batting_runs",),
+    "batting_not_outs_total": ("batting_not_outs",),
+    "hundreds_total": ("hundreds",),
+    "bowling_balls_total": ("bowling_balls",),
+    "bowling_runs_total": ("bowling_runs",),
+    "bowling_wickets_total": ("bowling_wickets",),
+    "five_wicket_innings_total": ("five_wicket_innings",),
+    "fielding_catches_wk_total": ("fielding_catches_wk",),
+    "fielding_stumpings_total": ("fielding_stumpings",),
+    "fielding_catches_non_wk_total": ("fielding_catches_non_wk",),
+    "fielding_run_outs_total": ("fielding_run_outs", "fielding_throw_outs"),
+}
+CUBE_STATISTIC_FIELDS = (
+    "player",
+    "season",
+    "grade",
+    "season__year",
+    "matches",
+    "batting_innings",
+    "batting_runs",
+    "batting_not_outs",
+    "bowling_balls",
+    "bowling_runs",
+    "bowling_wickets",
+    "fielding_catches_wk",
+    "fielding_stumpings",
+    "fielding_catches_non_wk",
+    "fielding_run_outs",
+    "fielding_throw_outs",
+    "best_bowling_wickets",
+    "best_bowling_runs",
+)
+
+
+def cube_keys(key: StatisticKey) -> Tuple[CubeKey, ...]:
+    """Return the cube cells containing a given statistic."""
+    player, season, grade = key
+    return (
+        (player, season, grade),
+        (player, season, None),
+        (player, None, grade),
+        (player, None, None),
+    )
+
+
+def _update_best_bowling(cell: Dict, wickets: int, runs: int) -> None:
+    """Keep the best bowling figures of a cube cell, most wickets then fewest runs."""
+    best = (cell["best_bowling_wickets"], -cell["best_bowling_runs"])
+    if wickets and (wickets, -runs) > best:
+        cell["best_bowling_wickets"] = wickets
+        cell["best_bowling_runs"] = runs
+
+
+def _aggregate_cube(
+    statistics: models.QuerySet, cube_model: Type[models.Model]
+) -> Dict[CubeKey, models.Model]:
+    """Sum the statistics into every cube cell they contribute to."""
+    senior = statistics.filter(grade__is_senior=True).order_by()
+    statistics = senior.values(*CUBE_STATISTIC_FIELDS).annotate(
+        hundreds=Count("hundred", distinct=True),
+        five_wicket_innings=Count("fivewicketinning", distinct=True),
+    )
+
+    # five wicket innings are also best figures if the statistic is incomplete
+    five_wicket_innings = senior.filter(fivewicketinning__isnull=False).values_list(
+        "player",
+        "season",
+        "grade",
+        "fivewicketinning__wickets",
+        "fivewicketinning__runs",
+    )
+
+    cells: Dict[CubeKey, Dict] = defaultdict(lambda: defaultdict(int))
+    for stat in statistics:
+        for key in cube_keys((stat["player"], stat["season"], stat["grade"])):
+            cell = cells[key]
+            for field, names in CUBE_SUMS.items():
+                cell[field] += sum(stat[name] for name in names)
+
+            year = stat["season__year"]
+            cell["first_year"] = min(cell.get("first_year", year), year)
+            cell["last_year"] = max(cell.get("last_year", year), year)
+
+            _update_best_bowling(
+                cell, stat["best_bowling_wickets"], stat["best_bowling_runs"]
+            )
+
+    for player, season, grade, wickets, runs in five_wicket_innings:
+        for key in cube_keys((player, season, grade)):
+            _update_best_bowling(cells[key], wickets, runs)
+
+    # historical models in migrations may not have every field
+    fields = {field.attname for field in cube_model._meta.concrete_fields}
+    return {
+        key: cube_model(
+            player_id=key[0],
+            season_id=key[1],
+            grade_id=key[2],
+            **{name: value for name, value in cell.items() if name in fields},
+        )
+        for key, cell in cells.items()
+    }
+
+
+def build_statistic_cube(
+    statistic_model: Type[models.Model] = Statistic,
+    cube_model: Type[models.Model] = StatisticCube,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """Rebuild the entire statistic cube, returning the number of cells."""
+    cells = _aggregate_cube(statistic_model.objects.using(using).all(), cube_model)
+
+    with transaction.atomic(using=using):
+        cube_model.objects.using(using).all().delete()
+        cube_model.objects.using(using).bulk_create(cells.values(), batch_size=500)
+
+    return len(cells)
+
+
+def refresh_statistic_cube(keys: Iterable[StatisticKey]) -> None:
+    """Refresh only the cube cells containing the given statistics."""
+    touched: Set[CubeKey] = {cell for key in keys for cell in cube_keys(key)}
+    if not touched:
+        return
+
+    players = {player for player, _, _ in touched}
+    cells = _aggregate_cube(Statistic.objects.filter(player__in=players), StatisticCube)
+
+    stale = [
+        pk
+        for pk, *key in StatisticCube.objects.filter(player__in=players).values_list(
+            "pk", "player", "season", "grade"
+        )
+        if tuple(key) in touched
+    ]
+
+    with transaction.atomic():
+        StatisticCube.objects.filter(pk__in=stale).delete()
+        StatisticCube.objects.bulk_create(
+            cell for key, cell in cells.items() if key in touched
+        )
+
+
+def _summarise_seasons(
+    cells: models.QuerySet, summary_model: Type[models.Model]
+) -> Dict[int, models.Model]:
+    """Total the season cube cells of each player into season summaries."""
+    # ordering by player uses the name ordering of the (possibly historical) model
+    cells = cells.filter(season__isnull=False, grade__isnull=True).order_by("player")
+
+    summaries: Dict[int, models.Model] = {}
+    for cell in cells.values(
+        "season",
+        "player",
+        "batting_runs_total",
+        "bowling_wickets_total",
+        "hundreds_total",
+        "five_wicket_innings_total",
+    ):
+        summary = summaries.get(cell["season"])
+        if summary is None:
+            summary = summaries[cell["season"]] = summary_model(
+                season_id=cell["season"]
+            )
+
+        summary.players_total += 1
+        for field in (
+            "batting_runs_total",
+            "bowling_wickets_total",
+            "hundreds_total",
+            "five_wicket_innings_total",
+        ):
+            setattr(summary, field, getattr(summary, field) + cell[field])
+
+        # ties are resolved by name order
+        if cell["batting_runs_total"] > summary.leading_run_scorer_runs:
+            summary.leading_run_scorer_id = cell["player"]
+            summary.leading_run_scorer_runs = cell["batting_runs_total"]
+        if cell["bowling_wickets_total"] > summary.leading_wicket_taker_wickets:
+            summary.leading_wicket_taker_id = cell["player"]
+            summary.leading_wicket_taker_wickets = cell["bowling_wickets_total"]
+
+    return summaries
+
+
+def build_season_summaries(
+    cube_model: Type[models.Model] = StatisticCube,
+    summary_model: Type[models.Model] = SeasonSummary,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """Rebuild the summaries of every season from the cube."""
+    summaries = _summarise_seasons(cube_model.objects.using(using), summary_model)
+
+    with transaction.atomic(using=using):
+        summary_model.objects.using(using).all().delete()
+        summary_model.objects.using(using).bulk_create(summaries.values())
+
+    return len(summaries)
+
+
+def refresh_season_summaries(seasons: Iterable[int]) -> None:
+    """Refresh the summaries of the given seasons from the cube."""
+    seasons = set(seasons)
+    if not seasons:
+        return
+
+    summaries = _summarise_seasons(
+        StatisticCube.objects.filter(season__in=seasons), SeasonSummary
+    )
+
+    with transaction.atomic():
+        SeasonSummary.objects.filter(season__in=seasons).delete()
+        SeasonSummary.objects.bulk_create(summaries.values())
+
+
+def _high_scores(
+    statistics: models.QuerySet, high_score_model: Type[models.Model]
+) -> List[models.Model]:
+    """Return the hundreds and other high scores of the senior statistics."""
+    statistics = (
+        statistics.filter(grade__is_senior=True)
+        .order_by()
+        .prefetch_related("hundred_set")
+    )
+
+    scores: List[HighScore] = []
+    for stat in statistics:
+        key = {
+            "statistic_id": stat.pk,
+            "player_id": stat.player_id,
+            "season_id": stat.season_id,
+            "grade_id": stat.grade_id,
+        }
+        hundreds = stat.hundred_set.all()
+
+        scores.extend(
+            high_score_model(
+                hundred_id=hundred.pk,
+                runs=hundred.runs,
+                is_not_out=hundred.is_not_out,
+                is_in_final=hundred.is_in_final,
+                **key,
+            )
+            for hundred in hundreds
+        )
+
+        # the high score is only missing if it has not been entered as a hundred
+        high_score = (stat.batting_high_score_runs, stat.batting_high_score_is_not_out)
+        if high_score[0] and high_score not in {
+            (hundred.runs, hundred.is_not_out) for hundred in hundreds
+        }:
+            scores.append(
+                high_score_model(runs=high_score[0], is_not_out=high_score[1], **key)
+            )
+
+    return scores
+
+
+def build_high_scores(
+    statistic_model: Type[models.Model] = Statistic,
+    high_score_model: Type[models.Model] = HighScore,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """Rebuild the high scores of every statistic."""
+    scores = _high_scores(statistic_model.objects.using(using), high_score_model)
+
+    with transaction.atomic(using=using):
+        high_score_model.objects.using(using).all().delete()
+        high_score_model.objects.using(using).bulk_create(scores, batch_size=500)
+
+    return len(scores)
+
+
+def refresh_high_scores(keys: Iterable[StatisticKey]) -> None:
+    """Refresh the high scores of the given statistics."""
+    keys = set(keys)
+    if not keys:
+        return
+
+    statistics = [
+        pk
+        for pk, *key in Statistic.objects.filter(
+            player__in={player for player, _, _ in keys}
+        ).values_list("pk", "player", "season", "grade")
+        if tuple(key) in keys
+    ]
+
+    with transaction.atomic():
+        HighScore.objects.filter(statistic__in=statistics).delete()
+        HighScore.objects.bulk_create(
+            _high_scores(Statistic.objects.filter(pk__in=statistics), HighScore)
+        )
+
+
+def _summarise_players(
+    statistics: models.QuerySet, summary_model: Type[models.Model]
+) -> List[models.Model]:
+    """Return the career span and senior totals of each player."""
+    senior = Q(grade__is_senior=True)
+    players = (
+        statistics.order_by()
+        .values("player")
+        .annotate(
+            first_year=Min("season__year"),
+            last_year=Max("season__year"),
+            matches_total=Sum("matches", filter=senior),
+            batting_runs_total=Sum("batting_runs", filter=senior),
+            bowling_wickets_total=Sum("bowling_wickets", filter=senior),
+        )
+    )
+
+    return [
+        summary_model(
+            player_id=player["player"],
+            first_year=player["first_year"],
+            last_year=player["last_year"],
+            matches_total=player["matches_total"] or 0,
+            batting_runs_total=player["batting_runs_total"] or 0,
+            bowling_wickets_total=player["bowling_wickets_total"] or 0,
+        )
+        for player in players
+    ]
+
+
+def build_player_summaries(
+    statistic_model: Type[models.Model] = Statistic,
+    summary_model: Type[models.Model] = PlayerSummary,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """Rebuild the summaries of every player."""
+    summaries = _summarise_players(
+        statistic_model.objects.using(using).all(), summary_model
+    )
+
+    with transaction.atomic(using=using):
+        summary_model.objects.using(using).all().delete()
+        summary_model.objects.using(using).bulk_create(summaries, batch_size=500)
+
+    return len(summaries)
+
+
+def refresh_player_summaries(players: Iterable[int]) -> None:
+    """Refresh the summaries of the given players."""
+    players = set(players)
+    if not players:
+        return
+
+    summaries = _summarise_players(
+        Statistic.objects.filter(player__in=players), PlayerSummary
+    )
+
+    with transaction.atomic():
+        PlayerSummary.objects.filter(player__in=players).delete()
+        PlayerSummary.objects.bulk_create(summaries)
+
+
+def build_player_letters(
+    player_model: Type[models.Model] = Player,
+    letter_model: Type[models.Model] = PlayerLetter,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """Rebuild the number of players sorted under each letter.
+
+    Letters without players are left out, as are players sorted under
+    anything but a letter.
+    """
+    counts = (
+        player_model.objects.using(using)
+        .order_by()
+        .values(letter=Substr("sort_key", 1, 1))
+        .annotate(players_total=Count("pk"))
+    )
+    letters = [
+        letter_model(**count)
+        for count in counts
+        if count["letter"] in string.ascii_lowercase
+    ]
+
+    with transaction.atomic(using=using):
+        letter_model.objects.using(using).all().delete()
+        letter_model.objects.using(using).bulk_create(letters)
+
+    return len(letters)
+
+
+def player_letter(sort_key: Optional[str]) -> Optional[str]:
+    """Return the letter a player is sorted under, if it is a letter."""
+    letter = (sort_key or "")[:1]
+    return letter if letter and letter in string.ascii_lowercase else None
+
+
+def move_player_letter(
+    previous_sort_key: Optional[str],
+    sort_key: Optional[str],
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Move a player between the counts of the letters of their sort keys.
+
+    The counts are adjusted in place so concurrent saves of players do not
+    lose each other's changes. A letter keeps its row once its players are
+    gone, with a count of zero.
+    """
+    previous, letter = player_letter(previous_sort_key), player_letter(sort_key)
+    if previous == letter:
+        return
+
+    letters = PlayerLetter.objects.using(using)
+    with transaction.atomic(using=using):
+        if previous is not None:
+            letters.filter(letter=previous, players_total__gt=0).update(
+                players_total=F("players_total") - 1
+            )
+        if letter is not None:
+            letters.get_or_create(letter=letter)
+            letters.filter(letter=letter).update(players_total=F("players_total") + 1)
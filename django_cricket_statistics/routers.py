@@ -0,0 +1,123 @@
+"""Route the reads of the public statistics views to a read database."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, models
+from django.http import HttpRequest, HttpResponse
+
+from django_cricket_statistics.cache import CACHE_PREFIX
+
+APP_LABEL = "django_cricket_statistics"
+
+# session key of the time until which the session reads its own writes
+PINNED_SESSION_KEY = "django_cricket_statistics_pinned_until"
+LAST_WRITE_KEY = f"{CACHE_PREFIX}:last_write"
+
+# the database read by the statistics views in this context, if any
+_read_database: ContextVar[Optional[str]] = ContextVar("read_database", default=None)
+_written: ContextVar[bool] = ContextVar("written", default=False)
+
+
+def read_database() -> str:
+    """Return the alias of the database for public reads."""
+    return getattr(settings, "CRICKET_STATISTICS_READ_DATABASE", DEFAULT_DB_ALIAS)
+
+
+def replication_lag() -> float:
+    """Return the seconds after a write during which the read database lags."""
+    return getattr(settings, "CRICKET_STATISTICS_REPLICATION_LAG", 5)
+
+
+@contextmanager
+def use_read_database(request: HttpRequest) -> Iterator[None]:
+    """Route reads to the read database unless they must see recent writes.
+
+    A session which has just written reads its own writes from the primary,
+    and shortly after any write all sessions do so that a lagging read
+    database is never stored in the shared cache.
+    """
+    now = time.time()
+    session = getattr(request, "session", None)
+    pinned = session is not None and session.get(PINNED_SESSION_KEY, 0) > now
+    recent = cache.get(LAST_WRITE_KEY, 0) > now - replication_lag()
+
+    alias = DEFAULT_DB_ALIAS if pinned or recent else read_database()
+    token = _read_database.set(alias)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+class ReadDatabaseMixin:
+    """Read the data of a view from the read database."""
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        """Dispatch the request with reads routed to the read database."""
+        with use_read_database(request):
+            response = super().dispatch(request, *args, **kwargs)  # type: ignore
+
+            # querysets evaluated while rendering must also use the read database
+            if hasattr(response, "render"):
+                response.render()
+
+            return response
+
+
+class ReadDatabaseRouter:
+    """Send reads of statistics by the statistics views to the read database.
+
+    All other reads, including users and sessions, and every write use the
+    primary database.
+    """
+
+    # pylint: disable=no-self-use,unused-argument
+
+    def db_for_read(self, model: models.Model, **hints: Any) -> Optional[str]:
+        """Return the read database for statistics read in a statistics view."""
+        if model._meta.app_label != APP_LABEL:
+            return None
+        return _read_database.get()
+
+    def db_for_write(self, model: models.Model, **hints: Any) -> Optional[str]:
+        """Record the write so the session is pinned to the primary database."""
+        _written.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(
+        self, obj1: models.Model, obj2: models.Model, **hints: Any
+    ) -> bool:
+        """Allow relations between objects read from either database."""
+        return True
+
+
+class ReadYourWritesMiddleware:
+    """Pin a session which has written to read from the primary database.
+
+    This must come after the session middleware.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        """Store the next handler."""
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Pin the session if the request wrote to the database."""
+        token = _written.set(False)
+        try:
+            response = self.get_response(request)
+            if _written.get():
+                now = time.time()
+                cache.set(LAST_WRITE_KEY, now, timeout=None)
+                session = getattr(request, "session", None)
+                if session is not None:
+                    session[PINNED_SESSION_KEY] = now + replication_lag()
+        finally:
+            _written.reset(token)
+
+        return response
@@ -0,0 +1,152 @@
+"""In-memory search of players by any part of their names."""
+
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import DEFAULT_DB_ALIAS
+
+from django_cricket_statistics.cache import PLAYERS_TAG, tag_versions
+from django_cricket_statistics.models import Player
+
+# names matched by prefix are ranked above those matched despite a typo
+PREFIX_SCORE = 2
+FUZZY_SCORE = 1
+
+# tokens this short are only matched by prefix
+MIN_FUZZY_LENGTH = 3
+
+
+def name_tokens(text: str) -> List[str]:
+    """Return the casefolded words of a name without accents."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c if c.isalnum() else " " for c in decomposed if c.isascii())
+    return text.split()
+
+
+def trigrams(token: str) -> Set[str]:
+    """Return the trigrams of a token, padded to mark its start and end."""
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Return whether the strings differ by at most one edit or transposition."""
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+
+    if len(a) < len(b):
+        # a character inserted into the shorter string
+        return a[i:] == b[i + 1 :]
+
+    # a character substituted, or two adjacent characters transposed
+    return a[i + 1 :] == b[i + 1 :] or (
+        a[i : i + 2] == b[i : i + 2][::-1] and a[i + 2 :] == b[i + 2 :]
+    )
+
+
+class PlayerSearchIndex:
+    """Index of the name parts of every player.
+
+    Every prefix of every name part maps to the players with that name part,
+    and trigrams of the name parts find candidates for typo tolerant matches.
+    """
+
+    def __init__(self, players: Iterable[Tuple[int, str, str, str, str, str]]) -> None:
+        """Index the primary key, names and sort key of each player."""
+        self.prefixes: Dict[str, Set[int]] = defaultdict(set)
+        self.tokens: Dict[str, Set[int]] = defaultdict(set)
+        self.trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self.sort_keys: Dict[int, str] = {}
+
+        for pk, first_name, middle_names, nickname, last_name, sort_key in players:
+            self.sort_keys[pk] = sort_key
+            for token in name_tokens(
+                " ".join((first_name, middle_names, nickname, last_name))
+            ):
+                self.tokens[token].add(pk)
+                for end in range(1, len(token) + 1):
+                    self.prefixes[token[:end]].add(pk)
+
+        for token in self.tokens:
+            for trigram in trigrams(token):
+                self.trigrams[trigram].add(token)
+
+    def _matches(self, token: str) -> Dict[int, int]:
+        """Return the score of each player matching a query token."""
+        scores = dict.fromkeys(self.prefixes.get(token, ()), PREFIX_SCORE)
+        if scores or len(token) < MIN_FUZZY_LENGTH:
+            return scores
+
+        # candidates share at least one trigram with the token
+        candidates = set().union(
+            *(self.trigrams.get(trigram, ()) for trigram in trigrams(token))
+        )
+        for candidate in candidates:
+            # a typo may also be in the prefix of a longer name
+            if any(
+                within_one_edit(token, candidate[:end])
+                for end in (len(token) - 1, len(token), len(token) + 1)
+            ):
+                for pk in self.tokens[candidate]:
+                    scores.setdefault(pk, FUZZY_SCORE)
+
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Return the players matching every word of the query, best first."""
+        scores: Optional[Dict[int, int]] = None
+        for token in name_tokens(query):
+            matches = self._matches(token)
+            if scores is None:
+                scores = matches
+            else:
+                scores = {
+                    pk: score + matches[pk]
+                    for pk, score in scores.items()
+                    if pk in matches
+                }
+
+        found = scores or {}
+        ranked = sorted(found, key=lambda pk: (-found[pk], self.sort_keys[pk]))
+        return ranked[:limit]
+
+
+_index: Optional[Tuple[int, PlayerSearchIndex]] = None
+_lock = threading.Lock()
+
+
+def player_search_index() -> PlayerSearchIndex:
+    """Return the index of the players, rebuilt after any player changes.
+
+    The index is rebuilt in each process once the players tag of the cache
+    moves on, which happens on every save or deletion of a player. It is read
+    from the primary database, as a lagging read database would leave the
+    rebuilt index behind the tag until the next change of a player.
+    """
+    global _index  # pylint: disable=global-statement
+
+    version = tag_versions((PLAYERS_TAG,))[PLAYERS_TAG]
+    index = _index
+    if index is not None and index[0] == version:
+        return index[1]
+
+    with _lock:
+        if _index is None or _index[0] != version:
+            players = Player.objects.using(DEFAULT_DB_ALIAS).values_list(
+                "pk", "first_name", "middle_names", "nickname", "last_name", "sort_key"
+            )
+            _index = (version, PlayerSearchIndex(players))
+        return _index[1]
+
+
+def search_players(query: str, limit: Optional[int] = None) -> List[int]:
+    """Return the primary keys of the players best matching the query."""
+    return player_search_index().search(query, limit=limit)
@@ -0,0 +1,229 @@
+"""Signals keeping derived statistics up to date."""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Dict, Iterator, Optional, Set
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from django_cricket_statistics.cache import (
+    ALL_TAG,
+    PLAYERS_TAG,
+    career_chart_key,
+    invalidate_tags,
+)
+from django_cricket_statistics.changes import TRACKED_MODELS, record_changes
+from django_cricket_statistics.models import (
+    Change,
+    FiveWicketInning,
+    Grade,
+    Hundred,
+    Player,
+    Season,
+    Statistic,
+)
+from django_cricket_statistics.rollups import (
+    StatisticKey,
+    move_player_letter,
+    refresh_high_scores,
+    refresh_player_summaries,
+    refresh_season_summaries,
+    refresh_statistic_cube,
+)
+from django_cricket_statistics.totals import materialized_totals_enabled, refresh_totals
+
+# sent with the (player, season, grade) keys of statistics which have changed
+statistics_changed = Signal()
+
+KEY_FIELDS = ("player", "season", "grade")
+
+# keys of the statistics changed in the current batch, if any
+_batch: ContextVar[Optional[Set[StatisticKey]]] = ContextVar("batch", default=None)
+
+
+@contextmanager
+def batch_statistics_changes() -> Iterator[Set[StatisticKey]]:
+    """Announce the statistics changed within the block once, at its end.
+
+    Keys of statistics changed by bulk operations, which send no signals,
+    must be added to the yielded set. Nothing is announced if the block
+    raises, and nested blocks join the outermost batch.
+    """
+    keys = _batch.get()
+    if keys is not None:
+        yield keys
+        return
+
+    keys = set()
+    token = _batch.set(keys)
+    try:
+        yield keys
+    finally:
+        _batch.reset(token)
+
+    if keys:
+        statistics_changed.send(sender=Statistic, keys=keys)
+
+
+def _announce(sender: Any, keys: Set[StatisticKey]) -> None:
+    """Announce changed statistics now, or at the end of the current batch."""
+    batch = _batch.get()
+    if batch is not None:
+        batch |= keys
+    else:
+        statistics_changed.send(sender=sender, keys=keys)
+
+
+def statistic_key(statistic: Statistic) -> StatisticKey:
+    """Return the key of a statistic."""
+    return (statistic.player_id, statistic.season_id, statistic.grade_id)
+
+
+@receiver(pre_save, sender=Statistic)
+def remember_statistic_key(sender: Any, instance: Statistic, **kwargs: Any) -> None:
+    """Remember the key before saving as the player/season/grade may change."""
+    instance._previous_keys = set(  # pylint: disable=protected-access
+        Statistic.objects.filter(pk=instance.pk).values_list(*KEY_FIELDS)
+        if instance.pk
+        else ()
+    )
+
+
+@receiver(post_save, sender=Statistic)
+@receiver(post_delete, sender=Statistic)
+def statistic_saved(
+    sender: Any, instance: Statistic, raw: bool = False, **kwargs: Any
+) -> None:
+    """Announce the change of a statistic."""
+    if raw:
+        return
+
+    keys: Set[StatisticKey] = {statistic_key(instance)}
+    keys |= getattr(instance, "_previous_keys", set())
+    _announce(sender, keys)
+
+
+@receiver(post_save, sender=Hundred)
+@receiver(post_delete, sender=Hundred)
+@receiver(post_save, sender=FiveWicketInning)
+@receiver(post_delete, sender=FiveWicketInning)
+def statistic_child_saved(
+    sender: Any, instance: Any, raw: bool = False, **kwargs: Any
+) -> None:
+    """Announce the change of the statistic containing a hundred or 5WI."""
+    if raw:
+        return
+
+    keys = set(
+        Statistic.objects.filter(pk=instance.statistic_id).values_list(*KEY_FIELDS)
+    )
+    _announce(sender, keys)
+
+
+@receiver(post_save, sender=Season)
+@receiver(post_save, sender=Grade)
+def season_or_grade_saved(
+    sender: Any, instance: Any, raw: bool = False, **kwargs: Any
+) -> None:
+    """Announce the change of all statistics in a season or grade."""
+    if raw:
+        return
+
+    lookup = {sender._meta.model_name: instance.pk}
+    keys = set(Statistic.objects.filter(**lookup).values_list(*KEY_FIELDS))
+    if keys:
+        _announce(sender, keys)
+
+
+@receiver(statistics_changed)
+def refresh_rollups(sender: Any, keys: Set[StatisticKey], **kwargs: Any) -> None:
+    """Refresh the rollups touched by the changes once they are committed."""
+    transaction.on_commit(partial(_refresh_rollups, keys))
+
+
+def _refresh_rollups(keys: Set[StatisticKey]) -> None:
+    """Refresh the rollups in dependency order, then the queries reading them."""
+    refresh_statistic_cube(keys)
+    refresh_high_scores(keys)
+
+    # the season summaries read the refreshed cube
+    refresh_season_summaries(season for _, season, _ in keys)
+    refresh_player_summaries(player for player, _, _ in keys)
+    if materialized_totals_enabled():
+        refresh_totals(player for player, _, _ in keys)
+
+    # until now other requests read, and would cache, the old rollups
+    cache.delete_many([career_chart_key(player) for player, _, _ in keys])
+    invalidate_tags(_statistic_tags(keys))
+
+
+def _statistic_tags(keys: Set[StatisticKey]) -> Dict[str, Set[int]]:
+    """Return the tags of the players, seasons and grades changed."""
+    changes: Dict[str, Set[int]] = defaultdict(set)
+    for player, season, grade in keys:
+        for tag in (ALL_TAG, f"player:{player}", f"season:{season}", f"grade:{grade}"):
+            changes[tag].add(player)
+    return changes
+
+
+@receiver(pre_save, sender=Player)
+def remember_sort_key(sender: Any, instance: Player, **kwargs: Any) -> None:
+    """Remember the sort key before saving as the letter of the player may change."""
+    instance._previous_sort_key = (  # pylint: disable=protected-access
+        Player.objects.using(kwargs["using"])
+        .filter(pk=instance.pk)
+        .values_list("sort_key", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Player)
+@receiver(post_delete, sender=Player)
+def player_saved(
+    sender: Any, instance: Player, raw: bool = False, **kwargs: Any
+) -> None:
+    """Count the player under their letter and invalidate cached queries."""
+    if not raw:
+        if kwargs["signal"] is post_delete:
+            move_player_letter(instance.sort_key, None, using=kwargs["using"])
+        else:
+            move_player_letter(
+                getattr(instance, "_previous_sort_key", None),
+                instance.sort_key,
+                using=kwargs["using"],
+            )
+
+        players = {instance.pk}
+        transaction.on_commit(
+            partial(
+                invalidate_tags,
+                {f"player:{instance.pk}": players, PLAYERS_TAG: players},
+            ),
+            using=kwargs["using"],
+        )
+
+
+def record_change(
+    sender: Any, instance: Any, created: bool = False, **kwargs: Any
+) -> None:
+    """Record the insert, update or delete of a tracked row."""
+    if kwargs["signal"] is post_delete:
+        action = Change.Action.DELETE
+    elif created:
+        action = Change.Action.INSERT
+    else:
+        action = Change.Action.UPDATE
+
+    record_changes(sender, action, (instance.pk,), using=kwargs["using"])
+
+
+for tracked in TRACKED_MODELS:
+    post_save.connect(record_change, sender=tracked)
+    post_delete.connect(record_change, sender=tracked)
@@ -0,0 +1,120 @@
+"""Career and season totals kept by the database.
+
+On PostgreSQL the totals are materialized views which are refreshed
+concurrently, and on other databases they are plain summary tables whose
+changed players are rebuilt within a transaction.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+# total columns summed over the senior statistics of each group
+TOTALS_SELECT = """
+SELECT
+    MIN(statistic.id) AS id,
+    statistic.player_id AS player_id,
+    {season_column}
+    MIN(season.year) AS first_year,
+    MAX(season.year) AS last_year,
+    SUM(statistic.matches) AS matches_total,
+    SUM(statistic.batting_innings) AS batting_innings_total,
+    SUM(statistic.batting_runs) AS batting_runs_total,
+    SUM(statistic.batting_not_outs) AS batting_not_outs_total,
+    SUM(COALESCE(hundred.total, 0)) AS hundreds_total,
+    SUM(statistic.bowling_balls) AS bowling_balls_total,
+    SUM(statistic.bowling_runs) AS bowling_runs_total,
+    SUM(statistic.bowling_wickets) AS bowling_wickets_total,
+    SUM(COALESCE(five_wicket_inning.total, 0)) AS five_wicket_innings_total,
+    SUM(statistic.fielding_catches_wk) AS fielding_catches_wk_total,
+    SUM(statistic.fielding_stumpings) AS fielding_stumpings_total,
+    SUM(statistic.fielding_catches_non_wk) AS fielding_catches_non_wk_total,
+    SUM(statistic.fielding_run_outs + statistic.fielding_throw_outs)
+        AS fielding_run_outs_total
+FROM django_cricket_statistics_statistic statistic
+INNER JOIN django_cricket_statistics_grade grade ON grade.id = statistic.grade_id
+INNER JOIN django_cricket_statistics_season season
+    ON season.id = statistic.season_id
+LEFT OUTER JOIN (
+    SELECT statistic_id, COUNT(*) AS total
+    FROM django_cricket_statistics_hundred
+    GROUP BY statistic_id
+) hundred ON hundred.statistic_id = statistic.id
+LEFT OUTER JOIN (
+    SELECT statistic_id, COUNT(*) AS total
+    FROM django_cricket_statistics_fivewicketinning
+    GROUP BY statistic_id
+) five_wicket_inning ON five_wicket_inning.statistic_id = statistic.id
+WHERE grade.is_senior{player_filter}
+GROUP BY statistic.player_id{season_group}
+"""
+
+# the select and unique columns of each totals table, the players filtered later
+TOTALS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "django_cricket_statistics_careertotal": (
+        TOTALS_SELECT.format(
+            season_column="", season_group="", player_filter="{player_filter}"
+        ),
+        ("player_id",),
+    ),
+    "django_cricket_statistics_seasontotal": (
+        TOTALS_SELECT.format(
+            season_column="statistic.season_id AS season_id,",
+            season_group=", statistic.season_id",
+            player_filter="{player_filter}",
+        ),
+        ("player_id", "season_id"),
+    ),
+}
+
+
+def materialized_totals_enabled() -> bool:
+    """Return whether the leaderboards read the career and season totals."""
+    return getattr(settings, "CRICKET_STATISTICS_MATERIALIZED_TOTALS", False)
+
+
+def _is_materialized(connection: BaseDatabaseWrapper) -> bool:
+    """Return whether the totals are materialized views on this database."""
+    return connection.vendor == "postgresql"
+
+
+def refresh_totals(
+    players: Optional[Iterable[int]] = None, using: str = DEFAULT_DB_ALIAS
+) -> None:
+    """Refresh the totals of the players, or of every player.
+
+    Materialized views can only be refreshed whole, so on PostgreSQL every
+    total is recomputed without blocking reads of the current totals. This
+    costs a full aggregation of the senior statistics for each refresh, though
+    statistics saved together, as by the admin, are refreshed once.
+    """
+    connection = connections[using]
+
+    if _is_materialized(connection):
+        with connection.cursor() as cursor:
+            for table in TOTALS:
+                cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {table}")
+        return
+
+    players = None if players is None else sorted(set(players))
+    if players == []:
+        return
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for table, (select, _) in TOTALS.items():
+            if players is None:
+                cursor.execute(f"DELETE FROM {table}")
+                cursor.execute(f"INSERT INTO {table} {select.format(player_filter='')}")
+                continue
+
+            placeholders = ", ".join(["%s"] * len(players))
+            cursor.execute(
+                f"DELETE FROM {table} WHERE player_id IN ({placeholders})", players
+            )
+            player_filter = f" AND statistic.player_id IN ({placeholders})"
+            cursor.execute(
+                f"INSERT INTO {table} {select.format(player_filter=player_filter)}",
+                players,
+            )
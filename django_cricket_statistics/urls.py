@@ -25,7 +25,7 @@ BATTING_PATTERNS = {
     "Most runs (season)": "batting-runs-season",
     "Best batting average (career)": "batting-average-career",
     "Best batting average (season)": "batting-average-season",
-    # "Most runs in an innings": "batting/highscore/career",
+    "Most runs in an innings": "batting-best-innings",
     "Most hundreds (career)": "batting-hundreds-career",
     "Most hundreds (season)": "batting-hundreds-season",
 }
@@ -39,6 +39,8 @@ BOWLING_PATTERNS = {
     "Best economy rate (season)": "bowling-economy-rate-season",
     "Best strike rate (career)": "bowling-strike-rate-career",
     "Best strike rate (season)": "bowling-strike-rate-season",
+    "Best bowling figures (career)": "bowling-best-innings-career",
+    "Best bowling figures (season)": "bowling-best-innings-season",
     "Most five wicket innings (career)": "bowling-five-wicket-innings-career",
     "Most five wicket innings (season)": "bowling-five-wicket-innings-season",
 }
@@ -131,18 +133,37 @@ urlpatterns = [
         views.IndexView.as_view(links=FIELDING_PATTERNS, title="Fielding records"),
         name="fielding-statistics",
     ),
+    path("leaderboard/", views.LeaderboardView.as_view(), name="leaderboard"),
     path(
         "players/numbers/",
         views.PlayerListFirstElevenNumberView.as_view(),
         name="player-list-first-eleven-number",
     ),
+    path(
+        "players/compare/",
+        views.PlayerComparisonView.as_view(),
+        name="player-comparison",
+    ),
+    path(
+        "players/search/",
+        views.PlayerSearchView.as_view(),
+        name="player-search",
+    ),
     path("players/<int:pk>/", views.PlayerCareerView.as_view(), name="player"),
+    path(
+        "players/<int:pk>/chart/",
+        views.PlayerCareerChartView.as_view(),
+        name="player-career-chart",
+    ),
     path(
         "players/<str:letter>/",
         views.PlayerListView.as_view(),
         name="player-list-letter",
     ),
     path("players/", views.PlayerListView.as_view(), name="player-list-all"),
+    path("seasons/<int:year>/", views.SeasonDetailView.as_view(), name="season"),
+    path("seasons/", views.SeasonListView.as_view(), name="season-list"),
+    path("changes/", views.ChangeFeedView.as_view(), name="change-feed"),
     path(
         "",
         views.IndexView.as_view(
@@ -6,7 +6,10 @@ from django_cricket_statistics.views.bowling import *
 from django_cricket_statistics.views.wicketkeeping import *
 from django_cricket_statistics.views.fielding import *
 from django_cricket_statistics.views.misc import *
+from django_cricket_statistics.views.leaderboard import *
 
 from django_cricket_statistics.views.players import *
+from django_cricket_statistics.views.seasons import *
 
 from django_cricket_statistics.views.indices import *
+from django_cricket_statistics.views.changes import *
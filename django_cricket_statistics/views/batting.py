@@ -1,6 +1,13 @@
 """Views for batting statistics."""
 
-from django_cricket_statistics.views.common import CareerStatistic, SeasonStatistic
+from django.db.models import QuerySet
+
+from django_cricket_statistics.models import HighScore
+from django_cricket_statistics.views.common import (
+    CareerStatistic,
+    PlayerStatisticView,
+    SeasonStatistic,
+)
 from django_cricket_statistics.views.statistics import (
     BATTING_RUNS,
     BATTING_AVERAGE,
@@ -46,15 +53,22 @@ class BattingAverageSeasonView(SeasonStatistic):
     columns_float = {"batting_average"}
 
 
-class BattingBestInningsView(CareerStatistic):
+class BattingBestInningsView(PlayerStatisticView):
     """Best batting innings."""
 
-    ordering = (
-        "-batting_high_score",
-        "-batting_high_score_is_not_out",
-        "grade",
-        "-season",
-    )
+    ordering = ("-runs", "-is_not_out")
+    columns_default = {
+        "player": "Player",
+        "season": "Season",
+        "grade": "Grade",
+        "score": "Score",
+    }
+
+    def get_queryset(self) -> QuerySet:
+        """Return the highest scores, read in order from their index."""
+        queryset = HighScore.objects.filter(**self.get_pre_filters())
+        queryset = queryset.select_related("player", "season", "grade")
+        return queryset.order_by(*self.ordering)
 
 
 class BattingHundredsCareerView(CareerStatistic):
@@ -1,6 +1,14 @@
 """Views for bowling statistics."""
 
-from django_cricket_statistics.views.common import CareerStatistic, SeasonStatistic
+from django.db.models import QuerySet
+
+from django_cricket_statistics.models import StatisticCube
+from django_cricket_statistics.views.common import (
+    CUBE_DIMENSIONS,
+    CareerStatistic,
+    PlayerStatisticView,
+    SeasonStatistic,
+)
 from django_cricket_statistics.views.statistics import (
     BOWLING_BALLS,
     BOWLING_WICKETS,
@@ -87,10 +95,53 @@ class BowlingStrikeRateSeasonView(SeasonStatistic):
     filters = {"bowling_balls__sum__gte": 400}
 
 
-class BowlingBestInningsView(CareerStatistic):
-    """Best bowling innings."""
+class BowlingBestInningsCareerView(PlayerStatisticView):
+    """Best career bowling figures of each player."""
+
+    ordering = ("-best_bowling_wickets", "best_bowling_runs")
+    columns_default = {
+        "player": "Player",
+        "season_range": "Span",
+        "bowling_best_bowling": "BBI",
+    }
+
+    def get_queryset(self) -> QuerySet:
+        """Return the best figures, read in order from the cube index."""
+        queryset = StatisticCube.objects.filter(best_bowling_wickets__gt=0)
+
+        # a null dimension is the rollup over all its values
+        pre_filters = self.get_pre_filters()
+        for name in CUBE_DIMENSIONS:
+            if name not in pre_filters:
+                pre_filters[f"{name}__isnull"] = True
+
+        queryset = queryset.filter(**pre_filters).select_related("player")
+        return queryset.order_by(*self.ordering)
+
+
+class BowlingBestInningsSeasonView(PlayerStatisticView):
+    """Best bowling figures in a season."""
+
+    ordering = ("-best_bowling_wickets", "best_bowling_runs")
+    columns_default = {
+        "player": "Player",
+        "season": "Season",
+        "bowling_best_bowling": "BBI",
+    }
+
+    def get_queryset(self) -> QuerySet:
+        """Return the best figures of each season, read in order from the cube index."""
+        queryset = StatisticCube.objects.filter(
+            season__isnull=False, best_bowling_wickets__gt=0
+        )
+
+        # the figures of a season are the best of its grades unless one is chosen
+        pre_filters = self.get_pre_filters()
+        if "grade" not in pre_filters:
+            pre_filters["grade__isnull"] = True
 
-    ordering = ("-best_bowling_wickets", "best_bowling_runs", "grade", "-season")
+        queryset = queryset.filter(**pre_filters).select_related("player", "season")
+        return queryset.order_by(*self.ordering)
 
 
 class BowlingFiveWicketInningsCareerView(CareerStatistic):
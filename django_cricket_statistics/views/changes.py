@@ -0,0 +1,30 @@
+"""View for the feed of changes to the statistics."""
+
+from django.http import HttpRequest, JsonResponse
+from django.views.generic import View
+
+from django_cricket_statistics.changes import CHANGE_FEED_LIMIT, change_feed
+from django_cricket_statistics.routers import ReadDatabaseMixin
+
+
+class ChangeFeedView(ReadDatabaseMixin, View):
+    """View for the changes after a cursor, for incremental downloads."""
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        """Return a page of changes and the cursor to read the next page from."""
+        try:
+            cursor = int(request.GET.get("cursor", 0))
+            limit = int(request.GET.get("limit", CHANGE_FEED_LIMIT))
+        except ValueError:
+            return JsonResponse(
+                {"error": "cursor and limit must be integers"}, status=400
+            )
+
+        if cursor < 0:
+            return JsonResponse({"error": "cursor must not be negative"}, status=400)
+        if not 0 < limit <= CHANGE_FEED_LIMIT:
+            return JsonResponse(
+                {"error": f"limit must be from 1 to {CHANGE_FEED_LIMIT}"}, status=400
+            )
+
+        return JsonResponse(change_feed(cursor, limit))
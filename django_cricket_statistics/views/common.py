@@ -1,25 +1,73 @@
 """Views for statistics."""
 
 from collections import namedtuple
-from typing import Dict, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
-from django.db.models import QuerySet
+from django.db.models import F, QuerySet, Value
+from django.db.models.functions import NullIf
 from django.views.generic import ListView
 
-from django_cricket_statistics.models import Player, Season, Statistic
+from django_cricket_statistics.cache import ALL_TAG, PLAYERS_TAG, cached_value
+from django_cricket_statistics.models import (
+    CareerTotal,
+    Grade,
+    Player,
+    Season,
+    SeasonTotal,
+    Statistic,
+    StatisticCube,
+)
+from django_cricket_statistics.routers import ReadDatabaseMixin
+from django_cricket_statistics.totals import materialized_totals_enabled
 from django_cricket_statistics.views.statistics import ALL_STATISTIC_NAMES, SEASON_RANGE
 
 
 Table = namedtuple("Table", ["columns", "columns_float", "data", "caption"])
 
-CLASS_LOOKUP = {"player": Player, "season": Season}
-
-
-class PlayerStatisticView(ListView):
+CLASS_LOOKUP = {"player": Player, "season": Season, "grade": Grade}
+
+# cache tags of the entries depending on a pre-filtered player, season or grade
+PRE_FILTER_TAGS = {
+    "player": "player",
+    "player__pk": "player",
+    "season": "season",
+    "season__pk": "season",
+    "grade": "grade",
+    "grade__pk": "grade",
+}
+
+# the stored player name is read with the statistics rather than looked up
+PLAYER_NAME = {"player_name": F("player__short_name")}
+
+# cube fields answering each aggregate of the statistics, where counts of
+# hundreds and five wicket innings are null rather than zero when aggregated
+CUBE_AGGREGATES = {
+    "start_year": F("first_year"),
+    "end_year": F("last_year") + 1,
+    "matches__sum": F("matches_total"),
+    "batting_innings__sum": F("batting_innings_total"),
+    "batting_runs__sum": F("batting_runs_total"),
+    "batting_not_outs__sum": F("batting_not_outs_total"),
+    "hundreds": NullIf(F("hundreds_total"), Value(0)),
+    "bowling_balls__sum": F("bowling_balls_total"),
+    "bowling_runs__sum": F("bowling_runs_total"),
+    "bowling_wickets__sum": F("bowling_wickets_total"),
+    "five_wicket_innings": NullIf(F("five_wicket_innings_total"), Value(0)),
+    "fielding_catches_wk__sum": F("fielding_catches_wk_total"),
+    "fielding_stumpings__sum": F("fielding_stumpings_total"),
+    "fielding_catches_non_wk__sum": F("fielding_catches_non_wk_total"),
+    "fielding_run_outs__sum": F("fielding_run_outs_total"),
+}
+CUBE_DIMENSIONS = ("season", "grade")
+
+
+class PlayerStatisticView(ReadDatabaseMixin, ListView):
     """View for statistics grouped by player."""
 
     model = Statistic
     paginate_by = 20
+    template_name = "django_cricket_statistics/statistic_list.html"
+    context_object_name = "statistic_list"
 
     aggregates: Optional[Dict] = None
     filters: Optional[Dict] = None
@@ -29,18 +77,16 @@ class PlayerStatisticView(ListView):
     columns_float: Optional[Set] = None
     title: str = ""
 
-    def get_queryset(self) -> QuerySet:
-        """Return the queryset for the view."""
-        # handle filtering from the url
-        pre_filters = {
-            name: self.request.GET.get(name, None) for name in ("grade", "season")
-        }
-        pre_filters = {k: v for k, v in pre_filters.items() if v is not None}
-
+    def get_queryset(self) -> "CachedRows":  # type: ignore
+        """Return the leaderboard rows read through the query result cache."""
+        pre_filters = self.get_pre_filters()
         aggregates = self.get_aggregates()
         filters = self.filters or {}
 
-        queryset = create_queryset(
+        if "player" in self.group_by:
+            aggregates = {**PLAYER_NAME, **aggregates}
+
+        queryset = create_cube_queryset(
             pre_filters=pre_filters,
             group_by=self.group_by,
             aggregates=aggregates,
@@ -53,7 +99,10 @@ class PlayerStatisticView(ListView):
                 ordering = (ordering,)
             queryset = queryset.order_by(*ordering)
 
-        return queryset
+        parts = ("leaderboard", pre_filters, self.group_by, aggregates, filters)
+        return CachedRows(
+            queryset, parts, pre_filter_tags(pre_filters), leaderboard=True
+        )
 
     def get_context_data(self, **kwargs: str) -> Dict:
         """Add extra context to be passed to the template."""
@@ -68,6 +117,11 @@ class PlayerStatisticView(ListView):
         object_list = context["object_list"]
 
         for name in self.group_by:
+            if name == "player":
+                for stat in object_list:
+                    stat[name] = stat.pop("player_name")
+                continue
+
             cls = CLASS_LOOKUP[name]
             pks = {s[name] for s in object_list}
 
@@ -86,6 +140,13 @@ class PlayerStatisticView(ListView):
         """Return the aggregates required."""
         return self.aggregates or {}
 
+    def get_pre_filters(self) -> Dict:
+        """Return the filters applied before aggregation from the url."""
+        pre_filters = {
+            name: self.request.GET.get(name, None) for name in ("grade", "season")
+        }
+        return {k: v for k, v in pre_filters.items() if v is not None}
+
 
 def create_caption(filters: Optional[Dict]) -> Optional[str]:
     """Create a caption based on the filters applied."""
@@ -93,7 +154,7 @@ def create_caption(filters: Optional[Dict]) -> Optional[str]:
         return None
 
     # remove any filters which are simply removing irrelevant stats
-    filters = {k.rstrip("__gte"): v for k, v in filters.items() if k.endswith("__gte")}
+    filters = {k[: -len("__gte")]: v for k, v in filters.items() if k.endswith("__gte")}
 
     if not filters:
         return None
@@ -103,14 +164,163 @@ def create_caption(filters: Optional[Dict]) -> Optional[str]:
     )
 
 
+def pre_filter_tags(pre_filters: Optional[Dict]) -> Tuple[str, ...]:
+    """Return the cache tags of the players, seasons or grades pre-filtered."""
+    tags = {
+        f"{PRE_FILTER_TAGS[name]}:{value}"
+        for name, value in (pre_filters or {}).items()
+        if name in PRE_FILTER_TAGS
+    }
+    if not tags or len(tags) < len(pre_filters or {}):
+        tags.add(ALL_TAG)
+    return tuple(sorted(tags))
+
+
+class CachedRows:
+    """Rows of a queryset read through the query result cache.
+
+    The ordering and any slice are part of the cache key, and the rows are
+    kept once read so they can be iterated and modified like a queryset.
+
+    Rows of a leaderboard are only invalidated by changes within their tags
+    if a changed player is in or above the rows, or could now enter them.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        parts: Tuple,
+        tags: Tuple[str, ...] = (ALL_TAG,),
+        leaderboard: bool = False,
+    ) -> None:
+        """Store the queryset and the canonical parts of its arguments."""
+        self.queryset = queryset
+        self.parts = parts
+        self.tags = tags
+        self.leaderboard = leaderboard
+        self.model = queryset.model
+        self._rows: Optional[List[Dict]] = None
+
+    @property
+    def ordered(self) -> bool:
+        """Return whether the rows are ordered."""
+        return self.queryset.ordered
+
+    def _read(self, bounds: Optional[Tuple[int, Optional[int]]]) -> List[Dict]:
+        """Read the rows within the bounds from the cache."""
+        parts = (*self.parts, self.queryset.query.order_by, bounds)
+        start, stop = bounds or (0, None)
+
+        if not self.leaderboard:
+            # the cached rows are shared so are copied before being modified
+            rows = cached_value(
+                parts, lambda: list(self.queryset[start:stop]), tags=self.tags
+            )
+            return [dict(row) for row in rows]
+
+        def evaluate() -> Dict:
+            """Read the rows along with the players above them."""
+            rows = list(self.queryset[:stop])
+            return {
+                "rows": rows[start:],
+                "players": {row["player"] for row in rows},
+                "complete": stop is not None and len(rows) == stop,
+            }
+
+        value = cached_value(
+            parts,
+            evaluate,
+            tags=(),
+            scopes=(*self.tags, PLAYERS_TAG),
+            still_valid=self._still_valid,
+        )
+        return [dict(row) for row in value["rows"]]
+
+    def _still_valid(self, value: Dict, players: Set[int]) -> bool:
+        """Return whether none of the changed players are in or could enter."""
+        if players & value["players"]:
+            return False
+
+        rows = list(self.queryset.filter(player__in=players))
+        if not value["complete"] or not value["rows"]:
+            return not rows
+
+        last = value["rows"][-1]
+        return not any(
+            _sorts_before(row, last, self.queryset.query.order_by) for row in rows
+        )
+
+    def _all(self) -> List[Dict]:
+        """Return all the rows, reading them once."""
+        if self._rows is None:
+            self._rows = self._read(None)
+        return self._rows
+
+    def order_by(self, *ordering: str) -> "CachedRows":
+        """Return the rows with a different ordering."""
+        return CachedRows(
+            self.queryset.order_by(*ordering), self.parts, self.tags, self.leaderboard
+        )
+
+    def get(self) -> Dict:
+        """Return the only row."""
+        rows = self._all()
+        if len(rows) != 1:
+            return self.queryset.get()
+        return rows[0]
+
+    def count(self) -> int:
+        """Return the number of rows."""
+        if self._rows is None:
+            return cached_value(
+                (*self.parts, "count"), self.queryset.count, tags=self.tags
+            )
+        return len(self._rows)
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self._all())
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate over all the rows."""
+        return iter(self._all())
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        """Return a row or the rows of a slice."""
+        if self._rows is not None:
+            return self._rows[key]
+        if isinstance(key, int):
+            return self._read((key, key + 1))[0]
+        return self._read((key.start or 0, key.stop))
+
+
+def _sorts_before(row: Dict, other: Dict, ordering: Tuple[str, ...]) -> bool:
+    """Return whether a row sorts before or ties with another row."""
+    for name in ordering:
+        field = name.lstrip("-")
+        value, other_value = row[field], other[field]
+        if value == other_value:
+            continue
+        if value is None or other_value is None:
+            # null ordering depends on the database so assume the worst
+            return True
+        return value > other_value if name.startswith("-") else value < other_value
+    return True
+
+
 def create_queryset(
     pre_filters: Optional[Dict] = None,
     group_by: Optional[Tuple] = None,
     aggregates: Optional[Dict] = None,
     filters: Optional[Dict] = None,
     select_related: Optional[Tuple] = ("player",),
-) -> QuerySet:
-    """Create a queryset by applying filters, grouping, aggregation."""
+    cached: bool = False,
+) -> Union[QuerySet, CachedRows]:
+    """Create a queryset by applying filters, grouping, aggregation.
+
+    If cached the rows are read through the query result cache, keyed on the
+    canonical arguments along with any later ordering and slice.
+    """
     # only permit senior records to be included
     # remove ordering as this affects the grouping
     queryset = Statistic.objects.filter(grade__is_senior=True).order_by()
@@ -133,9 +343,74 @@ def create_queryset(
     # apply filters
     queryset = queryset.filter(**filters) if filters else queryset
 
+    if cached:
+        parts = ("create_queryset", pre_filters, group_by, aggregates, filters)
+        return CachedRows(queryset, parts, pre_filter_tags(pre_filters))
+
     return queryset
 
 
+def create_cube_queryset(
+    pre_filters: Optional[Dict] = None,
+    group_by: Tuple = ("player",),
+    aggregates: Optional[Dict] = None,
+    filters: Optional[Dict] = None,
+) -> QuerySet:
+    """Create a queryset reading pre-aggregated values from the statistic cube.
+
+    Pre-filters may only be on season and grade, and the rows are grouped by
+    player with optionally season or grade. If any aggregate cannot be read
+    from the cube the statistics are aggregated directly instead.
+
+    If enabled, career and season totals are read from the totals kept by the
+    database rather than the cube.
+    """
+    pre_filters = pre_filters or {}
+    aggregates = aggregates or {}
+
+    if (
+        "player" not in group_by
+        or not set(group_by) <= {"player", *CUBE_DIMENSIONS}
+        or not set(pre_filters) <= set(CUBE_DIMENSIONS)
+        or any(
+            name not in CUBE_AGGREGATES
+            and getattr(expression, "contains_aggregate", False)
+            for name, expression in aggregates.items()
+        )
+    ):
+        return create_queryset(
+            pre_filters=pre_filters,
+            group_by=group_by,
+            aggregates=aggregates,
+            filters=filters,
+        )
+
+    if materialized_totals_enabled() and "grade" not in {*group_by, *pre_filters}:
+        # the career and season totals kept by the database have the same columns
+        if "season" in {*group_by, *pre_filters}:
+            queryset = SeasonTotal.objects.filter(**pre_filters).order_by()
+        else:
+            queryset = CareerTotal.objects.order_by()
+    else:
+        queryset = StatisticCube.objects.order_by()
+
+        # a null dimension is the rollup over all its values
+        for name in CUBE_DIMENSIONS:
+            if name in pre_filters:
+                queryset = queryset.filter(**{name: pre_filters[name]})
+            else:
+                queryset = queryset.filter(**{f"{name}__isnull": name not in group_by})
+
+    queryset = queryset.values(*group_by).annotate(
+        **{
+            name: CUBE_AGGREGATES.get(name, expression)
+            for name, expression in aggregates.items()
+        }
+    )
+
+    return queryset.filter(**filters) if filters else queryset
+
+
 class SeasonStatistic(PlayerStatisticView):
     """Display statistics for each season."""
 
@@ -3,8 +3,10 @@ from typing import Dict
 
 from django.views.generic import TemplateView
 
+from django_cricket_statistics.routers import ReadDatabaseMixin
 
-class IndexView(TemplateView):
+
+class IndexView(ReadDatabaseMixin, TemplateView):
     """View indices."""
 
     template_name = "django_cricket_statistics/links_index.html"
@@ -0,0 +1,326 @@
+"""Views for leaderboards built from query parameters."""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from django.db import connections, router
+from django.http import Http404
+
+from django_cricket_statistics.cache import cached_value
+from django_cricket_statistics.models import Statistic
+from django_cricket_statistics.totals import materialized_totals_enabled
+from django_cricket_statistics.views.common import (
+    PLAYER_NAME,
+    PlayerStatisticView,
+    create_cube_queryset,
+    pre_filter_tags,
+)
+from django_cricket_statistics.views.statistics import (
+    ALL_STATISTICS,
+    ALL_STATISTIC_FLOATS,
+    ALL_STATISTIC_NAMES,
+    BATTING_AVERAGE,
+    BATTING_INNINGS,
+    BATTING_NOT_OUTS,
+    BATTING_RUNS,
+    BOWLING_AVERAGE,
+    BOWLING_BALLS,
+    BOWLING_ECONOMY_RATE,
+    BOWLING_RUNS,
+    BOWLING_STRIKE_RATE,
+    BOWLING_WICKETS,
+    FIELDING_CATCHES,
+    FIELDING_RUN_OUTS,
+    FIVE_WICKET_INNINGS,
+    HUNDREDS,
+    MATCHES,
+    SEASON_RANGE,
+    WICKETKEEPING_CATCHES,
+    WICKETKEEPING_DISMISSALS,
+    WICKETKEEPING_STUMPINGS,
+)
+
+# aggregates required to calculate each statistic
+LEADERBOARD_STATISTICS = {
+    "matches__sum": MATCHES,
+    "batting_innings__sum": BATTING_INNINGS,
+    "batting_runs__sum": BATTING_RUNS,
+    "batting_not_outs__sum": BATTING_NOT_OUTS,
+    "batting_average": BATTING_AVERAGE,
+    "hundreds": HUNDREDS,
+    "bowling_balls__sum": BOWLING_BALLS,
+    "bowling_runs__sum": BOWLING_RUNS,
+    "bowling_wickets__sum": BOWLING_WICKETS,
+    "bowling_average": BOWLING_AVERAGE,
+    "bowling_economy_rate": BOWLING_ECONOMY_RATE,
+    "bowling_strike_rate": BOWLING_STRIKE_RATE,
+    "five_wicket_innings": FIVE_WICKET_INNINGS,
+    "fielding_catches_wk__sum": WICKETKEEPING_CATCHES,
+    "fielding_stumpings__sum": WICKETKEEPING_STUMPINGS,
+    "wicketkeeping_dismissals__sum": WICKETKEEPING_DISMISSALS,
+    "fielding_catches_non_wk__sum": FIELDING_CATCHES,
+    "fielding_run_outs__sum": FIELDING_RUN_OUTS,
+}
+
+# statistics where a lower value is better
+ASCENDING_STATISTICS = {
+    "bowling_average",
+    "bowling_economy_rate",
+    "bowling_strike_rate",
+}
+
+LEADERBOARD_GROUPINGS = {
+    "career": ("player",),
+    "season": ("player", "season"),
+    "grade": ("player", "grade"),
+}
+LEADERBOARD_COLUMNS = {
+    "career": {"player": "Player", "season_range": "Span"},
+    "season": {"player": "Player", "season": "Season"},
+    "grade": {"player": "Player", "grade": "Grade", "season_range": "Span"},
+}
+
+PRE_FILTER_NAMES = ("grade", "season")
+QUALIFICATION_PREFIX = "min_"
+
+# placeholder values are substituted into the compiled parameters per request
+SENTINEL_BASE = -7919000
+
+
+class CompiledQuery(NamedTuple):
+    """SQL compiled for a given leaderboard shape."""
+
+    sql: str
+    params: Tuple
+    slots: Tuple[Optional[int], ...]
+    names: Tuple[str, ...]
+    using: str
+
+
+class CompiledLeaderboard:
+    """Rows of a compiled leaderboard which can be counted and sliced.
+
+    The count and each slice are read through the query result cache, keyed
+    on the compiled SQL and the values of this request.
+    """
+
+    model = Statistic
+    ordered = True
+
+    def __init__(
+        self,
+        compiled: CompiledQuery,
+        values: Tuple[Any, ...],
+        tags: Tuple[str, ...],
+    ) -> None:
+        """Bind the values of this request to the compiled query."""
+        self.compiled = compiled
+        self.params = tuple(
+            param if slot is None else values[slot]
+            for param, slot in zip(compiled.params, compiled.slots)
+        )
+        self.tags = tags
+        self._count: Optional[int] = None
+
+    def _execute(self, sql: str, params: Tuple) -> List[Tuple]:
+        """Execute the sql and return all rows."""
+        with connections[self.compiled.using].cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _read(self, bounds: Tuple[Any, ...], sql: str, params: Tuple) -> List[Tuple]:
+        """Read the rows of the sql from the cache, or execute it."""
+        return cached_value(
+            ("compiled leaderboard", self.compiled.sql, self.params, bounds),
+            lambda: self._execute(sql, params),
+            tags=self.tags,
+        )
+
+    def count(self) -> int:
+        """Return the total number of rows."""
+        if self._count is None:
+            sql = f"SELECT COUNT(*) FROM ({self.compiled.sql}) subquery"
+            self._count = self._read(("count",), sql, self.params)[0][0]
+        return self._count
+
+    def __len__(self) -> int:
+        """Return the total number of rows."""
+        return self.count()
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Dict, List[Dict]]:
+        """Return the rows for a slice as dictionaries."""
+        if isinstance(key, int):
+            return self[key : key + 1][0]
+
+        start = key.start or 0
+        if key.stop is None:
+            rows = self._read((0, None), self.compiled.sql, self.params)[start:]
+        else:
+            sql = f"{self.compiled.sql} LIMIT %s OFFSET %s"
+            limit = max(key.stop - start, 0)
+            rows = self._read((start, key.stop), sql, (*self.params, limit, start))
+        return [dict(zip(self.compiled.names, row)) for row in rows]
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate over all rows."""
+        return iter(self[:])
+
+
+def leaderboard_aggregates(metric: str, qualifications: Tuple[str, ...]) -> Dict:
+    """Return the aggregates required for a metric and its qualifications."""
+    aggregates: Dict = {}
+    for name in (metric, *qualifications):
+        aggregates.update(LEADERBOARD_STATISTICS[name])
+    return aggregates
+
+
+def leaderboard_filters(metric: str, qualifications: Tuple[str, ...]) -> Dict:
+    """Return the filters removing irrelevant rows and applying qualifications."""
+    if metric in ALL_STATISTIC_FLOATS:
+        filters: Dict = {f"{metric}__isnull": False}
+    else:
+        filters = {f"{metric}__gt": 0}
+
+    for slot, name in enumerate(qualifications):
+        filters[f"{name}__gte"] = SENTINEL_BASE - slot
+
+    return filters
+
+
+@lru_cache(maxsize=256)
+def compile_leaderboard(
+    using: str,
+    metric: str,
+    grouping: str,
+    qualifications: Tuple[str, ...],
+    pre_filters: Tuple[str, ...],
+    totals: bool,
+) -> CompiledQuery:
+    """Compile the SQL for a leaderboard shape.
+
+    Values which vary between requests are compiled as sentinels and their
+    positions recorded so that the SQL can be reused for any values. Whether
+    the totals kept by the database are read is part of the shape, as they
+    are compiled to other tables.
+    """
+    group_by = LEADERBOARD_GROUPINGS[grouping]
+    aggregates = {**PLAYER_NAME, **leaderboard_aggregates(metric, qualifications)}
+    if "season" not in group_by:
+        aggregates = {**SEASON_RANGE, **aggregates}
+
+    sentinels = {
+        name: SENTINEL_BASE - len(qualifications) - slot
+        for slot, name in enumerate(pre_filters)
+    }
+    ordering = metric if metric in ASCENDING_STATISTICS else f"-{metric}"
+
+    queryset = create_cube_queryset(
+        pre_filters=sentinels,
+        group_by=group_by,
+        aggregates=aggregates,
+        filters=leaderboard_filters(metric, qualifications),
+    ).order_by(ordering)
+
+    query = queryset.query
+    sql, params = query.get_compiler(using).as_sql()
+
+    # sentinels compared with float statistics are compiled as floats
+    sentinels_total = len(qualifications) + len(pre_filters)
+    slots = tuple(
+        int(SENTINEL_BASE - param)
+        if isinstance(param, (int, float))
+        and param == int(param)
+        and 0 <= SENTINEL_BASE - param < sentinels_total
+        else None
+        for param in params
+    )
+    names = (*query.extra_select, *query.values_select, *query.annotation_select)
+
+    return CompiledQuery(sql, tuple(params), slots, names, using)
+
+
+class LeaderboardView(PlayerStatisticView):
+    """Leaderboard for any statistic, grouping and qualification."""
+
+    title = "Leaderboard"
+
+    def get_queryset(self) -> CompiledLeaderboard:  # type: ignore
+        """Return the leaderboard rows from the compiled query."""
+        params = self.request.GET
+
+        metric = params.get("metric", "")
+        if metric not in ALL_STATISTICS or metric not in ALL_STATISTIC_NAMES:
+            raise Http404(f"Invalid statistic: {metric}")
+
+        grouping = params.get("group", "career")
+        if grouping not in LEADERBOARD_GROUPINGS:
+            raise Http404(f"Invalid grouping: {grouping}")
+
+        qualifications = {}
+        for key, value in params.items():
+            if not key.startswith(QUALIFICATION_PREFIX):
+                continue
+            name = key[len(QUALIFICATION_PREFIX) :]
+            if name not in LEADERBOARD_STATISTICS:
+                raise Http404(f"Invalid qualification: {name}")
+            minimum = _parse_number(
+                value, float if name in ALL_STATISTIC_FLOATS else int
+            )
+            # a minimum of zero leaves every row in, so is no qualification
+            if minimum:
+                qualifications[name] = minimum
+
+        pre_filters = {
+            name: _parse_int(params[name])
+            for name in PRE_FILTER_NAMES
+            if name in params
+        }
+
+        qualification_names = tuple(sorted(qualifications))
+        pre_filter_names = tuple(sorted(pre_filters))
+        compiled = compile_leaderboard(
+            router.db_for_read(Statistic),
+            metric,
+            grouping,
+            qualification_names,
+            pre_filter_names,
+            materialized_totals_enabled(),
+        )
+
+        self.group_by = LEADERBOARD_GROUPINGS[grouping]
+        self.columns_default = LEADERBOARD_COLUMNS[grouping]
+        self.columns_extra = {metric: ALL_STATISTIC_NAMES[metric]}
+        self.columns_float = ALL_STATISTIC_FLOATS & {metric}
+        self.filters = {f"{k}__gte": v for k, v in qualifications.items()}
+        self.title = f"{_statistic_title(metric)} ({grouping})"
+
+        values = (
+            *(qualifications[name] for name in qualification_names),
+            *(pre_filters[name] for name in pre_filter_names),
+        )
+        return CompiledLeaderboard(compiled, values, pre_filter_tags(pre_filters))
+
+
+def _parse_number(value: str, number_type: type) -> Union[int, float]:
+    """Parse a non-negative query parameter of a statistic's type."""
+    try:
+        number = number_type(value)
+    except ValueError:
+        raise Http404(f"Invalid value: {value}") from None
+    if not 0 <= number < float("inf"):
+        raise Http404(f"Invalid value: {value}")
+    return number
+
+
+def _parse_int(value: str) -> int:
+    """Parse a non-negative integer query parameter."""
+    if not value.isdigit():
+        raise Http404(f"Invalid value: {value}")
+    return int(value)
+
+
+def _statistic_title(name: str) -> str:
+    """Create a readable title from a statistic name."""
+    if name.endswith("__sum"):
+        name = name[: -len("__sum")]
+    return name.replace("_", " ").capitalize()
@@ -1,17 +1,30 @@
 """View for player details."""
 
-import string
-from typing import Dict
-
-# from django.db.models import F, Window
-# from django.db.models.functions import Rank
-from django.db.models import QuerySet
-from django.views.generic import DetailView, ListView
-
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count, F, Max, Q, QuerySet, Sum, Window
+from django.http import Http404, HttpRequest, JsonResponse
+from django.urls import reverse
+from django.utils.functional import SimpleLazyObject, cached_property
+from django.views.generic import DetailView, ListView, TemplateView, View
+
+from django_cricket_statistics.cache import (
+    FRAGMENT_CACHE_TIMEOUT,
+    PLAYERS_TAG,
+    QUERY_CACHE_TIMEOUT,
+    cached_value,
+    career_chart_key,
+)
 from django_cricket_statistics.models import (
     Grade,
     Player,
+    PlayerLetter,
     Season,
+    Statistic,
+    StatisticCube,
     FiveWicketInning,
     Hundred,
 )
@@ -20,21 +33,27 @@ from django_cricket_statistics.views.statistics import (
     ALL_STATISTIC_NAMES,
     ALL_STATISTIC_FLOATS,
     SEASON_RANGE,
-    SEASON_RANGE_PLAYER,
 )
+from django_cricket_statistics.rollups import player_letter
+from django_cricket_statistics.routers import ReadDatabaseMixin
+from django_cricket_statistics.search import search_players
 from django_cricket_statistics.views.common import create_queryset
 
+# columns read from the summary of each player
+PLAYER_SUMMARY_NAMES = {
+    "summary.season_range": "Career",
+    "summary.matches_total": "Mat",
+    "summary.batting_runs_total": "Runs",
+    "summary.bowling_wickets_total": "Wkts",
+}
+
 
-class PlayerListView(ListView):
+class PlayerListView(ReadDatabaseMixin, ListView):
     """View for list of players."""
 
     model = Player
     paginate_by = 20
-    ordering = (
-        "last_name",
-        "first_name",
-        "middle_names",
-    )  # TODO: why does this need to be specified here?
+    ordering = "sort_key"
     title = "Players"
 
     def get_queryset(self) -> QuerySet:
@@ -45,24 +64,58 @@ class PlayerListView(ListView):
         initial_letter = self.kwargs.get("letter", None)
         search_term = self.request.GET.get("q", None)
 
-        queryset = queryset.annotate(**SEASON_RANGE_PLAYER)
+        queryset = queryset.select_related("summary")
 
         if initial_letter:
-            return queryset.filter(last_name__istartswith=initial_letter)
+            # seek the range of sort keys starting with the letter
+            prefix = initial_letter.casefold()
+            end = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            return queryset.filter(sort_key__gte=prefix, sort_key__lt=end)
 
         if search_term:
-            return queryset.filter(last_name__icontains=search_term)
+            return queryset.filter(pk__in=search_players(search_term))
 
         return queryset.none()
 
+    @cached_property
+    def letter_counts(self) -> Dict[str, int]:
+        """Return the number of players under each letter with any players."""
+        letters = cached_value(
+            ("player letters",),
+            lambda: list(
+                PlayerLetter.objects.filter(players_total__gt=0).values_list(
+                    "letter", "players_total"
+                )
+            ),
+            tags=(PLAYERS_TAG,),
+        )
+        return dict(letters)
+
+    def get_paginator(self, queryset: QuerySet, *args: Any, **kwargs: Any) -> Paginator:
+        """Return the paginator, counting the players of a letter from the index."""
+        paginator = super().get_paginator(queryset, *args, **kwargs)
+
+        # the count is read with the page rather than cached, so they agree
+        initial_letter = self.kwargs.get("letter", "")
+        letter = player_letter(initial_letter.casefold())
+        if letter and len(initial_letter) == 1:
+            paginator.count = (
+                PlayerLetter.objects.filter(letter=letter)
+                .values_list("players_total", flat=True)
+                .first()
+                or 0
+            )
+
+        return paginator
+
     def get_context_data(self, **kwargs: str) -> Dict:
         """Add extra context to be passed to the template."""
         context = super().get_context_data(**kwargs)
         context["player_list_names"] = {
             "short_name": "Player",
-            "season_range": "Career",
+            **PLAYER_SUMMARY_NAMES,
         }
-        context["letters"] = string.ascii_uppercase
+        context["letters"] = self.letter_counts
         context["start_rank"] = context["page_obj"].start_index
         context["title"] = self.title
 
@@ -83,8 +136,8 @@ class PlayerListFirstElevenNumberView(ListView):
 
         queryset = (
             queryset.select_related("first_eleven_number")
+            .select_related("summary")
             .exclude(first_eleven_number__isnull=True)
-            .annotate(**SEASON_RANGE_PLAYER)
         )
 
         return queryset
@@ -95,7 +148,7 @@ class PlayerListFirstElevenNumberView(ListView):
         context["player_list_names"] = {
             "first_eleven_number": "#",
             "short_name": "Player",
-            "season_range": "Career",
+            **PLAYER_SUMMARY_NAMES,
         }
         context["start_rank"] = None
         context["title"] = self.title
@@ -103,7 +156,30 @@ class PlayerListFirstElevenNumberView(ListView):
         return context
 
 
-class PlayerCareerView(DetailView):
+def player_modified_stamp(player_pk: int) -> str:
+    """Return a stamp which changes with any change to a player's statistics.
+
+    The stamp is derived from the last modification of the player's
+    statistics, hundreds and five wicket innings, and of the grades and
+    seasons they are in. Counts are included so deletions also change it.
+    """
+    stamp = Statistic.objects.filter(player__pk=player_pk).aggregate(
+        statistics=Count("pk", distinct=True),
+        hundreds=Count("hundred", distinct=True),
+        five_wicket_innings=Count("fivewicketinning", distinct=True),
+        statistic=Max("modified_at"),
+        hundred=Max("hundred__modified_at"),
+        five_wicket_inning=Max("fivewicketinning__modified_at"),
+        grade=Max("grade__modified_at"),
+        season=Max("season__modified_at"),
+    )
+    return ":".join(
+        value.isoformat() if isinstance(value, datetime) else str(value)
+        for value in stamp.values()
+    )
+
+
+class PlayerCareerView(ReadDatabaseMixin, DetailView):
     """View for player career statistics."""
 
     model = Player
@@ -114,10 +190,9 @@ class PlayerCareerView(DetailView):
         queryset = queryset.select_related("first_eleven_number")
         return queryset
 
-    def get_context_data(self, **kwargs: str) -> Dict:
-        """Return the required context data."""
-        context = super().get_context_data(**kwargs)
-
+    @cached_property
+    def career_tables(self) -> Dict[str, List]:
+        """Return the rows of the career tables by grade and by year."""
         # retrieve the object primary key
         player_pk = self.kwargs.get(self.pk_url_kwarg)
 
@@ -127,6 +202,7 @@ class PlayerCareerView(DetailView):
             group_by=("player__pk",),
             aggregates={**ALL_STATISTICS},
             select_related=("player",),
+            cached=True,
         ).get()
 
         # this won't have a grade annotation so we add one
@@ -138,6 +214,7 @@ class PlayerCareerView(DetailView):
             group_by=("player", "grade"),
             aggregates={**SEASON_RANGE, **ALL_STATISTICS},
             select_related=("player", "grade"),
+            cached=True,
         )
 
         # get the associated grades
@@ -147,21 +224,13 @@ class PlayerCareerView(DetailView):
         for stat in statistics_by_grade:
             stat["grade"] = objs[stat["grade"]]
 
-        # this will evaluate the queryset immediately since we make it a list
-        context["statistics_by_grade_list"] = [
-            career_statistics,
-            *list(statistics_by_grade),
-        ]
-
-        # add display names for this table
-        context["statistics_by_grade_names"] = {"grade": "Grade", **ALL_STATISTIC_NAMES}
-
         # add career statistics by year
         statistics_by_year = create_queryset(
             pre_filters={"player__pk": player_pk},
             group_by=("player", "season"),
             aggregates=ALL_STATISTICS,
             select_related=("player", "season"),
+            cached=True,
         ).order_by("-season__year")
 
         # get the associated season
@@ -171,7 +240,54 @@ class PlayerCareerView(DetailView):
         for stat in statistics_by_year:
             stat["season"] = objs[stat["season"]]
 
-        context["statistics_by_year_list"] = statistics_by_year
+        # add best bowling figures which are read rather than aggregated
+        best_bowling = best_bowling_figures(
+            StatisticCube.objects.filter(player__pk=player_pk).filter(
+                Q(season__isnull=True) | Q(grade__isnull=True)
+            )
+        )
+
+        career_statistics["bowling_best_bowling"] = best_bowling.get(
+            (player_pk, None, None)
+        )
+        for stat in statistics_by_grade:
+            stat["bowling_best_bowling"] = best_bowling.get(
+                (player_pk, None, stat["grade"].pk)
+            )
+        for stat in statistics_by_year:
+            stat["bowling_best_bowling"] = best_bowling.get(
+                (player_pk, stat["season"].pk, None)
+            )
+
+        return {
+            "by_grade": [career_statistics, *list(statistics_by_grade)],
+            "by_year": list(statistics_by_year),
+        }
+
+    def get_context_data(self, **kwargs: str) -> Dict:
+        """Return the required context data.
+
+        The tables are only read when their cached fragments are missing.
+        """
+        context = super().get_context_data(**kwargs)
+
+        # retrieve the object primary key
+        player_pk = self.kwargs.get(self.pk_url_kwarg)
+
+        # the fragments of the tables are cached until the player's rows change
+        context["fragment_timeout"] = FRAGMENT_CACHE_TIMEOUT
+        context["fragment_stamp"] = player_modified_stamp(player_pk)
+
+        context["statistics_by_grade_list"] = SimpleLazyObject(
+            lambda: self.career_tables["by_grade"]
+        )
+
+        # add display names for this table
+        context["statistics_by_grade_names"] = {"grade": "Grade", **ALL_STATISTIC_NAMES}
+
+        context["statistics_by_year_list"] = SimpleLazyObject(
+            lambda: self.career_tables["by_year"]
+        )
 
         # add display names for this table
         context["statistics_by_year_names"] = {
@@ -214,3 +330,249 @@ class PlayerCareerView(DetailView):
         }
 
         return context
+
+
+class PlayerComparisonView(TemplateView):
+    """View comparing the career statistics of several players."""
+
+    template_name = "django_cricket_statistics/player_comparison.html"
+    max_players = 6
+    title = "Compare players"
+
+    def get_player_pks(self) -> List[int]:
+        """Return the requested player primary keys."""
+        values = self.request.GET.getlist("player")
+
+        if not all(value.isdigit() for value in values):
+            raise Http404("Invalid player")
+
+        pks = list(dict.fromkeys(int(value) for value in values))
+        if len(pks) > self.max_players:
+            raise Http404(f"At most {self.max_players} players can be compared")
+
+        return pks
+
+    def get_context_data(self, **kwargs: str) -> Dict:
+        """Add the statistics of all players using one query per table."""
+        context = super().get_context_data(**kwargs)
+        context["title"] = self.title
+
+        pks = self.get_player_pks()
+        players = Player.objects.in_bulk(pks)
+        if len(players) != len(pks):
+            raise Http404("No player found matching the query")
+
+        context["players"] = [players[pk] for pk in pks]
+
+        # add career statistics of all players
+        career_statistics = create_queryset(
+            pre_filters={"player__pk__in": pks},
+            group_by=("player",),
+            aggregates={**SEASON_RANGE, **ALL_STATISTICS},
+        )
+        career_statistics = sorted(
+            career_statistics, key=lambda s: pks.index(s["player"])
+        )
+
+        for stat in career_statistics:
+            stat["player"] = players[stat["player"]]
+
+        context["career_list"] = career_statistics
+        context["career_names"] = {
+            "player": "Player",
+            "season_range": "Span",
+            **ALL_STATISTIC_NAMES,
+        }
+
+        # add statistics of all players by grade
+        statistics_by_grade = create_queryset(
+            pre_filters={"player__pk__in": pks},
+            group_by=("player", "grade"),
+            aggregates={**SEASON_RANGE, **ALL_STATISTICS},
+        )
+        statistics_by_grade = list(statistics_by_grade)
+
+        grades = Grade.objects.in_bulk({s["grade"] for s in statistics_by_grade})
+        statistics_by_grade.sort(
+            key=lambda s: (pks.index(s["player"]), grades[s["grade"]].grade)
+        )
+
+        for stat in statistics_by_grade:
+            stat["player"] = players[stat["player"]]
+            stat["grade"] = grades[stat["grade"]]
+
+        context["statistics_by_grade_list"] = statistics_by_grade
+        context["statistics_by_grade_names"] = {
+            "player": "Player",
+            "grade": "Grade",
+            "season_range": "Span",
+            **ALL_STATISTIC_NAMES,
+        }
+
+        # add best bowling figures of all players
+        best_bowling = best_bowling_figures(
+            StatisticCube.objects.filter(player__pk__in=pks, season__isnull=True)
+        )
+
+        for stat in career_statistics:
+            stat["bowling_best_bowling"] = best_bowling.get(
+                (stat["player"].pk, None, None)
+            )
+        for stat in statistics_by_grade:
+            stat["bowling_best_bowling"] = best_bowling.get(
+                (stat["player"].pk, None, stat["grade"].pk)
+            )
+
+        context["statistics_float_fields"] = ALL_STATISTIC_FLOATS
+
+        # add hundreds and five wicket innings of all players
+        context["hundreds_list"] = (
+            Hundred.objects.filter(
+                statistic__player__pk__in=pks, statistic__grade__is_senior=True
+            )
+            .order_by("-runs", "-is_not_out", "-is_in_final")
+            .select_related(
+                "statistic__player", "statistic__grade", "statistic__season"
+            )
+        )
+        context["hundreds_names"] = {
+            "statistic.player": "Player",
+            "statistic.season": "Season",
+            "statistic.grade": "Grade",
+            "score": "Score",
+        }
+
+        context["five_wicket_innings_list"] = (
+            FiveWicketInning.objects.filter(
+                statistic__player__pk__in=pks, statistic__grade__is_senior=True
+            )
+            .order_by("-wickets", "runs", "-is_in_final")
+            .select_related(
+                "statistic__player", "statistic__grade", "statistic__season"
+            )
+        )
+        context["five_wicket_innings_names"] = {
+            "statistic.player": "Player",
+            "statistic.season": "Season",
+            "statistic.grade": "Grade",
+            "figures": "Figures",
+        }
+
+        return context
+
+
+def best_bowling_figures(cells: QuerySet) -> Dict:
+    """Return the best bowling figures of cube cells by player, season and grade."""
+    return {
+        (cell.player_id, cell.season_id, cell.grade_id): cell.bowling_best_bowling
+        for cell in cells.only(
+            "player", "season", "grade", "best_bowling_wickets", "best_bowling_runs"
+        )
+    }
+
+
+# season totals from the statistic cube used for the career chart
+CAREER_CHART_TOTALS = {
+    "batting_innings": F("batting_innings_total"),
+    "batting_not_outs": F("batting_not_outs_total"),
+    "batting_runs": F("batting_runs_total"),
+    "bowling_runs": F("bowling_runs_total"),
+    "bowling_wickets": F("bowling_wickets_total"),
+    "wicketkeeping_dismissals": F("fielding_catches_wk_total")
+    + F("fielding_stumpings_total"),
+}
+
+
+class PlayerCareerChartView(View):
+    """View for season-by-season and cumulative career chart data."""
+
+    def get(self, request: HttpRequest, pk: int) -> JsonResponse:
+        """Return the chart data, cached until the player's statistics change."""
+        key = career_chart_key(pk)
+        data = cache.get(key)
+
+        if data is None:
+            if not Player.objects.filter(pk=pk).exists():
+                raise Http404("No player found matching the query")
+            data = {"player": pk, "seasons": career_chart_data(pk)}
+            cache.set(key, data, QUERY_CACHE_TIMEOUT)
+
+        return JsonResponse(data)
+
+
+class PlayerSearchView(ReadDatabaseMixin, View):
+    """View for autocompleting players by any part of their names."""
+
+    max_results = 10
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        """Return the best matching players with their career spans."""
+        pks = search_players(request.GET.get("q", ""), limit=self.max_results)
+        players = Player.objects.select_related("summary").in_bulk(pks)
+
+        results = []
+        for pk in pks:
+            player = players.get(pk)
+            if player is None:
+                continue
+
+            # players without statistics have no summary
+            summary = getattr(player, "summary", None)
+            results.append(
+                {
+                    "id": pk,
+                    "name": player.short_name,
+                    "career": summary and summary.season_range,
+                    "url": reverse("player", args=(pk,)),
+                }
+            )
+        return JsonResponse({"results": results})
+
+
+def career_chart_data(player_pk: int) -> List[Dict]:
+    """Calculate season and running totals with window functions in one query."""
+    window = {"order_by": F("season__year").asc()}
+    seasons = (
+        StatisticCube.objects.filter(
+            player__pk=player_pk, season__isnull=False, grade__isnull=True
+        )
+        .order_by("season__year")
+        .values("season__year")
+        .annotate(
+            **CAREER_CHART_TOTALS,
+            **{
+                f"cumulative_{name}": Window(Sum(expression), **window)
+                for name, expression in CAREER_CHART_TOTALS.items()
+            },
+        )
+    )
+
+    data = []
+    for row in seasons:
+        year = row.pop("season__year")
+        point = {"season": Season(year=year).name, "year": year}
+
+        for prefix in ("", "cumulative_"):
+            outs = row[f"{prefix}batting_innings"] - row[f"{prefix}batting_not_outs"]
+            point.update(
+                {
+                    f"{prefix}runs": row[f"{prefix}batting_runs"],
+                    f"{prefix}wickets": row[f"{prefix}bowling_wickets"],
+                    f"{prefix}dismissals": row[f"{prefix}wicketkeeping_dismissals"],
+                    f"{prefix}batting_average": _average(
+                        row[f"{prefix}batting_runs"], outs
+                    ),
+                    f"{prefix}bowling_average": _average(
+                        row[f"{prefix}bowling_runs"], row[f"{prefix}bowling_wickets"]
+                    ),
+                }
+            )
+
+        data.append(point)
+
+    return data
+
+
+def _average(runs: int, divisor: int) -> Optional[float]:
+    """Return an average, or None if it is undefined."""
+    return runs / divisor if divisor else None
@@ -0,0 +1,102 @@
+"""Views for season summaries."""
+
+from typing import Dict
+
+from django.db.models import QuerySet
+from django.views.generic import DetailView, ListView
+
+from django_cricket_statistics.models import FiveWicketInning, Hundred, SeasonSummary
+
+SEASON_SUMMARY_NAMES = {
+    "season": "Season",
+    "players_total": "Players",
+    "batting_runs_total": "Runs",
+    "bowling_wickets_total": "Wkts",
+    "hundreds_total": "100",
+    "five_wicket_innings_total": "5WI",
+    "leading_run_scorer_display": "Leading run scorer",
+    "leading_wicket_taker_display": "Leading wicket taker",
+}
+
+
+class SeasonListView(ListView):
+    """View for the summaries of all seasons."""
+
+    model = SeasonSummary
+    paginate_by = 20
+    title = "Seasons"
+
+    def get_queryset(self) -> QuerySet:
+        """Return the queryset for the view."""
+        queryset = super().get_queryset()
+        return queryset.select_related(
+            "season", "leading_run_scorer", "leading_wicket_taker"
+        )
+
+    def get_context_data(self, **kwargs: str) -> Dict:
+        """Add extra context to be passed to the template."""
+        context = super().get_context_data(**kwargs)
+        context["season_summary_names"] = SEASON_SUMMARY_NAMES
+        context["title"] = self.title
+
+        return context
+
+
+class SeasonDetailView(DetailView):
+    """View for the summary of a single season."""
+
+    model = SeasonSummary
+    slug_field = "season__year"
+    slug_url_kwarg = "year"
+
+    def get_queryset(self) -> QuerySet:
+        """Return the queryset for the view."""
+        queryset = super().get_queryset()
+        return queryset.select_related(
+            "season", "leading_run_scorer", "leading_wicket_taker"
+        )
+
+    def get_context_data(self, **kwargs: str) -> Dict:
+        """Return the required context data."""
+        context = super().get_context_data(**kwargs)
+
+        season = self.object.season
+        context["season"] = season
+        context["season_summary_list"] = [self.object]
+        context["season_summary_names"] = {
+            k: v for k, v in SEASON_SUMMARY_NAMES.items() if k != "season"
+        }
+
+        # add hundreds
+        context["hundreds_list"] = (
+            Hundred.objects.filter(
+                statistic__season=season, statistic__grade__is_senior=True
+            )
+            .order_by("-runs", "-is_not_out", "-is_in_final")
+            .select_related("statistic__player", "statistic__grade")
+        )
+
+        # add display names for this table
+        context["hundreds_names"] = {
+            "statistic.player": "Player",
+            "statistic.grade": "Grade",
+            "score": "Score",
+        }
+
+        # add five wicket innings
+        context["five_wicket_innings_list"] = (
+            FiveWicketInning.objects.filter(
+                statistic__season=season, statistic__grade__is_senior=True
+            )
+            .order_by("-wickets", "runs", "-is_in_final")
+            .select_related("statistic__player", "statistic__grade")
+        )
+
+        # add display names for this table
+        context["five_wicket_innings_names"] = {
+            "statistic.player": "Player",
+            "statistic.grade": "Grade",
+            "figures": "Figures",
+        }
+
+        return context
@@ -173,7 +173,7 @@ ALL_STATISTICS = {
     **FIELDING_RUN_OUTS,
 }
 ALL_STATISTIC_NAMES = {
-    "number_of_matches__sum": "Mat",
+    "matches__sum": "Mat",
     "batting_innings__sum": "Inns",
     "batting_runs__sum": "Runs",
     "batting_not_outs__sum": "NO",
@@ -186,7 +186,8 @@ ALL_STATISTIC_NAMES = {
     "bowling_average": "Ave",
     "bowling_economy_rate": "Econ",
     "bowling_strike_rate": "SR",
-    # "bowling_best_innings": "BB",
+    # best bowling cannot be aggregated so is read from the statistic cube
+    "bowling_best_bowling": "BB",
     "five_wicket_innings": "5WI",
     "fielding_catches_wk__sum": "WK Ct",
     "fielding_stumpings__sum": "WK St",
@@ -0,0 +1,61 @@
+"""Fixtures for testing cricket statistics."""
+
+import pytest
+from django.core.cache import cache
+
+from django_cricket_statistics.cache import local_cache
+from django_cricket_statistics.models import Grade, Player, Season, Statistic
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    local_cache.clear()
+
+
+# derived statistics are refreshed as writes commit, so the fixtures commit
+
+
+@pytest.fixture
+def grade(transactional_db):
+    return Grade.objects.create(grade="1st XI")
+
+
+@pytest.fixture
+def season(transactional_db):
+    return Season.objects.create(year=2019)
+
+
+@pytest.fixture
+def statistics(transactional_db, grade, season):
+    """Create a season of statistics for a handful of players."""
+    earlier = Season.objects.create(year=2018)
+    players = [
+        Player.objects.create(first_name=first, last_name=last)
+        for first, last in (
+            ("Don", "Bradman"),
+            ("Bill", "Ponsford"),
+            ("Stan", "McCabe"),
+        )
+    ]
+
+    columns = (
+        "player",
+        "season",
+        "matches",
+        "batting_innings",
+        "batting_not_outs",
+        "batting_runs",
+        "bowling_wickets",
+        "bowling_runs",
+        "bowling_balls",
+    )
+    rows = (
+        (players[0], season, 10, 10, 2, 900, 2, 51, 80),
+        (players[0], earlier, 8, 8, 0, 600, 0, 0, 0),
+        (players[1], season, 10, 10, 1, 450, 14, 300, 560),
+        (players[2], season, 6, 5, 0, 120, 25, 400, 1000),
+    )
+    return [
+        Statistic.objects.create(grade=grade, **dict(zip(columns, row))) for row in rows
+    ]
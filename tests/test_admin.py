@@ -0,0 +1,314 @@
+"""Test the admin of the statistics."""
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.forms import inlineformset_factory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django_cricket_statistics.admin import (
+    StatisticForm,
+    StatisticInline,
+    StatisticInlineFormSet,
+)
+from django_cricket_statistics.models import (
+    FirstElevenNumber,
+    FiveWicketInning,
+    Hundred,
+    Player,
+    Season,
+    Statistic,
+    StatisticCube,
+)
+from django_cricket_statistics.signals import statistics_changed
+
+StatisticFormSet = inlineformset_factory(
+    Player,
+    Statistic,
+    form=StatisticForm,
+    formset=StatisticInlineFormSet,
+    fields=StatisticInline.fields,
+    extra=0,
+)
+
+
+def formset_data(formset):
+    """Return the submitted data of an unchanged formset."""
+    data = {
+        f"{formset.prefix}-TOTAL_FORMS": len(formset.forms),
+        f"{formset.prefix}-INITIAL_FORMS": len(formset.initial_forms),
+    }
+    for form in formset.forms:
+        for name in form.fields:
+            value = form[name].value()
+            if value is not None and value is not False:
+                data[form.add_prefix(name)] = value
+    return data
+
+
+@pytest.fixture
+def announced():
+    """Record the keys of each announcement of changed statistics."""
+    calls = []
+
+    def receiver(sender, keys, **kwargs):
+        calls.append(keys)
+
+    statistics_changed.connect(receiver)
+    yield calls
+    statistics_changed.disconnect(receiver)
+
+
+@pytest.fixture
+def career(statistics, grade):
+    """Return a player with statistics in two seasons."""
+    return statistics[0].player
+
+
+def test_statistic_formset_batched(career, announced):
+    formset = StatisticFormSet(instance=career)
+    data = formset_data(formset)
+    data["statistic_set-0-batting_runs"] = 950
+    data["statistic_set-1-batting_runs"] = 650
+    data["statistic_set-1-batting_high_score_input"] = "143*"
+    data["statistic_set-1-bowling_overs_input"] = "12.3"
+
+    formset = StatisticFormSet(data, instance=career)
+    assert formset.is_valid(), formset.errors
+
+    with CaptureQueriesContext(connection) as queries:
+        formset.save()
+
+    updates = [
+        query
+        for query in queries.captured_queries
+        if query["sql"].startswith('UPDATE "django_cricket_statistics_statistic"')
+    ]
+    assert len(updates) == 2
+
+    statistics = {s.season.year: s for s in career.statistic_set.all()}
+    assert statistics[2019].batting_runs == 950
+    assert statistics[2018].batting_runs == 650
+    assert statistics[2018].batting_high_score == "143*"
+    assert statistics[2018].bowling_balls == 75
+
+    # the rollups are refreshed once for the whole save
+    assert len(announced) == 1
+    cell = StatisticCube.objects.get(player=career, season=None, grade=None)
+    assert cell.batting_runs_total == 1600
+
+
+def test_statistic_formset_add_and_delete(career, grade, announced):
+    later = Season.objects.create(year=2020)
+    formset = StatisticFormSet(instance=career)
+    data = formset_data(formset)
+    data["statistic_set-0-DELETE"] = "on"
+    data.update(
+        {
+            f"statistic_set-2-{name}": 0
+            for name in StatisticInline.fields
+            if not name.endswith("_input")
+        }
+    )
+    data.update(
+        {
+            "statistic_set-TOTAL_FORMS": 3,
+            "statistic_set-2-season": later.pk,
+            "statistic_set-2-grade": grade.pk,
+            "statistic_set-2-matches": 1,
+            "statistic_set-2-batting_runs": 5,
+            "statistic_set-2-bowling_overs_input": "3",
+        }
+    )
+    deleted = formset.forms[0].instance
+
+    formset = StatisticFormSet(data, instance=career)
+    assert formset.is_valid(), formset.errors
+    formset.save()
+
+    assert not Statistic.objects.filter(pk=deleted.pk).exists()
+    added = Statistic.objects.get(player=career, season=later)
+    assert (added.batting_runs, added.bowling_balls) == (5, 18)
+    assert announced == [
+        {(career.pk, later.pk, grade.pk), (career.pk, deleted.season_id, grade.pk)}
+    ]
+
+
+@pytest.fixture
+def long_career(career, grade):
+    """Give the player statistics in eight seasons."""
+    for year in range(2010, 2016):
+        season = Season.objects.create(year=year)
+        Statistic.objects.create(player=career, season=season, grade=grade, matches=1)
+    return career
+
+
+def test_statistic_inline_pages(admin_client, long_career):
+    url = reverse(
+        "admin:django_cricket_statistics_player_change", args=(long_career.pk,)
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+
+    formset = response.context["inline_admin_formsets"][0].formset
+    assert [form.instance.season.year for form in formset.forms] == [
+        2019,
+        2018,
+        2015,
+        2014,
+        2013,
+    ]
+    assert response.context["statistic_seasons"]["older"] == "?statistic_page=2"
+
+    # the season and grade choices are read once for every form
+    choices = [
+        query
+        for query in queries.captured_queries
+        if query["sql"].startswith(
+            'SELECT "django_cricket_statistics_season"."id", '
+            '"django_cricket_statistics_season"."created_at"'
+        )
+    ]
+    assert len(choices) == 1
+
+    response = admin_client.get(url, {"statistic_page": 2})
+    formset = response.context["inline_admin_formsets"][0].formset
+    assert [form.instance.season.year for form in formset.forms] == [
+        2012,
+        2011,
+        2010,
+    ]
+    assert set(response.context["statistic_seasons"]) == {"per_page", "newer"}
+
+
+def _add_careers(grade, season, count):
+    """Add players with a number, a statistic, a hundred and a 5WI each."""
+    for _ in range(count):
+        last_name = f"Player {Player.objects.count()}"
+        player = Player.objects.create(first_name="Test", last_name=last_name)
+        player.first_eleven_number = FirstElevenNumber.objects.create()
+        player.save()
+
+        statistic = Statistic.objects.create(
+            player=player, season=season, grade=grade, matches=1
+        )
+        Hundred.objects.create(statistic=statistic, runs=100)
+        FiveWicketInning.objects.create(statistic=statistic, wickets=5, runs=20)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        "player",
+        "statistic",
+        "season",
+        "grade",
+        "firstelevennumber",
+        "hundred",
+        "fivewicketinning",
+    ],
+)
+def test_changelist_queries_constant(admin_client, grade, season, model):
+    url = reverse(f"admin:django_cricket_statistics_{model}_changelist")
+    _add_careers(grade, season, 1)
+
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.get(url)
+
+    _add_careers(grade, season, 5)
+
+    with CaptureQueriesContext(connection) as more_queries:
+        response = admin_client.get(url)
+
+    assert response.status_code == 200
+    assert len(more_queries) == len(queries)
+
+
+@pytest.mark.parametrize("model", ["statistic", "hundred", "fivewicketinning"])
+def test_change_form_queries_constant(admin_client, grade, season, model):
+    _add_careers(grade, season, 1)
+    obj = apps.get_model("django_cricket_statistics", model).objects.get()
+    url = reverse(f"admin:django_cricket_statistics_{model}_change", args=(obj.pk,))
+
+    # the content type is cached by the first request
+    admin_client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.get(url)
+
+    # other statistics are not listed as choices
+    _add_careers(grade, season, 5)
+
+    with CaptureQueriesContext(connection) as more_queries:
+        response = admin_client.get(url)
+
+    assert response.status_code == 200
+    assert len(more_queries) == len(queries)
+
+
+def test_statistic_autocomplete(admin_client, career):
+    url = reverse("admin:django_cricket_statistics_statistic_autocomplete")
+    response = admin_client.get(url, {"term": "bradman"})
+    results = response.json()["results"]
+    assert {result["text"] for result in results} == {
+        str(statistic) for statistic in career.statistic_set.all()
+    }
+
+
+def test_season_entry(admin_client, statistics, grade, season, announced):
+    url = reverse("admin:django_cricket_statistics_statistic_season_entry")
+    response = admin_client.get(url, {"season": season.pk, "grade": grade.pk})
+    formset = response.context["formset"]
+    assert [form.instance.player.last_name for form in formset.initial_forms] == [
+        "Bradman",
+        "McCabe",
+        "Ponsford",
+    ]
+
+    newcomer = Player.objects.create(first_name="Bill", last_name="Woodfull")
+    data = formset_data(formset)
+    data["form-0-batting_runs"] = 950
+    data["form-1-best_bowling_input"] = "6/30"
+    data.update(
+        {
+            f"form-3-{name}": 0
+            for name in StatisticInline.fields
+            if not name.endswith("_input")
+        }
+    )
+    data.update({"form-3-player": newcomer.pk, "form-3-matches": 2})
+    data["form-4-player"] = statistics[0].player.pk
+
+    # a player can only be entered once
+    query = f"?season={season.pk}&grade={grade.pk}"
+    response = admin_client.post(url + query, data)
+    assert response.status_code == 200
+    assert not announced
+
+    del data["form-4-player"]
+    response = admin_client.post(url + query, data)
+    assert response.status_code == 302
+
+    entered = Statistic.objects.filter(season=season, grade=grade)
+    assert entered.get(player=statistics[0].player).batting_runs == 950
+    assert entered.get(player=statistics[3].player).best_bowling_wickets == 6
+    assert entered.get(player=newcomer).matches == 2
+    assert len(announced) == 1
+
+
+def test_season_entry_queries_constant(admin_client, grade, season):
+    url = reverse("admin:django_cricket_statistics_statistic_season_entry")
+    _add_careers(grade, season, 1)
+    admin_client.get(url, {"season": season.pk, "grade": grade.pk})
+
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.get(url, {"season": season.pk, "grade": grade.pk})
+
+    _add_careers(grade, season, 5)
+
+    with CaptureQueriesContext(connection) as more_queries:
+        admin_client.get(url, {"season": season.pk, "grade": grade.pk})
+
+    assert len(more_queries) == len(queries)
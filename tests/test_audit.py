@@ -0,0 +1,52 @@
+"""Test the audit of the statistics."""
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from django_cricket_statistics.audit import audit_statistics
+from django_cricket_statistics.models import FiveWicketInning, Hundred
+
+
+def _audit(**options):
+    out = StringIO()
+    call_command("audit_statistics", stdout=out, stderr=StringIO(), **options)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_audit_clean(statistics):
+    assert _audit(check=True) == []
+
+
+def test_audit_issues(statistics):
+    statistics[0].batting_not_outs = 11
+    statistics[0].save()
+    Hundred.objects.create(statistic=statistics[2], runs=460)
+    FiveWicketInning.objects.create(statistic=statistics[3], wickets=4, runs=20)
+    statistics[3].best_bowling_wickets = 30
+    statistics[3].save()
+
+    issues = {(issue["rule"], issue["statistic"]) for issue in _audit()}
+    assert issues == {
+        ("not_outs_exceed_innings", statistics[0].pk),
+        ("hundreds_exceed_runs", statistics[2].pk),
+        ("best_bowling_exceeds_wickets", statistics[3].pk),
+        ("five_wicket_innings_invalid", statistics[3].pk),
+    }
+
+    issues = _audit(rules=["hundreds_exceed_runs"])
+    assert issues[0]["message"] == "hundreds totalling 460 exceed 450 runs"
+
+    with pytest.raises(CommandError):
+        _audit(check=True)
+
+    with pytest.raises(CommandError):
+        _audit(rules=["missing"])
+
+
+def test_audit_chunks(statistics, django_assert_num_queries):
+    # each chunk reads the statistics, hundreds and five wicket innings
+    with django_assert_num_queries(7):
+        assert list(audit_statistics(chunk_size=2)) == []
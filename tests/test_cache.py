@@ -0,0 +1,293 @@
+"""Test the caching of computed statistics."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q, Sum
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django_cricket_statistics import cache as cache_module
+from django_cricket_statistics.cache import (
+    ALL_TAG,
+    CACHE_PREFIX,
+    PLAYERS_TAG,
+    _LOCKS,
+    LocalCache,
+    cached_value,
+    canonical,
+    changed_players,
+    invalidate_tags,
+    local_cache,
+    query_cache_key,
+    query_cache_stats,
+)
+from django_cricket_statistics.models import Statistic
+from django_cricket_statistics.views.common import CachedRows, create_queryset
+from django_cricket_statistics.views.statistics import ALL_STATISTICS
+
+
+def test_canonical_arguments():
+    assert canonical({"b": Sum("runs"), "a": 1}) == canonical(
+        {"a": 1, "b": Sum("runs")}
+    )
+    assert canonical({"a": Sum("runs")}) != canonical(
+        {"a": Sum("runs", filter=Q(grade=1))}
+    )
+
+    # the key must not depend on object addresses in this process
+    assert " at 0x" not in repr(canonical(ALL_STATISTICS))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cached_queryset(statistics, django_assert_num_queries):
+    def runs():
+        return create_queryset(
+            group_by=("player",),
+            aggregates={"runs": Sum("batting_runs")},
+            cached=True,
+        ).order_by("-runs")
+
+    query_cache_stats.clear()
+    with django_assert_num_queries(1):
+        assert [row["runs"] for row in runs()] == [1500, 450, 120]
+    with django_assert_num_queries(0):
+        assert [row["runs"] for row in runs()] == [1500, 450, 120]
+
+    # a slice is cached separately
+    with django_assert_num_queries(1):
+        assert runs()[:1][0]["runs"] == 1500
+    with django_assert_num_queries(0):
+        assert runs()[:1][0]["runs"] == 1500
+    assert query_cache_stats == {"hits": 2, "misses": 2}
+
+    statistics[2].batting_runs = 2000
+    statistics[2].save()
+    assert [row["runs"] for row in runs()] == [2000, 1500, 120]
+
+
+def test_player_career_cached(client, statistics, django_assert_num_queries):
+    url = reverse("player", args=(statistics[0].player.pk,))
+    client.get(url)
+
+    # only the player and the stamp of the cached fragments are queried
+    with django_assert_num_queries(2):
+        response = client.get(url)
+
+    # the cached statistics are only read if the fragments are missing
+    with django_assert_num_queries(3):
+        career = response.context["statistics_by_grade_list"][0]
+    assert career["batting_runs__sum"] == 1500
+    assert set(career) >= set(ALL_STATISTICS)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_player_career_invalidated_by_player(client, statistics):
+    url = reverse("player", args=(statistics[0].player.pk,))
+    client.get(url)
+
+    query_cache_stats.clear()
+    statistics[2].batting_runs = 500
+    statistics[2].save()
+    client.get(url)
+    assert query_cache_stats["misses"] == 0
+
+    statistics[1].batting_runs = 700
+    statistics[1].save()
+    response = client.get(url)
+    assert response.context["statistics_by_grade_list"][0]["batting_runs__sum"] == 1600
+
+
+@pytest.mark.django_db(transaction=True)
+def test_player_career_fragments_invalidated(client, statistics):
+    url = reverse("player", args=(statistics[0].player.pk,))
+    client.get(url)
+
+    # a change to another player leaves the fragments cached
+    statistics[2].batting_runs = 500
+    statistics[2].save()
+    response = client.get(url)
+    assert b"1500" in response.content
+
+    statistics[1].batting_runs = 700
+    statistics[1].save()
+    response = client.get(url)
+    assert b"1600" in response.content and b"1500" not in response.content
+
+    # deleting a row also changes the stamp
+    statistics[1].delete()
+    response = client.get(url)
+    assert b"900" in response.content and b"1600" not in response.content
+
+
+def test_leaderboard_invalidated_by_season(client, statistics, season):
+    url = reverse("batting-runs-season")
+    client.get(url, {"season": season.pk})
+
+    # a change in another season cannot affect the leaderboard
+    query_cache_stats.clear()
+    statistics[1].batting_runs = 2000
+    statistics[1].save()
+    client.get(url, {"season": season.pk})
+    assert query_cache_stats["misses"] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_leaderboard_invalidated_by_entering_player(
+    statistics, django_assert_num_queries
+):
+    def top_two():
+        queryset = create_queryset(
+            group_by=("player",), aggregates={"runs": Sum("batting_runs")}
+        ).order_by("-runs")
+        rows = CachedRows(queryset, ("top",), leaderboard=True)[:2]
+        return [row["runs"] for row in rows]
+
+    assert top_two() == [1500, 450]
+
+    # only the changed player is checked when they cannot enter
+    statistics[3].batting_runs = 130
+    statistics[3].save()
+    with django_assert_num_queries(1):
+        assert top_two() == [1500, 450]
+    with django_assert_num_queries(0):
+        assert top_two() == [1500, 450]
+
+    statistics[3].batting_runs = 1000
+    statistics[3].save()
+    assert top_two() == [1500, 1000]
+
+    # a player above dropping out shifts the rows
+    statistics[0].batting_runs = 0
+    statistics[0].save()
+    assert top_two() == [1000, 600]
+
+
+def test_leaderboard_after_tag_evicted(client, statistics):
+    url = reverse("batting-runs-career")
+    client.get(url)
+
+    # the tag comes back from the clock, far beyond the recorded changes
+    cache.delete(f"{CACHE_PREFIX}:tag:{PLAYERS_TAG}")
+    local_cache.clear()
+    time.sleep(0.01)
+    query_cache_stats.clear()
+    response = client.get(url)
+
+    assert query_cache_stats["misses"] == 1
+    assert b"1500" in response.content
+    assert changed_players({PLAYERS_TAG: 1}, {PLAYERS_TAG: 10**15}) is None
+    assert changed_players({PLAYERS_TAG: 2}, {PLAYERS_TAG: 1}) is None
+
+
+def test_local_cache_eviction_and_expiry():
+    local = LocalCache(max_size=2, timeout=60)
+    for key in "abc":
+        local.set(key, 1, key)
+
+    assert local.get("a", 1) is None
+    assert local.get("b", 1) == "b"
+    assert local.get("c", 2) is None
+    assert local.stats["evictions"] == 1
+    assert local.stats["expirations"] == 1
+
+    local.timeout = -1
+    local.set("d", 1, "d")
+    assert local.get("d", 1) is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_local_cache_in_front_of_shared_cache(statistics):
+    def runs():
+        return list(
+            create_queryset(
+                group_by=("player",),
+                aggregates={"runs": Sum("batting_runs")},
+                cached=True,
+            ).order_by("-runs")
+        )
+
+    runs()
+    local_cache.stats.clear()
+    runs()[0]["runs"] = 0
+    assert runs()[0]["runs"] == 1500
+    assert local_cache.stats["hits"] == 2
+
+    # any write moves the data version on so the shared cache is checked
+    statistics[3].batting_runs = 2000
+    statistics[3].save()
+    assert runs()[0]["runs"] == 2000
+
+
+@pytest.mark.django_db(transaction=True)
+def test_invalidated_after_commit(statistics):
+    with transaction.atomic():
+        statistics[0].batting_runs = 1000
+        statistics[0].save()
+        statistics[0].player.last_name = "Bradmann"
+        statistics[0].player.save()
+
+        # other requests still read the old rows until the commit
+        assert cached_value(("runs",), lambda: "old") == "old"
+        assert cached_value(("names",), lambda: "old", (PLAYERS_TAG,)) == "old"
+        assert cached_value(("runs",), lambda: "new") == "old"
+
+    assert cached_value(("runs",), lambda: "new") == "new"
+    assert cached_value(("names",), lambda: "new", (PLAYERS_TAG,)) == "new"
+
+
+def test_single_flight(statistics):
+    # the query is only run once however many requests arrive together
+    def evaluate():
+        time.sleep(0.2)
+        return list(Statistic.objects.values_list("batting_runs", flat=True))
+
+    def request(_):
+        with CaptureQueriesContext(connection) as queries:
+            value = cached_value(("flight",), evaluate)
+        return len(queries), value
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(request, range(8)))
+
+    assert sum(count for count, _ in results) == 1
+    assert {tuple(sorted(value)) for _, value in results} == {(120, 450, 600, 900)}
+
+
+def test_single_flight_lock_wait(db, monkeypatch):
+    # a caller does not wait on a hung evaluation for longer than the lock wait
+    monkeypatch.setattr(cache_module, "LOCK_WAIT", 0.1)
+    lock = _LOCKS[hash(query_cache_key("hung")) % len(_LOCKS)]
+    held, release = threading.Event(), threading.Event()
+
+    def hang():
+        with lock:
+            held.set()
+            release.wait()
+
+    thread = threading.Thread(target=hang)
+    thread.start()
+    held.wait()
+    try:
+        assert cached_value(("hung",), lambda: [1]) == [1]
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_stale_while_revalidate(db):
+    query_cache_stats.clear()
+    assert cached_value(("stale",), lambda: [1]) == [1]
+    invalidate_tags({ALL_TAG: set()})
+
+    # another process is evaluating the value so the stale value is served
+    cache.add(f"{query_cache_key('stale')}:lock", True)
+    assert cached_value(("stale",), lambda: [2]) == [1]
+    assert query_cache_stats["stale"] == 1
+
+    cache.delete(f"{query_cache_key('stale')}:lock")
+    assert cached_value(("stale",), lambda: [2]) == [2]
@@ -0,0 +1,140 @@
+"""Test the feed of changes to the statistics."""
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from django_cricket_statistics.admin import StatisticInline
+from django_cricket_statistics.changes import record_changes
+from django_cricket_statistics.first_eleven import assign_first_eleven_numbers
+from django_cricket_statistics.models import (
+    Change,
+    ChangeLock,
+    Hundred,
+    Player,
+    Season,
+)
+
+from tests.test_admin import StatisticFormSet, formset_data
+
+
+def changes(after=0):
+    return list(
+        Change.objects.filter(pk__gt=after).values_list("model", "object_id", "action")
+    )
+
+
+def test_changes_recorded(statistics):
+    start = Change.objects.last().pk
+    hundred = Hundred.objects.create(statistic=statistics[0], runs=112)
+    statistics[0].batting_runs = 1000
+    statistics[0].save()
+    pk = hundred.pk
+    hundred.delete()
+
+    assert changes(start) == [
+        ("hundred", pk, "insert"),
+        ("statistic", statistics[0].pk, "update"),
+        ("hundred", pk, "delete"),
+    ]
+
+
+def test_bulk_changes_recorded(statistics, grade):
+    player = statistics[0].player
+    later = Season.objects.create(year=2020)
+    start = Change.objects.last().pk
+
+    formset = StatisticFormSet(instance=player)
+    data = formset_data(formset)
+    data["statistic_set-0-batting_runs"] = 950
+    data.update(
+        {
+            f"statistic_set-2-{name}": 0
+            for name in StatisticInline.fields
+            if not name.endswith("_input")
+        }
+    )
+    data.update(
+        {
+            "statistic_set-TOTAL_FORMS": 3,
+            "statistic_set-2-season": later.pk,
+            "statistic_set-2-grade": grade.pk,
+            "statistic_set-2-matches": 1,
+        }
+    )
+    formset = StatisticFormSet(data, instance=player)
+    assert formset.is_valid(), formset.errors
+    formset.save()
+
+    added = player.statistic_set.get(season=later)
+    assert changes(start) == [
+        ("statistic", statistics[0].pk, "update"),
+        ("statistic", added.pk, "insert"),
+    ]
+
+    grade.is_first_eleven = True
+    grade.save()
+    start = Change.objects.last().pk
+    assign_first_eleven_numbers()
+
+    players = Player.objects.order_by("first_eleven_number")
+    assert changes(start) == [("player", p.pk, "update") for p in players]
+
+
+def test_changes_appended_under_lock(statistics):
+    executed = []
+
+    def record(execute, sql, params, many, context):
+        if not sql.startswith(("BEGIN", "SAVEPOINT", "RELEASE")):
+            executed.append((sql, connection.in_atomic_block))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        record_changes(Player, Change.Action.UPDATE, [statistics[0].player_id])
+
+    # the lock is taken by the transaction appending the changes, before them
+    lock, insert = executed[0][0], executed[-1][0]
+    assert ChangeLock._meta.db_table in lock
+    if connection.features.has_select_for_update:
+        assert "FOR UPDATE" in lock
+    assert insert.startswith("INSERT") and Change._meta.db_table in insert
+    assert all(atomic for _, atomic in executed)
+
+
+def test_change_feed(client, statistics):
+    start = Change.objects.last().pk
+    Player.objects.create(first_name="Bill", last_name="Brown")
+    statistic, player = statistics[3].pk, statistics[3].player_id
+    statistics[3].delete()
+    Player.objects.filter(pk=player).delete()
+
+    url = reverse("change-feed")
+    page = client.get(url, {"cursor": start, "limit": 2}).json()
+    assert page["has_more"]
+    assert [(change["model"], change["action"]) for change in page["changes"]] == [
+        ("player", "insert"),
+        ("statistic", "delete"),
+    ]
+    assert page["changes"][0]["fields"]["last_name"] == "Brown"
+    assert page["changes"][1]["id"] == statistic
+    assert page["changes"][1]["fields"] is None
+
+    page = client.get(url, {"cursor": page["cursor"]}).json()
+    assert not page["has_more"]
+    assert [(change["model"], change["id"]) for change in page["changes"]] == [
+        ("player", player)
+    ]
+
+    # nothing has changed since the last cursor
+    assert client.get(url, {"cursor": page["cursor"]}).json() == {
+        "changes": [],
+        "cursor": page["cursor"],
+        "has_more": False,
+    }
+
+
+@pytest.mark.parametrize(
+    "params", [{"cursor": "x"}, {"cursor": -1}, {"limit": 0}, {"limit": 501}]
+)
+def test_change_feed_invalid(client, db, params):
+    assert client.get(reverse("change-feed"), params).status_code == 400
@@ -0,0 +1,91 @@
+"""Test the assignment of first eleven numbers."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from django_cricket_statistics.first_eleven import propose_first_eleven_numbers
+from django_cricket_statistics.models import FirstElevenNumber, Player, Statistic
+
+
+@pytest.fixture
+def debuts(statistics, grade):
+    """Make the grade a first eleven grade, with one player already numbered."""
+    grade.is_first_eleven = True
+    grade.save()
+
+    numbered = Player.objects.create(first_name="Victor", last_name="Trumper")
+    numbered.first_eleven_number = FirstElevenNumber.objects.create(pk=7)
+    numbered.save()
+    Statistic.objects.create(
+        player=numbered, season=statistics[0].season, grade=grade, matches=1
+    )
+
+    return statistics
+
+
+def test_propose_by_debut(debuts):
+    proposals = propose_first_eleven_numbers()
+
+    # Bradman debuted a season earlier, and the others are ordered by name
+    assert [(p.number, p.player.last_name, str(p.debut)) for p in proposals] == [
+        (8, "Bradman", "2018/19"),
+        (9, "McCabe", "2019/20"),
+        (10, "Ponsford", "2019/20"),
+    ]
+
+    created = propose_first_eleven_numbers(tiebreak="created")
+    assert [p.player.last_name for p in created] == ["Bradman", "Ponsford", "McCabe"]
+
+
+def test_propose_only_first_eleven(debuts, grade):
+    grade.is_first_eleven = False
+    grade.save()
+    assert propose_first_eleven_numbers() == []
+
+
+def test_command_dry_run(debuts):
+    out = StringIO()
+    call_command("assign_first_eleven_numbers", "--dry-run", stdout=out)
+
+    assert "8  Don Bradman (debut 2018/19)" in out.getvalue()
+    assert "Would assign 3 first eleven numbers." in out.getvalue()
+    assert FirstElevenNumber.objects.count() == 1
+
+
+def test_command_without_first_eleven_grade(statistics):
+    out, err = StringIO(), StringIO()
+    call_command("assign_first_eleven_numbers", stdout=out, stderr=err)
+
+    assert "No grade is marked as a first eleven grade" in err.getvalue()
+    assert "Assigned 0 first eleven numbers." in out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True, reset_sequences=True)
+def test_command_assigns(debuts):
+    call_command("assign_first_eleven_numbers", stdout=StringIO())
+
+    numbers = dict(Player.objects.values_list("last_name", "first_eleven_number__pk"))
+    assert numbers == {"Bradman": 8, "McCabe": 9, "Ponsford": 10, "Trumper": 7}
+
+    # the sequence continues after the assigned numbers
+    assert FirstElevenNumber.objects.create().pk == 11
+
+    # assigned players are not numbered again
+    assert propose_first_eleven_numbers() == []
+
+
+def test_admin_action(admin_client, debuts):
+    url = reverse("admin:django_cricket_statistics_player_changelist")
+    selected = [debuts[0].player.pk, debuts[2].player.pk]
+    data = {"action": "number_first_eleven_players", "_selected_action": selected}
+
+    response = admin_client.post(url, data)
+    assert b"Don Bradman" in response.content and b"McCabe" not in response.content
+    assert FirstElevenNumber.objects.count() == 1
+
+    admin_client.post(url, {**data, "apply": "yes"})
+    numbers = Player.objects.filter(first_eleven_number__isnull=False)
+    assert set(numbers.values_list("first_eleven_number__pk", flat=True)) == {7, 8, 9}
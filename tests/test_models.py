@@ -1,5 +1,8 @@
 """Test the views for cricket statistics."""
 
+from importlib import import_module
+from types import SimpleNamespace
+
 import pytest
 
 from django_cricket_statistics.views import BattingAverageSeasonView
@@ -26,3 +29,42 @@ def test_player_long_name(db, player):
 
 def test_player_short_name(db, player):
     assert player.short_name == "JGH Smith"
+
+
+def test_player_names_updated_on_save(db, player):
+    player.first_name = "Jim"
+    player.save(update_fields=("first_name",))
+    player.refresh_from_db()
+
+    assert player.long_name == "Jim George Henry (Jack) Smith"
+    assert player.sort_key == "smith, jim george henry"
+
+
+def test_player_ordering(db):
+    names = (("Tom", "smith"), ("Bob", "Smith"), ("Al", "Smithers"), ("", "Sm"))
+    for first, last in names:
+        Player.objects.create(first_name=first, last_name=last)
+
+    assert [str(p) for p in Player.objects.all()] == [
+        "Mr. Sm",
+        "B Smith",
+        "T smith",
+        "A Smithers",
+    ]
+
+
+def test_sort_key_collation_pinned():
+    migration = import_module(
+        "django_cricket_statistics.migrations.0017_player_sort_key_collation"
+    )
+    executed = []
+    schema_editor = SimpleNamespace(
+        connection=SimpleNamespace(vendor="postgresql"), execute=executed.append
+    )
+
+    # a locale collation would sort "smith, tom" after "smithers"
+    migration.forward_sort_key_collation(None, schema_editor)
+    assert executed == [
+        "ALTER TABLE django_cricket_statistics_player "
+        'ALTER COLUMN sort_key TYPE varchar(850) COLLATE "C"'
+    ]
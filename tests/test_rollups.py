@@ -0,0 +1,307 @@
+"""Test the pre-aggregated statistics."""
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+
+from django_cricket_statistics.models import (
+    CareerTotal,
+    Grade,
+    HighScore,
+    Hundred,
+    Player,
+    PlayerLetter,
+    PlayerSummary,
+    SeasonSummary,
+    SeasonTotal,
+    Statistic,
+    StatisticCube,
+)
+from django_cricket_statistics.rollups import (
+    build_player_letters,
+    build_player_summaries,
+    build_statistic_cube,
+)
+from django_cricket_statistics.totals import refresh_totals
+from django_cricket_statistics.views.common import create_cube_queryset, create_queryset
+from django_cricket_statistics.views.statistics import ALL_STATISTICS, SEASON_RANGE
+
+
+@pytest.mark.parametrize(
+    "pre_filters,group_by",
+    [
+        ((), ("player",)),
+        ((), ("player", "season")),
+        (("season",), ("player",)),
+        (("grade",), ("player", "season")),
+        (("season", "grade"), ("player",)),
+    ],
+)
+def test_cube_matches_aggregation(statistics, season, grade, pre_filters, group_by):
+    values = {"season": season.pk, "grade": grade.pk}
+    kwargs = {
+        "pre_filters": {name: values[name] for name in pre_filters},
+        "group_by": group_by,
+        "aggregates": {**SEASON_RANGE, **ALL_STATISTICS},
+    }
+    ordering = (*group_by, "season_range")
+
+    expected = list(create_queryset(**kwargs).order_by(*ordering))
+    assert list(create_cube_queryset(**kwargs).order_by(*ordering)) == expected
+
+
+def test_cube_excludes_junior_grades(statistics, season):
+    junior = Grade.objects.create(grade="Under 16", is_senior=False)
+    statistics[0].grade = junior
+    statistics[0].save()
+
+    cell = StatisticCube.objects.get(
+        player=statistics[0].player, season__isnull=True, grade__isnull=True
+    )
+    assert cell.batting_runs_total == 600
+
+
+def test_cube_refreshes_only_touched_cells(statistics):
+    other = StatisticCube.objects.exclude(player=statistics[0].player)
+    before = set(other.values_list("pk", flat=True))
+
+    statistics[0].batting_runs = 1000
+    statistics[0].save()
+
+    assert set(other.values_list("pk", flat=True)) == before
+    cell = StatisticCube.objects.get(
+        player=statistics[0].player, season__isnull=True, grade__isnull=True
+    )
+    assert cell.batting_runs_total == 1600
+
+
+def test_cube_refreshed_after_commit(statistics):
+    cell = StatisticCube.objects.filter(
+        player=statistics[0].player, season__isnull=True, grade__isnull=True
+    )
+
+    with transaction.atomic():
+        statistics[0].batting_runs = 1000
+        statistics[0].save()
+        assert cell.get().batting_runs_total == 1500
+
+    assert cell.get().batting_runs_total == 1600
+
+
+def test_build_statistic_cube(statistics):
+    StatisticCube.objects.all().delete()
+    # three players in one season, one of whom also played an earlier season
+    assert build_statistic_cube() == 3 * 4 + 2
+
+
+def test_season_summary(statistics, season):
+    summary = SeasonSummary.objects.get(season=season)
+
+    assert summary.players_total == 3
+    assert summary.batting_runs_total == 1470
+    assert summary.leading_run_scorer_display == "D Bradman (900)"
+    assert summary.leading_wicket_taker_display == "S McCabe (25)"
+
+    statistics[2].bowling_wickets = 30
+    statistics[2].save()
+
+    summary.refresh_from_db()
+    assert summary.leading_wicket_taker_display == "B Ponsford (30)"
+    assert summary.bowling_wickets_total == 57
+
+
+def test_high_scores(statistics):
+    statistics[0].batting_high_score_runs = 154
+    statistics[0].batting_high_score_is_not_out = True
+    statistics[0].save()
+    Hundred.objects.create(statistic=statistics[0], runs=154, is_not_out=True)
+    Hundred.objects.create(statistic=statistics[0], runs=112, is_in_final=True)
+    statistics[2].batting_high_score_runs = 87
+    statistics[2].save()
+
+    scores = HighScore.objects.order_by("-runs", "-is_not_out")
+    assert [score.score for score in scores] == ["154*", "112#", "87"]
+
+
+def test_player_summary(statistics, season):
+    summary = PlayerSummary.objects.get(player=statistics[0].player)
+    assert summary.season_range == "2018-2020"
+    assert summary.matches_total == 18
+    assert summary.batting_runs_total == 1500
+
+    junior = Grade.objects.create(grade="Under 16", is_senior=False)
+    statistics[1].grade = junior
+    statistics[1].save()
+
+    # the span covers junior grades, which are left out of the totals
+    summary = PlayerSummary.objects.get(player=statistics[0].player)
+    assert summary.season_range == "2018-2020"
+    assert summary.batting_runs_total == 900
+
+    statistics[3].delete()
+    assert not PlayerSummary.objects.filter(player=statistics[3].player).exists()
+
+
+def test_build_player_summaries(statistics):
+    PlayerSummary.objects.all().delete()
+    assert build_player_summaries() == 3
+    assert (
+        PlayerSummary.objects.get(player=statistics[3].player).bowling_wickets_total
+        == 25
+    )
+
+
+def test_player_list_reads_summaries(client, django_assert_num_queries, statistics):
+    url = reverse("player-list-letter", args=("b",))
+
+    # the letters, the count of the paginator and the page of players
+    with django_assert_num_queries(3):
+        response = client.get(url)
+
+    rows = {
+        player.short_name: player.summary for player in response.context["player_list"]
+    }
+    assert rows["D Bradman"].batting_runs_total == 1500
+    assert rows["D Bradman"].matches_total == 18
+    assert b"1500" in response.content
+
+
+def player_letters():
+    return dict(
+        PlayerLetter.objects.filter(players_total__gt=0).values_list(
+            "letter", "players_total"
+        )
+    )
+
+
+def test_player_letters(statistics):
+    assert player_letters() == {"b": 1, "m": 1, "p": 1}
+
+    Player.objects.create(first_name="Bill", last_name="Brown")
+    Player.objects.create(first_name="Unknown", last_name="?")
+    statistics[3].delete()
+    statistics[3].player.delete()
+    assert player_letters() == {"b": 2, "p": 1}
+
+    # renaming a player moves them between letters
+    player = statistics[0].player
+    player.last_name = "Ponsonby"
+    player.save()
+    player.first_name = "Donald"
+    player.save()
+    assert player_letters() == {"b": 1, "p": 2}
+
+    PlayerLetter.objects.all().delete()
+    assert build_player_letters() == 2
+    assert player_letters() == {"b": 1, "p": 2}
+
+
+def test_player_letter_pages(client, django_assert_num_queries, statistics):
+    Player.objects.create(first_name="Bill", last_name="Brown")
+    client.get(reverse("player-list-letter", args=("b",)))
+
+    # the letters are cached, leaving the count and the page of players
+    with django_assert_num_queries(2):
+        response = client.get(reverse("player-list-letter", args=("b",)))
+
+    assert response.context["letters"] == {"b": 2, "m": 1, "p": 1}
+    assert response.context["paginator"].count == 2
+    assert [str(player) for player in response.context["player_list"]] == [
+        "D Bradman",
+        "B Brown",
+    ]
+    assert b"(2)" in response.content
+
+
+def test_player_letter_page_count(client, statistics):
+    url = reverse("player-list-letter", args=("b",))
+    client.get(url)
+
+    # the count agrees with the page while the cached letters are yet to move on
+    with transaction.atomic():
+        Player.objects.create(first_name="Bill", last_name="Brown")
+        response = client.get(url)
+        assert response.context["letters"]["b"] == 1
+
+    assert response.context["paginator"].count == 2
+    assert len(response.context["player_list"]) == 2
+
+
+@pytest.mark.parametrize(
+    "queryset",
+    [
+        HighScore.objects.order_by("-runs", "-is_not_out"),
+        StatisticCube.objects.filter(season__isnull=True, grade__isnull=True).order_by(
+            "-best_bowling_wickets", "best_bowling_runs"
+        ),
+    ],
+)
+def test_leaderboards_read_from_index(db, queryset):
+    queryset = queryset[:20]
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+
+    assert "USING INDEX" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize(
+    "pre_filters,group_by",
+    [((), ("player",)), ((), ("player", "season")), (("season",), ("player",))],
+)
+def test_totals_match_aggregation(settings, statistics, season, pre_filters, group_by):
+    Hundred.objects.create(statistic=statistics[0], runs=154)
+    refresh_totals()
+    settings.CRICKET_STATISTICS_MATERIALIZED_TOTALS = True
+
+    kwargs = {
+        "pre_filters": {name: season.pk for name in pre_filters},
+        "group_by": group_by,
+        "aggregates": {**SEASON_RANGE, **ALL_STATISTICS},
+    }
+    ordering = (*group_by, "season_range")
+
+    expected = list(create_queryset(**kwargs).order_by(*ordering))
+    queryset = create_cube_queryset(**kwargs)
+    assert queryset.model in {CareerTotal, SeasonTotal}
+    assert list(queryset.order_by(*ordering)) == expected
+
+
+def test_totals_refreshed_for_players(statistics):
+    refresh_totals()
+    bradman, mccabe = statistics[0].player, statistics[3].player
+    CareerTotal.objects.filter(player=mccabe).update(batting_runs_total=0)
+    SeasonTotal.objects.filter(player=mccabe).update(batting_runs_total=0)
+    Statistic.objects.filter(pk=statistics[0].pk).update(batting_runs=1000)
+
+    # only the totals of the players given are rebuilt
+    refresh_totals([bradman.pk])
+    assert CareerTotal.objects.get(player=bradman).batting_runs_total == 1600
+    assert CareerTotal.objects.get(player=mccabe).batting_runs_total == 0
+    assert SeasonTotal.objects.filter(player=bradman).count() == 2
+    assert SeasonTotal.objects.get(player=mccabe).batting_runs_total == 0
+
+
+def test_totals_refreshed_after_save(client, settings, statistics):
+    settings.CRICKET_STATISTICS_MATERIALIZED_TOTALS = True
+    refresh_totals()
+
+    def runs():
+        response = client.get("/leaderboard/", {"metric": "batting_runs__sum"})
+        return [row["batting_runs__sum"] for row in response.context["object_list"]]
+
+    assert runs() == [1500, 450, 120]
+
+    # a statistic saved outside the admin refreshes the totals once committed
+    with transaction.atomic():
+        statistics[3].batting_runs = 2000
+        statistics[3].save()
+        assert runs() == [1500, 450, 120]
+
+    assert runs() == [2000, 1500, 450]
+    assert (
+        CareerTotal.objects.get(player=statistics[3].player).batting_runs_total == 2000
+    )
@@ -0,0 +1,38 @@
+"""Test routing the reads of the statistics views to a read database."""
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from django_cricket_statistics.models import Player
+from django_cricket_statistics.routers import LAST_WRITE_KEY
+
+pytestmark = pytest.mark.django_db(databases=["default", "replica"])
+
+
+@pytest.fixture
+def replica(settings):
+    settings.CRICKET_STATISTICS_READ_DATABASE = "replica"
+    Player.objects.create(first_name="Don", last_name="Bradman")
+    Player.objects.using("replica").create(first_name="Richie", last_name="Benaud")
+
+
+def player_names(client):
+    url = reverse("player-list-letter", args=("B",))
+    return [str(player) for player in client.get(url).context["player_list"]]
+
+
+def test_reads_use_read_database(client, replica):
+    assert player_names(client) == ["R Benaud"]
+
+
+def test_admin_writes_use_primary(client, replica):
+    client.force_login(User.objects.create_superuser("admin"))
+    url = reverse("admin:django_cricket_statistics_season_add")
+    assert client.post(url, {"year": 2020}).status_code == 302
+
+    # the session that wrote reads its own writes from the primary
+    cache.delete(LAST_WRITE_KEY)
+    assert player_names(client) == ["D Bradman"]
+    assert player_names(client.__class__()) == ["R Benaud"]
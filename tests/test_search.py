@@ -0,0 +1,109 @@
+"""Test the search of players."""
+
+import pytest
+from django.test import RequestFactory
+from django.urls import reverse
+
+from django_cricket_statistics.models import Player
+from django_cricket_statistics.routers import use_read_database
+from django_cricket_statistics.search import (
+    PlayerSearchIndex,
+    search_players,
+    within_one_edit,
+)
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        ("bradman", "bradman", True),
+        ("bradman", "bradmn", True),
+        ("bradman", "bradmen", True),
+        ("bradman", "brdaman", True),
+        ("bradman", "brdmn", False),
+        ("bradman", "ponsford", False),
+    ],
+)
+def test_within_one_edit(a, b, expected):
+    assert within_one_edit(a, b) is expected
+    assert within_one_edit(b, a) is expected
+
+
+def test_index_search():
+    index = PlayerSearchIndex(
+        [
+            (1, "Donald", "George", "The Don", "Bradman", "bradman, donald george"),
+            (2, "William", "", "Bill", "Ponsford", "ponsford, william"),
+            (3, "José", "", "", "Núñez", "nunez, jose"),
+            (4, "Don", "", "", "Tallon", "tallon, don"),
+        ]
+    )
+
+    assert index.search("brad") == [1]
+    assert index.search("bill") == [2]
+    assert index.search("don") == [1, 4]
+    assert index.search("george bradman") == [1]
+    assert index.search("nunez") == [3]
+
+    # typos are tolerated but ranked below prefix matches
+    assert index.search("bradmna") == [1]
+    assert index.search("pnosford") == [2]
+    assert index.search("tal dno") == [4]
+    assert index.search("xyz") == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_index_rebuilt_on_save(statistics):
+    bradman = statistics[0].player
+    assert search_players("bradman") == [bradman.pk]
+
+    player = Player.objects.create(first_name="Ross", last_name="Bradley")
+    assert search_players("brad") == [player.pk, bradman.pk]
+
+    player.nickname = "Braddles"
+    player.save()
+    assert search_players("braddles") == [player.pk]
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_index_read_from_primary(settings):
+    settings.CRICKET_STATISTICS_READ_DATABASE = "replica"
+    player = Player.objects.create(first_name="Ross", last_name="Bradley")
+
+    # the replica has not caught up with the new player
+    with use_read_database(RequestFactory().get("/")):
+        assert search_players("bradley") == [player.pk]
+
+
+def test_player_search_view(client, statistics, django_assert_num_queries):
+    url = reverse("player-search")
+    client.get(url, {"q": "bradmn"})
+
+    # only the matching players are read once the index is built
+    with django_assert_num_queries(1):
+        response = client.get(url, {"q": "bradmn"})
+
+    assert response.json() == {
+        "results": [
+            {
+                "id": statistics[0].player.pk,
+                "name": "D Bradman",
+                "career": "2018-2020",
+                "url": reverse("player", args=(statistics[0].player.pk,)),
+            }
+        ]
+    }
+
+
+def test_player_search_without_statistics(client, statistics):
+    player = Player.objects.create(first_name="Ross", last_name="Bradley")
+    response = client.get(reverse("player-search"), {"q": "bradley"})
+    assert response.json()["results"][0]["id"] == player.pk
+    assert response.json()["results"][0]["career"] is None
+
+
+def test_player_list_search(client, statistics):
+    response = client.get(reverse("player-list-all"), {"q": "stan"})
+    assert [player.last_name for player in response.context["object_list"]] == [
+        "McCabe"
+    ]
@@ -11,8 +11,16 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": str(BASE_DIR / "db.sqlite3"),
-    }
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": str(BASE_DIR / "replica.sqlite3"),
+    },
 }
+DATABASE_ROUTERS = ["django_cricket_statistics.routers.ReadDatabaseRouter"]
+
+# public statistics may be read from a replica
+CRICKET_STATISTICS_READ_DATABASE = "default"
 USE_TZ = True
 TIME_ZONE = "Australia/Melbourne"
 
@@ -20,9 +28,6 @@ SECRET_KEY = "placeholder-key"
 INSTALLED_APPS = ["django_cricket_statistics", "tests"]
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
-# Fix allowing large number of fields to be submitted due to large inlines
-DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000
-
 # Application definition
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -37,6 +42,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "django_cricket_statistics.routers.ReadYourWritesMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -0,0 +1,209 @@
+"""Test the views for cricket statistics."""
+
+import pytest
+from django.db import transaction
+from django.urls import reverse
+
+from django_cricket_statistics import urls
+from django_cricket_statistics.models import FiveWicketInning
+from django_cricket_statistics.views.leaderboard import compile_leaderboard
+
+
+def test_leaderboard_career(client, statistics, django_assert_num_queries):
+    # the player names are read with the rows so only the count and page queries
+    with django_assert_num_queries(2):
+        response = client.get("/leaderboard/", {"metric": "batting_runs__sum"})
+
+    assert response.status_code == 200
+    rows = response.context["statistic_list"]
+    assert [row["batting_runs__sum"] for row in rows] == [1500, 450, 120]
+    assert str(rows[0]["player"]) == "D Bradman"
+
+
+def test_leaderboard_qualification_and_filter(client, statistics, season):
+    response = client.get(
+        "/leaderboard/",
+        {
+            "metric": "bowling_average",
+            "group": "season",
+            "season": season.pk,
+            "min_bowling_wickets__sum": 10,
+        },
+    )
+
+    assert response.status_code == 200
+    rows = response.context["statistic_list"]
+    assert [str(row["player"]) for row in rows] == ["S McCabe", "B Ponsford"]
+    assert response.context["caption"] == "Minimum qualification: 10 wkts"
+
+
+def test_leaderboard_cached(client, statistics, django_assert_num_queries):
+    params = {"metric": "batting_runs__sum"}
+    client.get("/leaderboard/", params)
+
+    with django_assert_num_queries(0):
+        response = client.get("/leaderboard/", params)
+    assert [row["batting_runs__sum"] for row in response.context["statistic_list"]] == [
+        1500,
+        450,
+        120,
+    ]
+
+    statistics[3].batting_runs = 2000
+    statistics[3].save()
+    response = client.get("/leaderboard/", params)
+    assert response.context["statistic_list"][0]["batting_runs__sum"] == 2000
+
+
+def test_leaderboard_qualification_types(client, statistics):
+    def players(**qualifications):
+        response = client.get(
+            "/leaderboard/", {"metric": "batting_runs__sum", **qualifications}
+        )
+        return [str(row["player"]) for row in response.context["statistic_list"]]
+
+    # batting averages of 93.75, 50 and 24
+    assert players(min_batting_average="49.5") == ["D Bradman", "B Ponsford"]
+    assert players(min_batting_average="50.01") == ["D Bradman"]
+
+    # a minimum of zero leaves in the players without any
+    assert players(min_hundreds="0") == ["D Bradman", "B Ponsford", "S McCabe"]
+
+    response = client.get(
+        "/leaderboard/", {"metric": "batting_runs__sum", "min_hundreds": "1.5"}
+    )
+    assert response.status_code == 404
+
+
+def test_leaderboard_reuses_compiled_query(client, statistics):
+    compile_leaderboard.cache_clear()
+    for minimum in (1, 5, 10):
+        client.get(
+            "/leaderboard/",
+            {"metric": "batting_runs__sum", "min_batting_innings__sum": minimum},
+        )
+
+    info = compile_leaderboard.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
+def test_leaderboard_invalid_metric(client, db):
+    response = client.get("/leaderboard/", {"metric": "batting_runs"})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        name
+        for patterns in (
+            urls.MATCHES_PATTERNS,
+            urls.BATTING_PATTERNS,
+            urls.BOWLING_PATTERNS,
+            urls.ALL_ROUNDER_PATTERNS,
+            urls.WICKETKEEPING_PATTERNS,
+            urls.FIELDING_PATTERNS,
+        )
+        for name in patterns.values()
+    ],
+)
+def test_statistic_views(client, statistics, season, name):
+    for params in ({}, {"season": season.pk}):
+        response = client.get(reverse(name), params)
+        assert response.status_code == 200
+
+
+def test_career_chart(client, statistics, django_assert_num_queries):
+    player = statistics[0].player
+    url = reverse("player-career-chart", args=(player.pk,))
+
+    seasons = client.get(url).json()["seasons"]
+    assert [s["season"] for s in seasons] == ["2018/19", "2019/20"]
+    assert [s["cumulative_runs"] for s in seasons] == [600, 1500]
+    assert [s["cumulative_batting_average"] for s in seasons] == [75.0, 93.75]
+
+    with django_assert_num_queries(0):
+        client.get(url)
+
+    # a chart read before the commit is not kept
+    with transaction.atomic():
+        statistics[0].batting_runs = 1000
+        statistics[0].save()
+        assert client.get(url).json()["seasons"][-1]["cumulative_runs"] == 1500
+    assert client.get(url).json()["seasons"][-1]["cumulative_runs"] == 1600
+
+
+def test_player_comparison(client, statistics, django_assert_num_queries):
+    players = [statistics[i].player for i in (2, 3, 0)]
+    url = reverse("player-comparison")
+
+    with django_assert_num_queries(7):
+        response = client.get(url, {"player": [players[0].pk]})
+    with django_assert_num_queries(7):
+        response = client.get(url, {"player": [p.pk for p in players]})
+
+    assert [row["player"] for row in response.context["career_list"]] == players
+    assert [row["batting_runs__sum"] for row in response.context["career_list"]] == [
+        450,
+        120,
+        1500,
+    ]
+
+
+def test_best_bowling(client, statistics):
+    statistics[2].best_bowling_wickets = 4
+    statistics[2].best_bowling_runs = 30
+    statistics[2].save()
+    statistics[3].best_bowling_wickets = 4
+    statistics[3].best_bowling_runs = 25
+    statistics[3].save()
+    FiveWicketInning.objects.create(statistic=statistics[3], wickets=6, runs=40)
+
+    response = client.get(reverse("bowling-best-innings-career"))
+    figures = [
+        (row.player, row.bowling_best_bowling)
+        for row in response.context["statistic_list"]
+    ]
+    assert figures == [
+        (statistics[3].player, "6/40"),
+        (statistics[2].player, "4/30"),
+    ]
+
+    response = client.get(reverse("player", args=(statistics[3].player.pk,)))
+    assert response.context["statistics_by_grade_list"][0]["bowling_best_bowling"] == (
+        "6/40"
+    )
+
+
+def test_best_bowling_season(client, statistics, season):
+    statistics[2].best_bowling_wickets = 4
+    statistics[2].best_bowling_runs = 30
+    statistics[2].save()
+    # the best figures of this season are only held by a five wicket innings
+    FiveWicketInning.objects.create(statistic=statistics[3], wickets=6, runs=40)
+
+    response = client.get(reverse("bowling-best-innings-season"))
+    figures = [
+        (row.player, row.season, row.bowling_best_bowling)
+        for row in response.context["statistic_list"]
+    ]
+    assert figures == [
+        (statistics[3].player, season, "6/40"),
+        (statistics[2].player, season, "4/30"),
+    ]
+
+
+def test_player_comparison_limit(client, db):
+    response = client.get(reverse("player-comparison"), {"player": range(1, 8)})
+    assert response.status_code == 404
+
+
+def test_season_views(client, statistics, season):
+    response = client.get(reverse("season-list"))
+    assert [str(s) for s in response.context["seasonsummary_list"]] == [
+        "2019/20",
+        "2018/19",
+    ]
+
+    response = client.get(season.get_absolute_url())
+    assert response.context["season_summary_list"][0].batting_runs_total == 1470